@@ -0,0 +1,172 @@
+import os
+import sys
+from pathlib import Path
+
+from crewai import Task
+
+from agents.clarifier import ClarifierAgent
+from agents.insight import InsightAgent
+from agents.scribe import ScribeAgent
+from configs.tools.core.agent_config import LLMConstraints
+from configs.tools.core.ollama_client import DEFAULT_BASE_URL
+from configs.tools.core.parse_cache import parse_cache
+from configs.tools.core.pipeline import Pipeline, Stage, StageFailure
+from configs.tools.core.resilience import breaker_for
+from configs.tools.core.routing import ModelRouter
+from configs.tools.core.runtime import execute_task
+from configs.tools.core.singleflight import flight_key, flights
+from configs.tools.doc_schemas import schema_for
+from configs.tools.template_renderer import atomic_write_text
+
+# === Stage prompts ===
+def _doc_text(doc):
+    return "\n".join(f"{key}: {value}" for key, value in doc.items() if value)
+
+def clarify(agent, item, execute):
+    task = Task(
+        description=(
+            f"Clarify the task behind this {item['mode']} function documentation. "
+            f"Break it into inputs, outputs, constraints and a cleaned-up goal.\n\n{_doc_text(item['doc'])}"
+        ),
+        expected_output="A Markdown breakdown of inputs, outputs, constraints and goal",
+        agent=agent
+    )
+    item["clarified"] = execute(task)
+    return item
+
+def investigate(agent, item, execute):
+    task = Task(
+        description=(
+            "Analyze this clarified task. Point out hidden assumptions, pitfalls and more robust patterns.\n\n"
+            f"{item['clarified']}"
+        ),
+        expected_output="A Markdown list of insights and recommended improvements",
+        agent=agent
+    )
+    item["insights"] = execute(task)
+    return item
+
+def scribe(agent, item, execute):
+    schema = schema_for(item["mode"])
+    task = Task(
+        description=(
+            f"Write the final {item['mode']} documentation for `{schema.name_of(item['doc'])}`, "
+            f"with these sections in order: {schema.headings()}\n\n"
+            f"Clarified task:\n{item['clarified']}\n\nInsights:\n{item['insights']}\n\n"
+            f"Original document:\n{_doc_text(item['doc'])}"
+        ),
+        expected_output=f"A complete Markdown {item['mode']} document",
+        agent=agent
+    )
+    item["markdown"] = execute(task)
+    return item
+
+# === Pipeline wiring: each worker thread owns its own agent per routed model ===
+def build_pipeline(router=None, workers=(1, 1, 1), queue_size=4, base_url=DEFAULT_BASE_URL, constraints=None):
+    # Every stage calls the same server, so they share its circuit breaker: once it
+    # opens, queued items fail fast as StageFailures instead of each waiting out retries.
+    constraints = constraints or LLMConstraints.from_config()
+    router = router or ModelRouter(base_url=base_url, constraints=constraints)
+    breaker = breaker_for(base_url, constraints)
+    # Identical docs in one batch produce identical stage tasks; concurrent ones share one call.
+    coalescer = flights("pipeline")
+
+    def stage(name, agent_factory, step, count):
+        def worker_factory():
+            agents = {}
+
+            def agent_for(model):
+                if model not in agents:
+                    agents[model] = agent_factory(router.llm(model))
+                return agents[model]
+
+            def process(item):
+                # The item's mode picks the model; a rejected output is re-run on the route's escalation model.
+                route = router.route(name, item["mode"])
+                execute = lambda task: coalescer.do(
+                    flight_key(name, route.model, task.description, task.expected_output),
+                    lambda: router.run(
+                        route,
+                        lambda model: execute_task(agent_for(model), task, constraints, breaker, label=name),
+                        prompt=task.description
+                    )
+                )
+                return step(agent_for(route.model), item, execute)
+            return process
+        return Stage(name, worker_factory, workers=count)
+
+    return Pipeline(
+        [
+            stage("clarifier", ClarifierAgent, clarify, workers[0]),
+            stage("investigator", InsightAgent, investigate, workers[1]),
+            stage("scribe", ScribeAgent, scribe, workers[2]),
+        ],
+        queue_size=queue_size
+    )
+
+def load_corpus(input_dir):
+    """
+    Yields pipeline items for every .md file under input_dir, parsing lazily as the first stage pulls.
+
+    Each doc is parsed with the schema its frontmatter `mode` names (dev_doc
+    when unset or unknown), and that mode routes its stages.
+
+    Parses come from the parse cache, so re-runs over unchanged docs skip reading and parsing them.
+    A file that cannot be read (e.g. removed mid-walk) is yielded as a StageFailure, which the stages pass through.
+    """
+    for root, _dirs, files in os.walk(input_dir):
+        for name in sorted(files):
+            if name.endswith(".md"):
+                path = os.path.join(root, name)
+                item = {"path": os.path.relpath(path, input_dir)}
+                doc = parse_cache().get(path)
+                if doc is None:
+                    yield StageFailure("parse", FileNotFoundError(f"could not read {path}"), item)
+                    continue
+                yield {**item, "doc": doc, "mode": schema_for(doc.get("mode")).mode}
+
+def print_stats(stats):
+    print(f"\n{'stage':<14} {'workers':>7} {'done':>6} {'failed':>6} {'items/s':>8} {'p50 s':>8} {'p95 s':>8}")
+    for name, row in stats.items():
+        if name == "pipeline":
+            continue
+        print(
+            f"{name:<14} {row['workers']:>7} {row['processed']:>6} {row['failed']:>6} "
+            f"{row['items_per_s']:>8.2f} {row['p50_ms'] / 1e3:>8.1f} {row['p95_ms'] / 1e3:>8.1f}"
+        )
+    print(f"[📊] Wall time: {stats['pipeline']['wall_s']:.1f}s")
+    coalesced = flights("pipeline").stats()
+    if coalesced["deduplicated"]:
+        print(f"[📊] Coalesced: {coalesced['deduplicated']} duplicate stage calls shared an in-flight one")
+
+# 🔧 CLI support
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run dev_docs through Clarifier → Investigator → Scribe.")
+    parser.add_argument("input_dir", help="Folder of dev_doc Markdown files (e.g. input_docs/)")
+    parser.add_argument("output_dir", help="Folder for the Scribe's Markdown output")
+    parser.add_argument("--workers", default="1,1,1", help="Workers per stage: clarifier,investigator,scribe")
+    parser.add_argument("--queue-size", type=int, default=4, help="Capacity of each inter-stage queue")
+    parser.add_argument("--model", default=None, help="Run every stage on this model (default: the config's routing block)")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    args = parser.parse_args()
+
+    workers = tuple(int(n) for n in args.workers.split(","))
+    if len(workers) != 3:
+        sys.exit("--workers needs three comma-separated counts")
+
+    constraints = LLMConstraints.from_config()
+    router = ModelRouter(base_url=args.base_url, constraints=constraints, override=args.model)
+    pipeline = build_pipeline(router, workers=workers, queue_size=args.queue_size, base_url=args.base_url, constraints=constraints)
+    results = pipeline.run(load_corpus(args.input_dir))
+
+    for item in results:
+        if isinstance(item, StageFailure):
+            print(f"[❌] {(item.item or {}).get('path', '?')} ({item.stage}): {item.error}")
+            continue
+        output = Path(args.output_dir) / item["path"]
+        output.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(str(output), item["markdown"])
+    print_stats(pipeline.stats())
+    router.print_report()
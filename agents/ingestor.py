@@ -1,25 +1,52 @@
+from typing import List, Optional, Union
+
 from crewai import Agent, Task
-from tools.parse_md_function import parse_dev_doc_markdown
+from configs.tools.core.parse_cache import parse_many
 from langchain_core.tools import tool  # Required for compatibility with CrewAI tool usage
 
 @tool
-def parse(file_path: str):
-    """Parse a Markdown dev_doc file and return structured dictionary data."""
-    return parse_dev_doc_markdown(file_path)
+def parse(paths: Union[str, List[str]], fields: Optional[Union[str, List[str]]] = None):
+    """Parse Markdown doc files (dev_doc, user_doc or comms; each file's `mode` picks its parser) and return their structured data.
+
+    paths: a file path, a glob such as "input_docs/**/*.md", a folder, or a list (or comma-separated string) of these.
+    fields: optional keys to return, e.g. "function_name,tags"; omit to get every key of the doc's mode.
+    dev_doc keys: function_name, language, mode, created_at, code, explanation, example, complexity, insight, limitations, tags.
+    user_doc keys: title, mode, audience, last_updated, overview, why_it_matters, prerequisites, instructions, tips, troubleshooting, resources.
+    comms keys: title, mode, audience, created_at, summary, changes, why_it_matters, impact, actions, timeline, contacts.
+    Returns one dictionary for a single file, otherwise a dictionary keyed by file path.
+    """
+    # Parses are cached by file hash in memory and in .cache/, so repeated calls skip reading and parsing.
+    try:
+        docs = parse_many(paths, fields)
+    except ValueError as e:
+        return {"error": str(e)}
+    if not docs:
+        return {"error": f"no doc files match {paths!r}"}
+    if len(docs) == 1 and isinstance(paths, str) and "," not in paths and paths in docs:
+        return docs[paths]
+    return docs
 
 def IngestorAgent(llm):
     return Agent(
         role="Ingestor",
-        goal="Read a Markdown dev_doc file and extract structured information.",
+        goal="Read Markdown doc files (dev_doc, user_doc, comms) and extract only the structured information the task needs.",
         backstory="You're a meticulous parser who ensures all markdown elements are converted to clean, usable data for downstream agents.",
         verbose=True,
         tools=[parse],
         llm=llm
     )
 
-def IngestorTask(agent):
+def IngestorTask(agent, paths="input_docs/add_numbers.md", fields=None):
+    fields = ",".join(fields) if isinstance(fields, (list, tuple)) else fields
+    wanted = f" Request only these fields: {fields}." if fields else ""
     return Task(
-        description="Parse the markdown file at 'input_docs/add_numbers.md' and return its structured dictionary data.",
-        expected_output="A dictionary with keys like function_name, code, explanation, etc.",
+        description=(
+            f"Parse the markdown doc files at '{paths}' with the parse tool in a single call "
+            f"and return their structured dictionary data.{wanted}"
+        ),
+        expected_output=(
+            f"A dictionary with the keys {fields}" if fields
+            else "A dictionary with keys like function_name, code, explanation, etc."
+        ) + ", keyed by file path when there are several files.",
         agent=agent
     )
@@ -5,7 +5,7 @@ def ScribeAgent(llm):
         role="Scribe",
         goal=(
             "Based on the clarified task and insights provided, generate clean code and wrap it inside a well-structured Markdown documentation block. "
-            "Adapt the tone, depth, and structure depending on the selected output mode (e.g., dev_doc, user_doc, comms)."
+            "Adapt the tone, depth, and structure to the selected output mode (dev_doc, user_doc or comms), using that mode's sections in order."
         ),
         backstory=(
             "You are the final hand in the creative loop — a coder who documents. "
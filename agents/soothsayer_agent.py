@@ -1,24 +1,60 @@
-from crewai import Agent, Task, Crew
-from langchain_ollama import OllamaLLM
-from configs.tools.parse_md_function import parse_dev_doc_markdown
-
-# === Load and parse the input Markdown file ===
-input_path = "input_docs/add_numbers.md"
-parsed_data = parse_dev_doc_markdown(input_path)
-
-# === Prepare structured components from parsed Markdown ===
-function_name = parsed_data.get("function_name", "")
-language = parsed_data.get("language", "")
-code = parsed_data.get("code", "")
-explanation = parsed_data.get("explanation", "")
-example = parsed_data.get("example", "")
-complexity = parsed_data.get("complexity", "")
-insight = parsed_data.get("insight", "")
-limitations = parsed_data.get("limitations", "")
-tags = parsed_data.get("tags", "")
-
-# === Construct system prompt ===
-soothsayer_system_prompt = f"""
+from configs.tools.core import incremental, tracing
+from configs.tools.core.llm_cache import LLMCache
+from configs.tools.core.memory import estimate_tokens
+from configs.tools.core.ollama_client import DEFAULT_BASE_URL
+from configs.tools.core.parse_cache import parse_cache
+from configs.tools.core.routing import default_router
+from configs.tools.core.runtime import SoothsayerRuntime
+from configs.tools.core.structured import DEV_DOC_KEYS, generate_dev_doc
+from configs.tools.write_md_function import write_dev_doc_markdown
+from pathlib import Path
+import os
+import sys
+import time
+
+TEMPERATURE = 0.3
+INPUT_PATH = "input_docs/add_numbers.md"
+OUTPUT_DIR = "output_docs"
+BATCH_REQUEST = "Improve the explanation, insight, and limitations in the function documentation"
+
+# === Construct system prompt from the parsed Markdown fields ===
+# Original-doc sections in prompt order: (key, label, blank line before the value).
+PROMPT_SECTIONS = (
+    ("function_name", "Function Name", False),
+    ("language", "Language", False),
+    ("code", "Code", True),
+    ("explanation", "Explanation", True),
+    ("example", "Example", True),
+    ("complexity", "Time Complexity", True),
+    ("insight", "Insight", True),
+    ("limitations", "Known Limitations", True),
+    ("tags", "Tags", True),
+)
+
+@tracing.traced("prompt.build")
+def build_system_prompt(parsed_data, structured=False, keys=None, inputs=None):
+    """
+    Builds the Soothsayer system prompt around the original doc.
+
+    Args:
+        parsed_data (dict): The parsed input doc.
+        structured (bool): Ask for a JSON object instead of a Python dictionary.
+        keys (list, optional): Only ask for these keys (incremental regeneration).
+        inputs (list, optional): Only show these sections of the original doc.
+    """
+    keys = list(keys or DEV_DOC_KEYS)
+    shown = [section for section in PROMPT_SECTIONS if inputs is None or section[0] in inputs]
+    output_kind = "JSON OBJECT" if structured else "PYTHON DICTIONARY"
+    parts = []
+    for index, (key, label, block) in enumerate(shown):
+        value = parsed_data.get(key, "")
+        if block:
+            parts.append(f"{'' if index == 0 else chr(10)}{label}:\n{value}\n")
+        else:
+            parts.append(f"{label}: {value}\n")
+    original = "".join(parts)
+
+    return f"""
 You are Soothsayer — a cognitive strategist built for communication clarity, content enablement, and enterprise change.
 
 Your task is to analyze and improve the following structured function documentation. Your response should:
@@ -27,95 +63,181 @@ Your task is to analyze and improve the following structured function documentat
 - Think like a communicator, not just a coder
 - Bridge the gap between what’s written and what’s understood
 
-ONLY RETURN AN UPDATED PYTHON DICTIONARY with keys:
-function_name, language, code, explanation, example, complexity, insight, limitations, tags
+ONLY RETURN AN UPDATED {output_kind} with keys:
+{", ".join(keys)}
 
 Do not use markdown or extra commentary.
 
 --- START OF ORIGINAL FUNCTION DOC ---
-Function Name: {function_name}
-Language: {language}
-
-Code:
-{code}
-
-Explanation:
-{explanation}
-
-Example:
-{example}
-
-Time Complexity:
-{complexity}
-
-Insight:
-{insight}
-
-Known Limitations:
-{limitations}
-
-Tags:
-{tags}
---- END ---
+{original}--- END ---
 """
 
 # === Define the Soothsayer Agent ===
-soothsayer = Agent(
-    name="Soothsayer",
-    role="AI Strategist for Internal Comms, Product Clarity & Change Translation.",
-    goal="Reflectively translate change communication, content strategy, and product documentation into clear, impactful, and psychologically resonant narratives.",
-    backstory=(
-        "Built to bridge the thinking–technical gap across communication, change, and content systems — "
-        "Soothsayer reflects a strategist’s mind with the precision of structured reasoning."
-    ),
-    allow_delegation=False,
-    verbose=True,
-    tools=[],
-    llm=OllamaLLM(
-        base_url="http://localhost:11434",
-        model="mistral",
-        temperature=0.3
-    ),
-    system_prompt=soothsayer_system_prompt
-)
+def build_soothsayer(llm, system_prompt):
+    from crewai import Agent
+
+    return Agent(
+        name="Soothsayer",
+        role="AI Strategist for Internal Comms, Product Clarity & Change Translation.",
+        goal="Reflectively translate change communication, content strategy, and product documentation into clear, impactful, and psychologically resonant narratives.",
+        backstory=(
+            "Built to bridge the thinking–technical gap across communication, change, and content systems — "
+            "Soothsayer reflects a strategist’s mind with the precision of structured reasoning."
+        ),
+        allow_delegation=False,
+        verbose=True,
+        tools=[],
+        llm=llm,
+        system_prompt=system_prompt
+    )
 
-# === Define initial doc task ===
-improve_doc_task = Task(
-    description="Improve the explanation, insight, and limitations in the function documentation",
-    expected_output="An improved Python dictionary containing the updated doc fields",
-    agent=soothsayer
-)
+# === The model comes from the config's routing block, for the soothsayer role in the doc's mode ===
+def soothsayer_route(input_path=INPUT_PATH):
+    return default_router().route("soothsayer", parse_cache().get(input_path).get("mode"))
+
+# === One runtime for the batch run and the chat loop (agent, LLM and cache are reused) ===
+def build_runtime(input_path=INPUT_PATH, cache=None, structured=False):
+    system_prompt = build_system_prompt(parse_cache().get(input_path), structured=structured)
+    return SoothsayerRuntime(
+        system_prompt=system_prompt,
+        agent_factory=lambda llm: build_soothsayer(llm, system_prompt),
+        model=soothsayer_route(input_path).model,
+        base_url=DEFAULT_BASE_URL,
+        temperature=TEMPERATURE,
+        cache=cache
+    )
 
 # === Run batch doc improvement ===
-print("\n📘 [Batch Mode] Running documentation improvement task...\n")
-crew = Crew(
-    agents=[soothsayer],
-    tasks=[improve_doc_task],
-    verbose=True
-)
-batch_response = crew.kickoff()
-
-print("\n[🔮 Soothsayer Enhanced Output Dictionary]")
-print(batch_response)
-
-# === Optional: Interactive Mode ===
-while True:
-    user_input = input("\n💬 Ask Soothsayer (or type 'exit'): ")
-    if user_input.lower() == "exit":
-        print("👋 Exiting interactive mode.")
-        break
-
-    dynamic_task = Task(
-        description=user_input,
-        expected_output="Short helpful reply",
-        agent=soothsayer
+def run_batch(runtime, input_path=INPUT_PATH):
+    print("\n📘 [Batch Mode] Running documentation improvement task...\n")
+    started = time.perf_counter()
+    with tracing.span("batch.run"):
+        batch_response = runtime.run(
+            BATCH_REQUEST,
+            expected_output="An improved Python dictionary containing the updated doc fields"
+        )
+    default_router().record(
+        soothsayer_route(input_path),
+        runtime.model,
+        time.perf_counter() - started,
+        estimate_tokens(runtime.system_prompt + BATCH_REQUEST),
+        estimate_tokens(str(batch_response))
     )
 
-    crew = Crew(
-        agents=[soothsayer],
-        tasks=[dynamic_task],
-        verbose=False
+    print("\n[🔮 Soothsayer Enhanced Output Dictionary]")
+    print(batch_response)
+    stats = runtime.cache.stats()
+    print(f"[📦] Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+    return batch_response
+
+# === Structured batch: schema-constrained JSON, validated per field and written as Markdown ===
+def run_structured_batch(runtime, input_path=INPUT_PATH, output_dir=OUTPUT_DIR, full=False):
+    """
+    Improves the input doc through Ollama's JSON schema mode and writes it with write_dev_doc_markdown.
+
+    Re-runs are incremental: the hashes of each field's input sections are kept
+    next to the output (see incremental.FIELD_INPUTS), and only the fields
+    whose inputs changed are regenerated, from a prompt holding just those
+    sections. The rest are copied from the output's sidecar, so an unchanged
+    doc costs no generation at all. A new request or model regenerates everything.
+
+    Fields that fail validation are re-asked on their own, then once on the
+    route's `escalate_to` model if it has one; any still rejected keep their
+    original text and are retried on the next run.
+
+    Args:
+        runtime (SoothsayerRuntime): Client, model, options and cache.
+        input_path (str): The dev_doc to improve.
+        output_dir (str): Where the improved doc and its sidecar go.
+        full (bool): Ignore the sidecar and regenerate every field.
+
+    Returns:
+        dict: The generate_dev_doc result, plus `output_path` and `regenerated`.
+    """
+    print("\n📘 [Batch Mode · JSON] Running documentation improvement task...\n")
+    original = parse_cache().get(input_path)
+    route = soothsayer_route(input_path)
+    name = original.get("function_name") or Path(input_path).stem
+    output_path = f"{output_dir}/{name}.md"
+    salt = incremental.run_salt(BATCH_REQUEST, runtime.model)
+    hashes = incremental.section_hashes(original)
+    state = {} if full else incremental.load_state(output_path)
+    previous = incremental.previous_values(output_path, state)
+    stale = incremental.stale_fields(hashes, state, salt, previous)
+    if not stale:
+        print(f"[📦] {output_path} is up to date; no sections changed since the last run")
+        return {"doc": previous, "errors": {}, "valid": True, "generations": 0, "repaired": [], "escalated": [],
+                "eval_tokens": 0, "seconds": 0.0, "by_model": {}, "output_path": output_path, "regenerated": []}
+
+    if len(stale) < len(DEV_DOC_KEYS):
+        print(f"[🔁] Regenerating {', '.join(stale)}; keeping the other {len(DEV_DOC_KEYS) - len(stale)} sections")
+        system_prompt = build_system_prompt(original, structured=True, keys=stale, inputs=incremental.inputs_for(stale))
+    else:
+        system_prompt = runtime.system_prompt
+    with tracing.span("batch.run", structured=True, fields=len(stale)):
+        result = generate_dev_doc(
+            runtime.client,
+            runtime.model,
+            system_prompt,
+            BATCH_REQUEST,
+            options=runtime.options,
+            max_repairs=runtime.client.constraints.attempts - 1,
+            cache=runtime.cache,
+            escalate_model=route.escalate_to,
+            keys=stale,
+        )
+    for model, usage in result["by_model"].items():
+        default_router().record(
+            route, model, usage["seconds"], usage["prompt_tokens"], usage["eval_tokens"],
+            calls=usage["generations"], rejected=usage["rejected"], escalated=usage["escalated"]
+        )
+    doc = {key: (previous or {}).get(key, "") for key in DEV_DOC_KEYS}
+    doc.update(result["doc"])
+    for key, problem in result["errors"].items():
+        print(f"[❌] {key}: {problem}; keeping the original text")
+        doc[key] = original.get(key, "")
+    result["output_path"] = output_path
+    result["regenerated"] = stale
+    write_dev_doc_markdown(doc, output_path)
+    incremental.save_state(
+        output_path, input_path, salt,
+        {key: digest for key, digest in hashes.items() if key not in result["errors"]},
+        doc,
+    )
+    result["doc"] = doc
+    repaired = f", repaired {', '.join(result['repaired'])}" if result["repaired"] else ""
+    repaired += f", escalated {', '.join(result['escalated'])} to {route.escalate_to}" if result["escalated"] else ""
+    print(
+        f"[📊] {len(stale)}/{len(DEV_DOC_KEYS)} fields, {result['generations']} generation(s), "
+        f"{result['eval_tokens']} tokens, {result['seconds']:.1f}s{repaired}"
     )
-    chat_response = crew.kickoff()
-    print("\n[🗣️ Soothsayer Says]:")
-    print(chat_response)
+    return result
+
+# === Optional: Interactive Mode ===
+def chat_loop(runtime):
+    while True:
+        user_input = input("\n💬 Ask Soothsayer (or type 'exit'): ")
+        if user_input.lower() == "exit":
+            print("👋 Exiting interactive mode.")
+            break
+
+        with tracing.span("agent.chat"):
+            chat_response = runtime.run(user_input, expected_output="Short helpful reply")
+        print("\n[🗣️ Soothsayer Says]:")
+        print(chat_response)
+
+if __name__ == "__main__":
+    # --trace (or SOOTHSAYER_TRACE=1) records per-stage spans; see python -m configs.tools.core.tracing
+    if "--trace" in sys.argv:
+        tracing.configure(enabled=True)
+    # Re-runs over unchanged docs skip Ollama; --no-cache bypasses the response cache.
+    # --json asks for schema-constrained JSON and writes the improved doc to output_docs/;
+    # re-runs regenerate only the sections whose inputs changed, --full regenerates all of them.
+    structured = "--json" in sys.argv
+    runtime = build_runtime(cache=LLMCache(enabled=False if "--no-cache" in sys.argv else None), structured=structured)
+    if structured:
+        run_structured_batch(runtime, full="--full" in sys.argv)
+    else:
+        run_batch(runtime)
+    default_router().print_report()
+    chat_loop(runtime)
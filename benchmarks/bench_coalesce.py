@@ -0,0 +1,91 @@
+"""
+Benchmark: identical concurrent requests with and without in-flight coalescing.
+
+--clients threads each stream --requests prompts through SoothsayerRuntime
+against a stub Ollama, picking from only --distinct different prompts, so many
+requests are in flight for the same prompt at the same time. The response cache
+is off, so every saving comes from coalescing:
+  - off:  every request runs its own generation
+  - on:   requests identical to one in flight replay its stream
+
+Prints backend generations, deduplicated requests, latency percentiles and
+wall time, and checks every caller received the complete reply.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_coalesce [--clients 16] [--requests 10] [--distinct 4]
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_ollama import start_stub
+from configs.tools.core import interaction_log
+from configs.tools.core.llm_cache import LLMCache
+from configs.tools.core.runtime import SoothsayerRuntime
+from configs.tools.core.singleflight import SingleFlight
+
+
+def run(url: str, coalesce: bool, clients: int, requests: int, distinct: int, seed: int) -> dict:
+    flights = SingleFlight("bench") if coalesce else False
+    runtime = SoothsayerRuntime("You are Soothsayer.", agent_factory=lambda llm: None, base_url=url,
+                                cache=LLMCache(enabled=False), coalesce=flights)
+    rng = random.Random(seed)
+    plan = [[f"Summarize update {rng.randrange(distinct)}" for _ in range(requests)] for _ in range(clients)]
+    latencies, texts = [], set()
+
+    def client(prompts):
+        for prompt in prompts:
+            started = time.perf_counter()
+            stream = runtime.stream(prompt)
+            for _ in stream:
+                pass
+            latencies.append(time.perf_counter() - started)
+            texts.add(len(stream.text))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, plan))
+    wall = time.perf_counter() - started
+    total = clients * requests
+    stats = flights.stats() if flights else {"executions": total, "deduplicated": 0}
+    latencies.sort()
+    return {
+        "generations": stats["executions"],
+        "deduplicated": stats["deduplicated"],
+        "p50_ms": latencies[len(latencies) // 2] * 1e3,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1e3,
+        "wall_s": wall,
+        "complete": len(texts) == 1,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--clients", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=10, help="requests per client")
+    ap.add_argument("--distinct", type=int, default=4, help="different prompts in the mix")
+    ap.add_argument("--latency", type=float, default=0.2, help="stub prompt-eval latency (s)")
+    ap.add_argument("--token-rate", type=float, default=100.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    server, url = start_stub(latency=args.latency, token_rate=args.token_rate)
+    try:
+        rows = {name: run(url, name == "on", args.clients, args.requests, args.distinct, args.seed) for name in ("off", "on")}
+    finally:
+        server.shutdown()
+
+    print(f"[🧪] {args.clients} clients × {args.requests} requests over {args.distinct} distinct prompts")
+    print(f"{'mode':<6} {'generations':>11} {'dedup':>6} {'p50 ms':>8} {'p95 ms':>8} {'wall s':>7}")
+    for name, row in rows.items():
+        print(f"{name:<6} {row['generations']:>11} {row['deduplicated']:>6} {row['p50_ms']:>8.0f} {row['p95_ms']:>8.0f} {row['wall_s']:>7.2f}")
+        if not row["complete"]:
+            print(f"[❌] {name}: some callers got a partial reply")
+    saved = 1 - rows["on"]["generations"] / rows["off"]["generations"]
+    print(f"[📊] coalescing ran {saved:.0%} fewer generations")
+
+
+if __name__ == "__main__":
+    main()
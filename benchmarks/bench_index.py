@@ -0,0 +1,119 @@
+"""
+Benchmark: local BM25 doc index build, incremental update and query latency.
+
+Writes N synthetic dev_docs (Zipf-distributed vocabulary, rendered with the
+dev_doc template) to a temp folder, builds the index from scratch,
+touches a fraction of the files and re-runs the incremental update, then
+times a batch of queries.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_index [--docs 10000] [--words 200] [--changed 0.01] [--queries 500] [-k 5]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from configs.tools.core.doc_index import DocIndex
+from configs.tools.template_renderer import compile_template
+from configs.tools.write_md_function import dev_doc_template_path, dev_doc_values
+
+SYLLABLES = "ka lo mi ra sen tu vo shi pa de xen qua bri mo lu".split()
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_doc(i: int, vocabulary: list, weights: list, rng: random.Random, words: int) -> dict:
+    def text(n):
+        return " ".join(rng.choices(vocabulary, weights, k=n)).capitalize() + "."
+
+    name = "_".join(rng.choices(vocabulary, weights, k=2)) + f"_{i}"
+    return {
+        "function_name": name,
+        "language": "python",
+        "created_at": "2025-07-25 13:11:11",
+        "code": f"def {name}(a, b):\n    return a + b",
+        "explanation": text(words),
+        "example": f"print({name}(2, 3))",
+        "complexity": "O(1)",
+        "insight": text(20),
+        "limitations": text(20),
+        "tags": ", ".join(rng.choices(vocabulary, weights, k=3)),
+    }
+
+
+def _pct(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--docs", type=int, default=10_000)
+    ap.add_argument("--words", type=int, default=200, help="words per explanation")
+    ap.add_argument("--vocabulary", type=int, default=20_000)
+    ap.add_argument("--changed", type=float, default=0.01, help="fraction of docs rewritten before the update")
+    ap.add_argument("--queries", type=int, default=500)
+    ap.add_argument("-k", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    weights = [1.0 / rank for rank in range(1, len(vocabulary) + 1)]
+    template = compile_template(dev_doc_template_path())
+
+    def write(i):
+        with open(os.path.join(docs_dir, f"doc_{i}.md"), "w", encoding="utf-8") as f:
+            f.write(template.render(dev_doc_values(make_doc(i, vocabulary, weights, rng, args.words))))
+
+    root = tempfile.mkdtemp(prefix="bench_index_")
+    docs_dir = os.path.join(root, "docs")
+    os.makedirs(docs_dir)
+    try:
+        for i in range(args.docs):
+            write(i)
+        index = DocIndex(os.path.join(root, "index.sqlite3"), roots=(docs_dir,))
+
+        full = index.update()
+        print(f"[📚] full build: {args.docs} docs in {full['seconds']:.2f}s ({args.docs / full['seconds']:.0f} docs/s)")
+        noop = index.update()
+        print(f"[📚] no-op update: {noop['seconds'] * 1e3:.1f} ms ({noop['unchanged']} unchanged)")
+
+        changed = rng.sample(range(args.docs), max(1, int(args.docs * args.changed)))
+        for i in changed:
+            write(i)
+        incremental = index.update()
+        print(f"[📚] incremental: {incremental['updated']} changed docs in {incremental['seconds'] * 1e3:.1f} ms")
+
+        # "content" queries use words past the 100 most frequent (which play the role of
+        # stopwords in this synthetic vocabulary); "zipf" queries sample the raw distribution.
+        query_sets = {
+            "content": [" ".join(rng.sample(vocabulary[100:], 4)) for _ in range(args.queries)],
+            "zipf": [" ".join(rng.choices(vocabulary, weights, k=4)) for _ in range(args.queries)],
+        }
+        for name, queries in query_sets.items():
+            for label in ("cold", "warm"):
+                latencies = []
+                for query in queries:
+                    started = time.perf_counter()
+                    index.search(query, args.k)
+                    latencies.append(time.perf_counter() - started)
+                print(
+                    f"[🔍] {args.queries} {name} queries ({label}), k={args.k}: p50 {_pct(latencies, 50):.3f} ms"
+                    f"  p95 {_pct(latencies, 95):.3f} ms  p99 {_pct(latencies, 99):.3f} ms"
+                )
+        index.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
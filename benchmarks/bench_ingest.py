@@ -0,0 +1,169 @@
+"""
+Benchmark: peak RSS and throughput of dev_doc ingestion as inputs grow.
+
+For each input size this writes
+  - one dev_doc whose Explanation section makes up almost the whole file, and
+  - one bundle of many ordinary dev_docs with the same total size,
+then converts each in a fresh child process and reports the child's peak RSS
+above its post-import baseline:
+  - eager:  read the whole file, parse_dev_doc_text, render, write
+  - lazy:   mmap + offset scan (lazy_md), sections streamed to the output
+  - bundle: run_bundle_conversion over the bundle (one output per doc)
+
+Eager RSS grows with the input; lazy and bundle should stay flat.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_ingest [--sizes 16,64,256] [--dir /tmp/bench_ingest]
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from configs.tools.template_renderer import compile_template
+from configs.tools.write_md_function import dev_doc_template_path, dev_doc_values
+
+LINE = "The function walks the input once and returns the running total for each prefix of it.\n"
+
+
+def _doc_values(name: str, explanation: str) -> dict:
+    return dev_doc_values({
+        "function_name": name,
+        "language": "python",
+        "created_at": "2025-07-25 13:11:11",
+        "code": f"def {name}(values):\n    return list(accumulate(values))",
+        "explanation": explanation,
+        "example": f"print({name}([1, 2, 3]))",
+        "complexity": "O(n)",
+        "insight": "Single pass.",
+        "limitations": "Numbers only.",
+        "tags": "math, prefix-sum",
+    })
+
+
+def write_large_doc(path: str, size_mb: int) -> None:
+    """One dev_doc whose Explanation is ~size_mb of text, written without holding it."""
+    template = compile_template(dev_doc_template_path())
+    head, tail = template.render(_doc_values("big_doc", "\0")).split("\0")
+    repeats = size_mb * 1024 * 1024 // len(LINE)
+    block = LINE * 4096
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(head)
+        for _ in range(repeats // 4096):
+            f.write(block)
+        f.write(LINE * (repeats % 4096))
+        f.write(tail)
+
+
+def write_bundle(path: str, size_mb: int) -> int:
+    """Concatenated ordinary dev_docs totalling ~size_mb; returns the doc count."""
+    template = compile_template(dev_doc_template_path())
+    target = size_mb * 1024 * 1024
+    written = count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            text = template.render(_doc_values(f"fn_{count}", LINE * 20))
+            f.write(text)
+            written += len(text.encode("utf-8"))
+            count += 1
+    return count
+
+
+def _child(mode: str, input_path: str, output_path: str) -> None:
+    from configs.tools.core.runner import run_bundle_conversion
+    from configs.tools.parse_md_function import parse_dev_doc_markdown, parse_dev_doc_text
+    from configs.tools.write_md_function import write_dev_doc_markdown
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if mode == "eager":
+        with open(input_path, "r", encoding="utf-8") as f:
+            write_dev_doc_markdown(parse_dev_doc_text(f.read()), output_path, verbose=False)
+    elif mode == "lazy":
+        write_dev_doc_markdown(parse_dev_doc_markdown(input_path, lazy=True), output_path, verbose=False)
+    else:
+        import contextlib
+        import io
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_bundle_conversion(input_path, output_path)
+    seconds = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": seconds, "peak_kb": peak, "delta_kb": peak - baseline}))
+
+
+def _run_child(mode: str, input_path: str, output_path: str) -> dict:
+    """Runs one conversion in a fresh interpreter; {"error": ...} if it failed (e.g. killed for memory)."""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_ingest", "--child", mode, input_path, output_path],
+        capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        return {"error": f"exit {out.returncode}" + (" (killed, likely out of memory)" if out.returncode == -9 else "")}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _same_file(a: str, b: str, chunk: int = 1 << 20) -> bool:
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            block = fa.read(chunk)
+            if block != fb.read(chunk):
+                return False
+            if not block:
+                return True
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="16,64,256", help="comma-separated input sizes in MB")
+    ap.add_argument("--dir", help="scratch directory (default: a temp dir, removed afterwards)")
+    ap.add_argument("--child", nargs=3, metavar=("MODE", "INPUT", "OUTPUT"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    root = args.dir or tempfile.mkdtemp(prefix="bench_ingest_")
+    os.makedirs(root, exist_ok=True)
+    print(f"{'input':<14} {'mode':<8} {'seconds':>8} {'MB/s':>8} {'peak RSS MB':>12} {'+MB':>8}")
+    try:
+        for size_mb in (int(s) for s in args.sizes.split(",")):
+            large = os.path.join(root, f"large_{size_mb}.md")
+            bundle = os.path.join(root, f"bundle_{size_mb}.md")
+            write_large_doc(large, size_mb)
+            docs = write_bundle(bundle, size_mb)
+            runs = [
+                (f"doc {size_mb}MB", "eager", large, os.path.join(root, "out_eager.md")),
+                (f"doc {size_mb}MB", "lazy", large, os.path.join(root, "out_lazy.md")),
+                (f"bundle {size_mb}MB", "bundle", bundle, os.path.join(root, f"out_bundle_{size_mb}")),
+            ]
+            for label, mode, input_path, output_path in runs:
+                result = _run_child(mode, input_path, output_path)
+                if "error" in result:
+                    print(f"{label:<14} {mode:<8} [❌] {result['error']}")
+                    continue
+                print(
+                    f"{label:<14} {mode:<8} {result['seconds']:>8.2f} {size_mb / result['seconds']:>8.0f}"
+                    f" {result['peak_kb'] / 1024:>12.1f} {result['delta_kb'] / 1024:>8.1f}"
+                )
+            eager_out, lazy_out = (os.path.join(root, name) for name in ("out_eager.md", "out_lazy.md"))
+            if os.path.exists(eager_out):
+                identical = _same_file(eager_out, lazy_out)
+                print(f"[📊] {size_mb}MB: lazy output {'matches' if identical else 'DIFFERS FROM'} eager; bundle held {docs} docs")
+                os.remove(eager_out)
+            for path in (large, bundle):
+                os.remove(path)
+            shutil.rmtree(os.path.join(root, f"out_bundle_{size_mb}"), ignore_errors=True)
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
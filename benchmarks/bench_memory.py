@@ -0,0 +1,109 @@
+"""
+Benchmark: prompt size per turn over a long conversation, per memory strategy.
+
+Runs the same N-turn conversation (default 200) four ways against a stub:
+  - full:        naive history, the whole transcript re-sent every turn
+  - none:        every turn stands alone
+  - short_term:  MemoryChat sliding window within the token budget
+  - long_term:   sliding window plus a rolling summary written in the background
+
+Prints the prompt tokens Ollama evaluated at selected turns, the largest
+memory block sent, and the mean time to first token. With a budget, the
+short_term and long_term rows should stay flat after the first few turns
+while `full` keeps growing, and long_term's first-token time should match
+short_term's: summaries never run inside a turn.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_memory [--turns 200] [--budget 1024] [--summary 256]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.stub_ollama import start_stub
+from configs.tools.core import interaction_log, memory
+from configs.tools.core.memory import MemoryChat, MemoryStore
+from configs.tools.core.ollama_client import OllamaClient
+
+SYSTEM_PROMPT = "You are Soothsayer, a cognitive strategist for communication clarity. " * 10
+CHECKPOINTS = (1, 10, 50, 100, 150, 200)
+
+
+def question(i: int) -> str:
+    return f"Turn {i}: reframe the rollout note for the support team and keep the decisions from earlier."
+
+
+def run_full(client: OllamaClient, turns: int) -> list:
+    transcript, rows = [], []
+    for i in range(1, turns + 1):
+        transcript.append(f"User: {question(i)}")
+        stream = client.stream("mistral", "\n".join(transcript), system=SYSTEM_PROMPT)
+        for _ in stream:
+            pass
+        transcript.append(f"Assistant: {stream.text}")
+        rows.append({"prompt_eval_count": stream.final.get("prompt_eval_count", 0), "ttft_s": stream.ttft, "memory_tokens": 0})
+    return rows
+
+
+def run_none(client: OllamaClient, turns: int) -> list:
+    rows = []
+    for i in range(1, turns + 1):
+        stream = client.stream("mistral", question(i), system=SYSTEM_PROMPT)
+        for _ in stream:
+            pass
+        rows.append({"prompt_eval_count": stream.final.get("prompt_eval_count", 0), "ttft_s": stream.ttft, "memory_tokens": 0})
+    return rows
+
+
+def run_memory(client: OllamaClient, turns: int, strategy: str, budget: int, summary: int, store: MemoryStore) -> list:
+    chat = MemoryChat(
+        client, "mistral", SYSTEM_PROMPT, strategy=strategy, budget_tokens=budget, summary_tokens=summary,
+        conversation_id=f"bench-{strategy}", store=store,
+    )
+    for i in range(1, turns + 1):
+        chat.ask(question(i))
+    memory.flush()
+    return chat.turns
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--turns", type=int, default=200)
+    ap.add_argument("--budget", type=int, default=1024, help="memory budget in tokens")
+    ap.add_argument("--summary", type=int, default=256, help="long_term summary cap in tokens")
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    server, url = start_stub(latency=0.0, token_rate=5000.0, tokens=60, prompt_eval_rate=0.0)
+    client = OllamaClient(base_url=url)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(os.path.join(tmp, "memory.sqlite3"))
+        try:
+            for name in ("full", "none", "short_term", "long_term"):
+                started = time.perf_counter()
+                if name == "full":
+                    rows = run_full(client, args.turns)
+                elif name == "none":
+                    rows = run_none(client, args.turns)
+                else:
+                    rows = run_memory(client, args.turns, name, args.budget, args.summary, store)
+                results[name] = (rows, time.perf_counter() - started)
+        finally:
+            server.shutdown()
+
+    marks = [t for t in CHECKPOINTS if t <= args.turns]
+    print(f"[🧪] {args.turns} turns, budget {args.budget} tokens (summary {args.summary}); prompt tokens evaluated per turn")
+    print(f"{'strategy':<12} " + " ".join(f"{'t' + str(t):>7}" for t in marks) + f" {'max mem':>8} {'ttft ms':>8} {'wall s':>7}")
+    for name, (rows, wall) in results.items():
+        counts = " ".join(f"{rows[t - 1]['prompt_eval_count']:>7}" for t in marks)
+        ttft = sum(r["ttft_s"] or 0.0 for r in rows) / len(rows) * 1e3
+        biggest = max(r["memory_tokens"] for r in rows)
+        print(f"{name:<12} {counts} {biggest:>8} {ttft:>8.2f} {wall:>7.1f}")
+    late = [r["prompt_eval_count"] for r in results["long_term"][0][len(results["long_term"][0]) // 2:]]
+    print(f"[📊] long_term prompt tokens over the second half: min {min(late)}, max {max(late)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: legacy per-section regex parser vs. the single-pass dev_doc parser.
+
+Builds synthetic dev_doc corpora from 1 KB to 10 MB per file, checks both
+parsers return the same dicts, and prints the per-file parse time.
+
+One difference is intended: the current parser skips text after a heading's
+colon, so it reads `code` under `### 🧠 Function: <name>`, where the legacy
+pattern matches nothing. The check compares `code` against the document's
+own code block instead (see INTENDED_DIFFERENCES).
+
+Usage (from the repo root):
+    python -m benchmarks.bench_parse [--files N] [--sizes 1K,10K,100K,1M,10M]
+"""
+import argparse
+import random
+import re
+import time
+
+from configs.tools.parse_md_function import parse_dev_doc_text
+
+
+def legacy_parse_dev_doc_text(content: str) -> dict:
+    """The original parse_dev_doc_markdown body, kept verbatim for comparison."""
+    parsed_data = {}
+
+    meta_match = re.search(
+        r"---\s*\nfunction_name:\s*(.+?)\s*\nlanguage:\s*(.+?)\s*\nmode:\s*(.+?)\s*\ncreated_at:\s*(.+?)\s*\n---",
+        content,
+        re.DOTALL
+    )
+    if meta_match:
+        parsed_data["function_name"] = meta_match.group(1).strip()
+        parsed_data["language"] = meta_match.group(2).strip()
+        parsed_data["mode"] = meta_match.group(3).strip()
+        parsed_data["created_at"] = meta_match.group(4).strip()
+
+    def extract_section(title: str, code_block: bool = False):
+        pattern = rf"###\s*{re.escape(title)}:\s*\n(?:```[^\n]*\n)?(.*?)(?:```)?\n(?:\n|###|\Z)"
+        match = re.search(pattern, content, re.DOTALL)
+        return match.group(1).strip() if match else ""
+
+    parsed_data["code"] = extract_section("🧠 Function", code_block=True)
+    parsed_data["explanation"] = extract_section("🔍 Explanation")
+    parsed_data["example"] = extract_section("🧪 Usage Example", code_block=True)
+    parsed_data["complexity"] = extract_section("⏱️ Time Complexity")
+    parsed_data["insight"] = extract_section("💡 Insight")
+    parsed_data["limitations"] = extract_section("⚠️ Known Limitations")
+    parsed_data["tags"] = extract_section("🏷️ Tags")
+
+    return parsed_data
+
+
+WORDS = "the function returns a value for each input and handles edge cases cleanly".split()
+
+
+def _paragraph(rng: random.Random, words: int = 40) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_doc(target_bytes: int, rng: random.Random) -> str:
+    """Builds one dev_doc of roughly `target_bytes`, padding the Explanation section."""
+    name = f"fn_{rng.randrange(10**6)}"
+    head = (
+        f"---\nfunction_name: {name}\nlanguage: python\nmode: dev_doc\n"
+        f"created_at: 2025-07-25 13:11:11\n---\n\n"
+        f"### 🧠 Function: {name}\n\n```python\ndef {name}(a, b):\n    return a + b\n```\n\n---\n\n"
+        f"### 🔍 Explanation:\n\n{_paragraph(rng)}\n"
+    )
+    tail = (
+        "\n---\n\n### 🧪 Usage Example:\n\n```python\nprint(fn(2, 3))\n```\n\n---\n\n"
+        "### ⏱️ Time Complexity:\n\nO(1)\n\n---\n\n"
+        f"### 💡 Insight:\n\n{_paragraph(rng)}\n\n---\n\n"
+        f"### ⚠️ Known Limitations:\n\n{_paragraph(rng)}\n\n---\n\n"
+        "### 🏷️ Tags:\n\nmath, utility\n"
+    )
+    filler = []
+    size = len((head + tail).encode("utf-8"))
+    while size < target_bytes:
+        para = "\n" + _paragraph(rng) + "\n"
+        filler.append(para)
+        size += len(para)
+    return head + "".join(filler) + tail
+
+
+def parse_size(text: str) -> int:
+    units = {"K": 1024, "M": 1024 ** 2}
+    text = text.strip().upper()
+    return int(float(text[:-1]) * units[text[-1]]) if text[-1] in units else int(text)
+
+
+# Keys the current parser is meant to read differently from the legacy one.
+INTENDED_DIFFERENCES = ("code",)
+
+
+def same_parse(doc: str, legacy: dict, current: dict) -> bool:
+    """Equal outside INTENDED_DIFFERENCES, legacy `code` empty, and current `code` the doc's code block."""
+    if {k: v for k, v in legacy.items() if k not in INTENDED_DIFFERENCES} != {
+        k: v for k, v in current.items() if k not in INTENDED_DIFFERENCES
+    }:
+        return False
+    return legacy["code"] == "" and f"```python\n{current['code']}\n```" in doc
+
+
+def time_parser(parser, corpus) -> float:
+    start = time.perf_counter()
+    for doc in corpus:
+        parser(doc)
+    return (time.perf_counter() - start) / len(corpus)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--files", type=int, default=20, help="documents per size bucket")
+    ap.add_argument("--sizes", default="1K,10K,100K,1M,10M", help="comma-separated target sizes")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'size':>8} {'files':>6} {'legacy ms':>12} {'single-pass ms':>15} {'speedup':>8}")
+    for label in args.sizes.split(","):
+        target = parse_size(label)
+        files = max(1, min(args.files, (64 * 1024 ** 2) // target))
+        corpus = [make_doc(target, rng) for _ in range(files)]
+
+        for doc in corpus:
+            if not same_parse(doc, legacy_parse_dev_doc_text(doc), parse_dev_doc_text(doc)):
+                raise SystemExit(f"[❌] Parsers disagree on a {label} document")
+
+        legacy = time_parser(legacy_parse_dev_doc_text, corpus)
+        single = time_parser(parse_dev_doc_text, corpus)
+        print(f"{label:>8} {files:>6} {legacy * 1e3:>12.3f} {single * 1e3:>15.3f} {legacy / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: Ingestor tool calls over a corpus, with and without the parse cache.
+
+Writes --files synthetic dev_docs of --size bytes each, then times
+parse_many over the whole folder:
+  - uncached:  every call reads and parses every file
+  - cold:      first call with an empty cache (parse + store)
+  - memory:    repeated call in the same process
+  - disk:      a fresh ParseCache on the same SQLite file (a new run)
+  - touched:   every file's mtime bumped, content unchanged (hashed, not parsed)
+
+and prints how much text a projection to function_name,tags hands the
+agent compared with the full docs.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_parse_cache [--files 500] [--size 4K] [--dir /tmp/bench_parse_cache]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.bench_parse import make_doc
+from configs.tools.core.memory import estimate_tokens
+from configs.tools.core.parse_cache import ParseCache, parse_many
+
+
+def _bytes(text: str) -> int:
+    units = {"K": 1024, "M": 1024 * 1024}
+    return int(float(text[:-1]) * units[text[-1].upper()]) if text[-1].upper() in units else int(text)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--files", type=int, default=500)
+    ap.add_argument("--size", default="4K", help="bytes per doc (K/M suffixes allowed)")
+    ap.add_argument("--dir", default=None, help="work folder (default: a temp dir, removed afterwards)")
+    args = ap.parse_args()
+
+    work = args.dir or tempfile.mkdtemp(prefix="bench_parse_cache_")
+    docs_dir = os.path.join(work, "docs")
+    os.makedirs(docs_dir, exist_ok=True)
+    rng = random.Random(0)
+    for i in range(args.files):
+        with open(os.path.join(docs_dir, f"doc_{i:05d}.md"), "w", encoding="utf-8") as f:
+            f.write(make_doc(_bytes(args.size), rng))
+    db = os.path.join(work, "parse_cache.sqlite3")
+    pattern = os.path.join(docs_dir, "*.md")
+
+    try:
+        rows = []
+        _, ms = timed(lambda: parse_many(pattern, cache=ParseCache(db + ".off", enabled=False)))
+        rows.append(("uncached", ms, None))
+        cache = ParseCache(db)
+        full, ms = timed(lambda: parse_many(pattern, cache=cache))
+        rows.append(("cold", ms, cache.stats()))
+        _, ms = timed(lambda: parse_many(pattern, cache=cache))
+        rows.append(("memory", ms, cache.stats()))
+        cache.close()
+        fresh = ParseCache(db)
+        _, ms = timed(lambda: parse_many(pattern, cache=fresh))
+        rows.append(("disk", ms, fresh.stats()))
+        for name in os.listdir(docs_dir):
+            os.utime(os.path.join(docs_dir, name))
+        _, ms = timed(lambda: parse_many(pattern, cache=fresh))
+        rows.append(("touched", ms, fresh.stats()))
+        projected = parse_many(pattern, fields="function_name,tags", cache=fresh)
+        fresh.close()
+    finally:
+        if not args.dir:
+            shutil.rmtree(work, ignore_errors=True)
+
+    print(f"[🧪] {args.files} docs × {args.size}")
+    print(f"{'call':<10} {'ms':>9} {'ms/doc':>8} {'parsed':>7} {'memory':>7} {'disk':>6}")
+    for name, ms, stats in rows:
+        counts = f"{stats['parsed']:>7} {stats['memory']:>7} {stats['disk']:>6}" if stats else f"{'-':>7} {'-':>7} {'-':>6}"
+        print(f"{name:<10} {ms:>9.1f} {ms / args.files:>8.3f} {counts}")
+    full_tokens = estimate_tokens(json.dumps(full, ensure_ascii=False))
+    projected_tokens = estimate_tokens(json.dumps(projected, ensure_ascii=False))
+    print(f"[📊] tool output: ~{full_tokens} tokens for full docs, ~{projected_tokens} with fields=function_name,tags "
+          f"({projected_tokens / full_tokens:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: bulk dev_doc rendering with the compiled template.
+
+For N synthetic docs (default 100k) this measures:
+  - legacy:    the old per-call f-string writer (mkdir + open + write + print per file)
+  - render:    compiled-template rendering only, in memory
+  - bulk:      write_dev_docs (render + atomic temp-then-rename writes + one summary)
+  - disk only: the same atomic writes of pre-rendered text, i.e. the disk floor
+
+`bulk` should land close to `disk only`: what remains is the Python cost.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_render [--docs 100000] [--legacy-docs 10000] [--dir /tmp/bench_render]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from configs.tools.template_renderer import atomic_write_text, compile_template
+from configs.tools.write_md_function import dev_doc_template_path, dev_doc_values, write_dev_docs
+
+WORDS = "the function returns a value for each input and handles edge cases cleanly".split()
+
+
+def legacy_write_dev_doc_markdown(data: dict, output_path: str) -> None:
+    """The original f-string writer, kept for comparison."""
+    function_name = data.get("function_name", "unknown_function")
+    language = data.get("language", "python")
+    created_at = data.get("created_at", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    markdown = (
+        f"---\nfunction_name: {function_name}\nlanguage: {language}\nmode: dev_doc\ncreated_at: {created_at}\n---\n\n"
+        f"### 🧠 Function: {function_name}\n\n```{language}\n{data.get('code', '').strip()}\n```\n\n---\n\n"
+        f"### 🔍 Explanation:\n\n{data.get('explanation', '').strip()}\n\n---\n\n"
+        f"### 🧪 Usage Example:\n\n```{language}\n{data.get('example', '').strip()}\n```\n\n---\n\n"
+        f"### ⏱️ Time Complexity:\n\n{data.get('complexity', '').strip()}\n\n---\n\n"
+        f"### 💡 Insight:\n\n{data.get('insight', '').strip()}\n\n---\n\n"
+        f"### ⚠️ Known Limitations:\n\n{data.get('limitations', '').strip()}\n\n---\n\n"
+        f"### 🏷️ Tags:\n\n{data.get('tags', '').strip()}\n"
+    )
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(markdown)
+    print(f"[✅] Markdown written to: {output_path}")
+
+
+def make_data(i: int, rng: random.Random) -> dict:
+    def sentence(n=20):
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+    name = f"fn_{i}"
+    return {
+        "function_name": name,
+        "language": "python",
+        "created_at": "2025-07-25 13:11:11",
+        "code": f"def {name}(a, b):\n    return a + b",
+        "explanation": sentence(40),
+        "example": f"print({name}(2, 3))",
+        "complexity": "O(1)",
+        "insight": sentence(),
+        "limitations": sentence(),
+        "tags": "math, utility",
+    }
+
+
+def _timed(label: str, count: int, fn) -> float:
+    started = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - started
+    print(f"{label:<10} {count:>8} docs {seconds:>8.2f}s {count / seconds:>10.0f} docs/s {seconds / count * 1e6:>8.1f} µs/doc")
+    return seconds
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--docs", type=int, default=100_000)
+    ap.add_argument("--legacy-docs", type=int, default=10_000, help="the legacy writer is slow; time a subset")
+    ap.add_argument("--shards", type=int, default=100, help="output sub-directories")
+    ap.add_argument("--dir", help="scratch directory (default: a temp dir, removed afterwards)")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    docs = [make_data(i, rng) for i in range(args.docs)]
+    root = args.dir or tempfile.mkdtemp(prefix="bench_render_")
+    template = compile_template(dev_doc_template_path())
+
+    def paths(tag):
+        return [os.path.join(root, tag, f"shard_{i % args.shards:03d}", f"fn_{i}.md") for i in range(args.docs)]
+
+    try:
+        legacy_docs = docs[: args.legacy_docs]
+        legacy_paths = paths("legacy")[: args.legacy_docs]
+
+        def run_legacy():
+            with contextlib.redirect_stdout(io.StringIO()):
+                for data, path in zip(legacy_docs, legacy_paths):
+                    legacy_write_dev_doc_markdown(data, path)
+
+        rendered = []
+        _timed("legacy", len(legacy_docs), run_legacy)
+        _timed("render", args.docs, lambda: rendered.extend(template.render(dev_doc_values(d)) for d in docs))
+
+        bulk_paths = paths("bulk")
+
+        def run_bulk():
+            with contextlib.redirect_stdout(io.StringIO()):
+                write_dev_docs(zip(docs, bulk_paths))
+
+        bulk = _timed("bulk", args.docs, run_bulk)
+
+        disk_paths = paths("disk")
+        for directory in {os.path.dirname(p) for p in disk_paths}:
+            os.makedirs(directory, exist_ok=True)
+        disk = _timed("disk only", args.docs, lambda: [atomic_write_text(p, t) for p, t in zip(disk_paths, rendered)])
+        print(f"[📊] bulk overhead above the disk floor: {(bulk - disk) / args.docs * 1e6:.1f} µs/doc ({bulk / disk:.2f}x)")
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: request latency while the Ollama backend misbehaves.
+
+Sends the same sequence of streaming requests through OllamaClient under
+several backend conditions, each with a fresh circuit breaker:
+  - healthy:          every request succeeds on the first try
+  - flaky:            every request's first attempt gets a 503, the retry succeeds
+  - stall:            the server accepts requests but never answers
+  - stall_midstream:  the server sends one token, then goes silent
+  - down:             nothing listens on the port
+
+Prints p50 / p99 / max latency and the outcome counts per scenario. Under
+stall and down, latency should be capped by the read timeout and retry
+budget, and once the breaker opens, the remaining requests should fail in
+well under a millisecond instead of waiting.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_resilience [--requests 20] [--read-timeout 0.5] [--attempts 3] [--threshold 3]
+"""
+import argparse
+import json
+import socket
+import time
+import urllib.request
+from collections import Counter
+
+from benchmarks.stub_ollama import start_stub
+from configs.tools.core import interaction_log
+from configs.tools.core.agent_config import LLMConstraints
+from configs.tools.core.ollama_client import OllamaClient, OllamaError
+from configs.tools.core.resilience import CircuitBreaker, CircuitOpenError
+
+
+def set_fault(url: str, fault: str, count: int = -1) -> None:
+    body = json.dumps({"fault": fault, "count": count}).encode("utf-8")
+    request = urllib.request.Request(f"{url}/_stub/fault", data=body, headers={"Content-Type": "application/json"})
+    urllib.request.urlopen(request).read()
+
+
+def free_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def run_scenario(url: str, constraints: LLMConstraints, requests: int, before_each=None) -> dict:
+    breaker = CircuitBreaker(url, constraints.breaker_threshold, constraints.breaker_cooldown_s)
+    client = OllamaClient(base_url=url, constraints=constraints, breaker=breaker)
+    latencies, outcomes = [], Counter()
+    for _ in range(requests):
+        if before_each:
+            before_each()
+        started = time.perf_counter()
+        try:
+            stream = client.stream("mistral", "Reframe the rollout note for the support team.")
+            for _ in stream:
+                pass
+            outcomes["ok"] += 1
+        except CircuitOpenError:
+            outcomes["fast_fail"] += 1
+        except (OllamaError, OSError) as e:
+            outcomes[type(e).__name__] += 1
+        latencies.append(time.perf_counter() - started)
+    client.close()
+    latencies.sort()
+    return {
+        "p50_ms": latencies[len(latencies) // 2] * 1e3,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3,
+        "max_ms": latencies[-1] * 1e3,
+        "outcomes": dict(outcomes),
+        "breaker": breaker.status(),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=20, help="requests per scenario")
+    ap.add_argument("--read-timeout", type=float, default=0.5, help="read_timeout_s for the client")
+    ap.add_argument("--attempts", type=int, default=3, help="max_attempts per request")
+    ap.add_argument("--threshold", type=int, default=3, help="breaker_threshold")
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    constraints = LLMConstraints(
+        max_attempts=args.attempts,
+        connect_timeout_s=0.5,
+        read_timeout_s=args.read_timeout,
+        total_timeout_s=args.read_timeout * args.attempts * 2,
+        backoff_base_s=0.05,
+        backoff_max_s=0.2,
+        breaker_threshold=args.threshold,
+        breaker_cooldown_s=60.0,
+    )
+    server, url = start_stub(latency=0.01, token_rate=2000.0, tokens=20, stall_s=args.read_timeout * 4)
+    scenarios = {
+        "healthy": (url, "none", None),
+        "flaky": (url, "none", lambda: set_fault(url, "error", 1)),
+        "stall": (url, "stall", None),
+        "stall_midstream": (url, "stall_midstream", None),
+        "down": (free_port_url(), "none", None),
+    }
+    results = {}
+    try:
+        for name, (target, fault, before_each) in scenarios.items():
+            set_fault(url, fault)
+            results[name] = run_scenario(target, constraints, args.requests, before_each)
+    finally:
+        server.shutdown()
+
+    print(f"[🧪] {args.requests} requests per scenario; {constraints}")
+    print(f"{'scenario':<16} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}  {'breaker':<9} outcomes")
+    for name, row in results.items():
+        outcomes = ", ".join(f"{k}={v}" for k, v in sorted(row["outcomes"].items()))
+        print(f"{name:<16} {row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}  {row['breaker']['state']:<9} {outcomes}")
+    bound = constraints.attempts * (constraints.read_timeout_s + constraints.backoff_max_s) * 1e3
+    worst = max(row["max_ms"] for row in results.values())
+    print(f"[📊] worst request {worst:.0f} ms; retry budget bound {bound:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
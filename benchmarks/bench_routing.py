@@ -0,0 +1,118 @@
+"""
+Benchmark: one model for every stage vs. per-role routing with escalation.
+
+Runs Clarifier → Investigator → Scribe calls for --docs documents (modes
+dev_doc, user_doc and comms in turn) against a stub Ollama, twice:
+  - single:  every stage on the config's default model
+  - routed:  the agent config's `routing` block, with the light routes the
+             template leaves commented out (clarifier, ingestor, the user_doc
+             investigator) sent to --small-model; they re-run on their
+             `escalate_to` model when the output fails the route's checks
+
+The stub serves every routed model other than the default one --small-speed
+times faster, and returns an empty (rejected) reply from them with
+--invalid-rate. The routes' min_chars / must_include checks are
+dropped (stub replies are fixed lorem), so only empty replies are rejected.
+
+Prints wall time, the per-route report (calls, rejections, escalations,
+latency, estimated tokens, cost from cost_per_1k_tokens) and the totals.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_routing [--docs 30] [--small-model llama3.2:3b] [--small-speed 3] [--invalid-rate 0.1]
+"""
+import argparse
+import copy
+import time
+
+from benchmarks.stub_ollama import start_stub
+from configs.tools.core import interaction_log
+from configs.tools.core.agent_config import load_agent_config
+from configs.tools.core.ollama_client import OllamaClient
+from configs.tools.core.routing import MODES, ModelRouter
+
+STAGES = ("clarifier", "investigator", "scribe")
+
+# (mode, role) routes the template documents as small-model candidates; mode None is roles.<role>.
+SMALL_ROUTES = ((None, "clarifier"), (None, "ingestor"), ("user_doc", "investigator"))
+
+
+def with_small_model(config: dict, model: str) -> dict:
+    """The agent config with SMALL_ROUTES on `model`, escalating to the default model."""
+    config = copy.deepcopy(config)
+    routing = config.setdefault("routing", {})
+    fallback = (routing.get("default") or {}).get("model") or (config.get("model") or {}).get("name") or "mistral"
+    for mode, role in SMALL_ROUTES:
+        entries = routing.setdefault("roles", {}) if mode is None else routing.setdefault("modes", {}).setdefault(mode, {})
+        entries.setdefault(role, {}).update(model=model, escalate_to=fallback)
+    return config
+
+
+def without_checks(config: dict) -> dict:
+    """The agent config with every route's min_chars / must_include removed."""
+    config = copy.deepcopy(config)
+    routing = config.get("routing") or {}
+    entries = [routing.get("default") or {}, *(routing.get("roles") or {}).values()]
+    entries += [entry for mode in (routing.get("modes") or {}).values() for entry in (mode or {}).values()]
+    for entry in entries:
+        if isinstance(entry, dict):
+            entry.pop("min_chars", None)
+            entry.pop("must_include", None)
+    return config
+
+
+def run(router: ModelRouter, client: OllamaClient, docs: int) -> float:
+    started = time.perf_counter()
+    for i in range(docs):
+        mode = MODES[i % len(MODES)]
+        text = f"doc {i}"
+        for stage in STAGES:
+            prompt = f"{stage} step for this {mode} document:\n{text}"
+            text = router.run(router.route(stage, mode), lambda model: client.generate(model, prompt)["response"], prompt=prompt)
+    return time.perf_counter() - started
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--docs", type=int, default=30)
+    ap.add_argument("--small-model", default="llama3.2:3b", help="model the light routes are sent to")
+    ap.add_argument("--small-speed", type=float, default=3.0, help="how much faster the routed small models are")
+    ap.add_argument("--invalid-rate", type=float, default=0.1, help="chance a small model's reply is rejected")
+    ap.add_argument("--latency", type=float, default=0.05, help="default model's prompt-eval latency (s)")
+    ap.add_argument("--token-rate", type=float, default=400.0, help="default model's tokens per second")
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    config = without_checks(with_small_model(load_agent_config(), args.small_model))
+    routed = ModelRouter(config)
+    small = {
+        route.model
+        for route in (routed.route(stage, mode) for stage in STAGES for mode in MODES)
+        if route.model != routed.default_model
+    }
+    server, url = start_stub(
+        latency=args.latency,
+        token_rate=args.token_rate,
+        models={name: (args.small_speed, args.invalid_rate) for name in small},
+    )
+    try:
+        client = OllamaClient(base_url=url)
+        single = ModelRouter(config, override=routed.default_model)
+        results = {}
+        for name, router in (("single", single), ("routed", routed)):
+            wall = run(router, client, args.docs)
+            results[name] = (wall, sum(r["cost"] for r in router.report()))
+            print(f"\n[🧪] {name}: {args.docs} docs in {wall:.2f}s")
+            router.print_report()
+    finally:
+        server.shutdown()
+
+    print(f"\n{'':<8} {'wall s':>8} {'cost':>8}")
+    for name, (wall, cost) in results.items():
+        print(f"{name:<8} {wall:>8.2f} {cost:>8.3f}")
+    single_wall, single_cost = results["single"]
+    routed_wall, routed_cost = results["routed"]
+    print(f"[📊] routed: {single_wall / routed_wall:.2f}x faster, {routed_cost / single_cost:.0%} of single-model cost" if single_cost and routed_wall else "[📊] done")
+
+
+if __name__ == "__main__":
+    main()
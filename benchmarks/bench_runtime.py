@@ -0,0 +1,109 @@
+"""
+Benchmark: per-request framework overhead, rebuilt-per-request vs. SoothsayerRuntime.
+
+Two measurements:
+  * setup   — building OllamaLLM + Agent + Task + Crew per request (old entry points)
+              vs. one Task on a long-lived agent (runtime). Needs crewai installed.
+  * http    — a fresh Ollama connection per request vs. the runtime's pooled
+              keep-alive connection. Point --url at a stub server to isolate
+              client overhead from model time.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_runtime [--url http://localhost:11434] [--requests 200]
+"""
+import argparse
+import statistics
+import time
+
+from configs.tools.core import interaction_log
+from configs.tools.core.llm_cache import LLMCache
+from configs.tools.core.ollama_client import OllamaClient
+from configs.tools.core.runtime import SoothsayerRuntime
+
+SYSTEM_PROMPT = "You are Soothsayer. Answer in one word."
+
+
+def _agent_factory(llm):
+    from crewai import Agent
+
+    return Agent(
+        role="Benchmark", goal="Answer briefly", backstory="Used for overhead measurement.",
+        allow_delegation=False, verbose=False, llm=llm,
+    )
+
+
+def _report(label: str, samples) -> float:
+    mean = statistics.mean(samples) * 1e3
+    p95 = sorted(samples)[int(len(samples) * 0.95) - 1] * 1e3
+    print(f"  {label:<28} mean {mean:8.3f} ms   p95 {p95:8.3f} ms")
+    return mean
+
+
+def bench_setup(n: int, url: str, model: str) -> None:
+    try:
+        from crewai import Crew, Task
+        from langchain_ollama import OllamaLLM
+    except ImportError:
+        print("[setup] skipped: crewai / langchain_ollama not installed")
+        return
+
+    print("[setup] objects built per request")
+    before = []
+    for i in range(n):
+        start = time.perf_counter()
+        agent = _agent_factory(OllamaLLM(base_url=url, model=model))
+        task = Task(description=f"q{i}", expected_output="one word", agent=agent)
+        Crew(agents=[agent], tasks=[task], verbose=False)
+        before.append(time.perf_counter() - start)
+
+    runtime = SoothsayerRuntime(SYSTEM_PROMPT, _agent_factory, model=model, base_url=url)
+    agent = runtime.agent
+    after = []
+    for i in range(n):
+        start = time.perf_counter()
+        Task(description=f"q{i}", expected_output="one word", agent=agent)
+        after.append(time.perf_counter() - start)
+
+    old = _report("rebuild LLM+Agent+Crew", before)
+    new = _report("runtime (Task only)", after)
+    print(f"  → {old / new:.1f}x less setup per request")
+
+
+def bench_http(n: int, url: str, model: str) -> None:
+    print("[http] streamed round trips")
+    before = []
+    for i in range(n):
+        start = time.perf_counter()
+        for _ in OllamaClient(base_url=url).stream(model, f"q{i}", system=SYSTEM_PROMPT):
+            pass
+        before.append(time.perf_counter() - start)
+
+    runtime = SoothsayerRuntime(
+        SYSTEM_PROMPT, _agent_factory, model=model, base_url=url, cache=LLMCache(enabled=False)
+    )
+    after = []
+    for i in range(n):
+        start = time.perf_counter()
+        for _ in runtime.stream(f"q{i}"):
+            pass
+        after.append(time.perf_counter() - start)
+
+    _report("fresh connection", before)
+    _report("runtime pooled connection", after)
+    print(f"  runtime framework overhead: {runtime.stats()['mean_overhead_ms']:.3f} ms/request")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://localhost:11434")
+    ap.add_argument("--model", default="mistral")
+    ap.add_argument("--requests", type=int, default=200)
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    bench_setup(args.requests, args.url, args.model)
+    bench_http(args.requests, args.url, args.model)
+
+
+if __name__ == "__main__":
+    main()
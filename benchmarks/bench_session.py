@@ -0,0 +1,87 @@
+"""
+Benchmark: per-turn prompt evaluation with and without session context reuse.
+
+Runs the same multi-turn conversation twice:
+  - history:  stateless calls that re-send the system prompt plus the whole
+              transcript every turn (what a chat without `context` has to do)
+  - session:  ChatSession, which sends the system prompt once and afterwards
+              only the new user text plus Ollama's returned `context`
+
+Prints prompt_eval tokens and time for every turn. In session mode, turn N
+should cost about as much as turn 1's user text, not the whole conversation.
+
+Without --url, a stub server is started whose prompt-eval time scales with
+the prompt (--prompt-eval-rate). Point --url at a real Ollama to measure the
+model's prefix cache.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_session [--turns 8] [--url http://localhost:11434] [--model mistral]
+"""
+import argparse
+
+from benchmarks.stub_ollama import start_stub
+from configs.tools.core import interaction_log
+from configs.tools.core.llm_cache import LLMCache
+from configs.tools.core.runtime import SoothsayerRuntime
+
+SYSTEM_PROMPT = (
+    "You are Soothsayer, a cognitive strategist for communication clarity. "
+    "Reframe internal updates into accessible, aligned and resonant communication. " * 20
+)
+
+
+def run_history(runtime: SoothsayerRuntime, questions) -> list:
+    transcript, rows = [], []
+    for question in questions:
+        transcript.append(f"User: {question}")
+        stream = runtime.client.stream(
+            runtime.model, "\n".join(transcript), system=runtime.system_prompt, options=runtime.options
+        )
+        for _ in stream:
+            pass
+        transcript.append(f"Assistant: {stream.text}")
+        rows.append((stream.final.get("prompt_eval_count", 0), stream.final.get("prompt_eval_duration", 0) / 1e6))
+    return rows
+
+
+def run_session(runtime: SoothsayerRuntime, questions) -> list:
+    session = runtime.session()
+    for question in questions:
+        session.ask(question)
+    return [(t["prompt_eval_count"], t["prompt_eval_ms"]) for t in session.turns]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--turns", type=int, default=8)
+    ap.add_argument("--url", help="Ollama base URL (default: start a stub)")
+    ap.add_argument("--model", default="mistral")
+    ap.add_argument("--prompt-eval-rate", type=float, default=2000.0, help="stub prompt tokens per second")
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_stub(latency=0.0, token_rate=2000.0, tokens=60, prompt_eval_rate=args.prompt_eval_rate)
+    questions = [f"Turn {i + 1}: reframe the rollout note for the support team, keeping it short." for i in range(args.turns)]
+    try:
+        runtime = SoothsayerRuntime(
+            SYSTEM_PROMPT, agent_factory=lambda llm: None, model=args.model, base_url=url, cache=LLMCache(enabled=False)
+        )
+        history = run_history(runtime, questions)
+        session = run_session(runtime, questions)
+    finally:
+        if server:
+            server.shutdown()
+
+    print(f"{'turn':>4}  {'history tokens':>14} {'ms':>8}   {'session tokens':>14} {'ms':>8}")
+    for turn, ((h_tokens, h_ms), (s_tokens, s_ms)) in enumerate(zip(history, session), 1):
+        print(f"{turn:>4}  {h_tokens:>14} {h_ms:>8.1f}   {s_tokens:>14} {s_ms:>8.1f}")
+    h_total = sum(ms for _, ms in history)
+    s_total = sum(ms for _, ms in session)
+    print(f"[📊] prompt eval total: history {h_total:.0f} ms, session {s_total:.0f} ms ({h_total / max(s_total, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: generations and tokens per dev_doc, whole-document retries vs field repair.
+
+Both modes ask a stub for the nine dev_doc keys under a JSON schema; each
+field independently comes back invalid (empty) with --invalid-rate:
+  - whole:   any invalid field discards the document and asks again for all
+             nine keys, up to --attempts generations (a manual re-run, automated)
+  - fields:  generate_dev_doc keeps the valid fields and re-asks only for the
+             rejected ones, up to --attempts generations in total
+
+Prints generations and generated tokens per document, and how many
+documents were still invalid after the last attempt.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_structured [--docs 200] [--invalid-rate 0.1] [--attempts 3]
+"""
+import argparse
+import time
+
+from benchmarks.stub_ollama import start_stub
+from configs.tools.core import interaction_log
+from configs.tools.core.ollama_client import OllamaClient
+from configs.tools.core.structured import generate_dev_doc
+
+SYSTEM_PROMPT = "You are Soothsayer. Improve the dev_doc below and answer with a JSON object."
+
+
+def run_whole(client: OllamaClient, docs: int, attempts: int) -> dict:
+    generations = tokens = invalid = 0
+    for i in range(docs):
+        for _ in range(attempts):
+            result = generate_dev_doc(client, "mistral", SYSTEM_PROMPT, f"doc {i}", max_repairs=0)
+            generations += 1
+            tokens += result["eval_tokens"]
+            if result["valid"]:
+                break
+        else:
+            invalid += 1
+    return {"generations": generations, "tokens": tokens, "invalid": invalid}
+
+
+def run_fields(client: OllamaClient, docs: int, attempts: int) -> dict:
+    generations = tokens = invalid = 0
+    for i in range(docs):
+        result = generate_dev_doc(client, "mistral", SYSTEM_PROMPT, f"doc {i}", max_repairs=attempts - 1)
+        generations += result["generations"]
+        tokens += result["eval_tokens"]
+        invalid += not result["valid"]
+    return {"generations": generations, "tokens": tokens, "invalid": invalid}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--invalid-rate", type=float, default=0.1, help="chance each field comes back invalid")
+    ap.add_argument("--attempts", type=int, default=3, help="generations allowed per document")
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    rows = {}
+    for name, run in (("whole", run_whole), ("fields", run_fields)):
+        # Same seed per mode, so both see the same sequence of field failures.
+        server, url = start_stub(latency=0.0, token_rate=20000.0, tokens=30, json_invalid_rate=args.invalid_rate, seed=7)
+        client = OllamaClient(base_url=url)
+        started = time.perf_counter()
+        try:
+            rows[name] = {**run(client, args.docs, args.attempts), "seconds": time.perf_counter() - started}
+        finally:
+            client.close()
+            server.shutdown()
+
+    print(f"[🧪] {args.docs} docs, {args.invalid_rate:.0%} of fields invalid, {args.attempts} generations allowed")
+    print(f"{'mode':<8} {'gens/doc':>9} {'tokens/doc':>11} {'invalid':>8} {'wall s':>7}")
+    for name, row in rows.items():
+        print(
+            f"{name:<8} {row['generations'] / args.docs:>9.2f} {row['tokens'] / args.docs:>11.0f} "
+            f"{row['invalid']:>8} {row['seconds']:>7.1f}"
+        )
+    saved = 1 - rows["fields"]["tokens"] / max(rows["whole"]["tokens"], 1)
+    print(f"[📊] field repair generated {saved:.0%} fewer tokens per document")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: cold vs. warm first-request latency, and idle gaps with and without a heartbeat.
+
+Each scenario starts a fresh stub Ollama whose models take --load-s seconds
+to load when not resident (see benchmarks.stub_ollama), then streams through
+SoothsayerRuntime:
+  - cold:       no warm-up; the first request pays the load
+  - warm-up:    runtime.warm_up() at startup, first request after --think seconds
+  - early:      warm-up, first request after 1/4 of the load (arrives while warming)
+  - idle:       warm model, keep_alive --keep-alive, then --idle seconds of silence
+  - heartbeat:  as idle, with a keep-resident ping every keep_alive / 2
+
+Prints time to first token for the first request (and the one after the
+idle gap) per scenario.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_warmup [--load-s 3] [--think 4] [--keep-alive 2s] [--idle 3]
+"""
+import argparse
+import time
+
+from benchmarks.stub_ollama import parse_duration, start_stub
+from configs.tools.core import interaction_log
+from configs.tools.core.llm_cache import LLMCache
+from configs.tools.core.runtime import SoothsayerRuntime
+
+
+def ttft(runtime: SoothsayerRuntime, prompt: str) -> float:
+    started = time.perf_counter()
+    stream = runtime.stream(prompt)
+    first = None
+    for _ in stream:
+        if first is None:
+            first = time.perf_counter() - started
+    return first or 0.0
+
+
+def scenario(name: str, args) -> dict:
+    server, url = start_stub(latency=0.05, token_rate=200.0, tokens=20, load_s=args.load_s)
+    try:
+        keep_alive = args.keep_alive if name in ("idle", "heartbeat") else "30m"
+        runtime = SoothsayerRuntime("You are Soothsayer.", agent_factory=lambda llm: None, base_url=url,
+                                    cache=LLMCache(enabled=False), coalesce=False, keep_alive=keep_alive)
+        row = {"scenario": name}
+        if name == "cold":
+            row["first_ms"] = ttft(runtime, "first question") * 1e3
+        elif name in ("warm-up", "early"):
+            runtime.warm_up(heartbeat_s=0)
+            time.sleep(args.think if name == "warm-up" else args.load_s / 4)
+            row["first_ms"] = ttft(runtime, "first question") * 1e3
+            row["warm_s"] = runtime.warmer.warm_s
+        else:
+            runtime.warm_up(heartbeat_s=parse_duration(keep_alive) / 2 if name == "heartbeat" else 0)
+            runtime.warmer.wait()
+            row["first_ms"] = ttft(runtime, "first question") * 1e3
+            time.sleep(args.idle)
+            row["after_idle_ms"] = ttft(runtime, "question after the gap") * 1e3
+            runtime.warmer.stop()
+        return row
+    finally:
+        server.shutdown()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--load-s", type=float, default=3.0, help="stub model-load time (s)")
+    ap.add_argument("--think", type=float, default=4.0, help="startup-to-first-question gap (s)")
+    ap.add_argument("--keep-alive", default="2s", help="keep_alive for the idle scenarios")
+    ap.add_argument("--idle", type=float, default=3.0, help="idle gap (s); longer than --keep-alive unloads")
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    rows = [scenario(name, args) for name in ("cold", "warm-up", "early", "idle", "heartbeat")]
+    print(f"[🧪] model load {args.load_s:.1f}s, think time {args.think:.1f}s, keep_alive {args.keep_alive}, idle {args.idle:.1f}s")
+    print(f"{'scenario':<10} {'first TTFT ms':>14} {'after idle ms':>14}")
+    for row in rows:
+        after = f"{row['after_idle_ms']:>14.0f}" if "after_idle_ms" in row else f"{'-':>14}"
+        print(f"{row['scenario']:<10} {row['first_ms']:>14.0f} {after}")
+    cold, warm = rows[0]["first_ms"], rows[1]["first_ms"]
+    print(f"[📊] warm-up cut the first request's time to first token from {cold:.0f} ms to {warm:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+End-to-end benchmark suite against the stub Ollama server.
+
+Starts benchmarks.stub_ollama on a free port and runs every entry point
+against it, each scenario in its own subprocess (so peak RSS is per
+scenario), with SOOTHSAYER_OLLAMA_URL pointing at the stub and the response
+cache disabled:
+
+    cli_stream      main.interactive_cli(stream=True), one reply per scripted input
+    cli_crew        main.interactive_cli(stream=False) through the CrewAI agent
+    gradio_interact gradio_ui.app.interact_with_soothsayer
+    gradio_stream   gradio_ui.app.stream_with_soothsayer, drained
+    runner_convert  configs.tools.core.runner.run_conversion on input_docs/
+    agent_batch     agents.soothsayer_agent.build_runtime + run_batch
+
+Reports p50/p95/p99 latency, requests/s and peak RSS per scenario and writes
+everything (plus git commit and stub settings) to a JSON file, so runs can be
+compared across commits with --compare. Scenarios whose dependencies are not
+installed are reported as skipped.
+
+Usage (from the repo root):
+    python -m benchmarks.e2e_suite [--requests 20] [--only cli_stream,runner_convert]
+                                   [--out benchmarks/results/e2e.json] [--compare old.json]
+"""
+import argparse
+import builtins
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.stub_ollama import start_stub
+
+SCENARIOS = ("cli_stream", "cli_crew", "gradio_interact", "gradio_stream", "runner_convert", "agent_batch")
+SAMPLE_DOC = "input_docs/add_numbers.md"
+
+
+# === Scenarios (run inside the child process) ===
+def _scripted_cli(stream: bool, requests: int) -> list:
+    """Feeds `requests` prompts to main.interactive_cli; a turn is the time between two input() calls."""
+    from rich.console import Console
+    import main
+
+    main.console = Console(file=io.StringIO(), force_terminal=False, width=100)
+    marks = []
+
+    def fake_input(_prompt=""):
+        marks.append(time.perf_counter())
+        if len(marks) > requests:
+            return "exit"
+        return f"Reframe update #{len(marks)} for the platform team"
+
+    original_input = builtins.input
+    builtins.input = fake_input
+    try:
+        main.interactive_cli(stream=stream)
+    finally:
+        builtins.input = original_input
+    return [b - a for a, b in zip(marks, marks[1:])]
+
+
+def scenario_cli_stream(requests: int) -> list:
+    return _scripted_cli(True, requests)
+
+
+def scenario_cli_crew(requests: int) -> list:
+    import crewai  # noqa: F401  (skip cleanly instead of failing on the first turn)
+
+    return _scripted_cli(False, requests)
+
+
+def scenario_gradio_interact(requests: int) -> list:
+    from gradio_ui.app import interact_with_soothsayer
+
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        interact_with_soothsayer(f"Clarify rollout note #{i}")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def scenario_gradio_stream(requests: int) -> list:
+    from gradio_ui.app import stream_with_soothsayer
+
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        for _ in stream_with_soothsayer(f"Clarify rollout note #{i}"):
+            pass
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def scenario_runner_convert(requests: int) -> list:
+    from configs.tools.core.runner import run_conversion
+
+    latencies = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for i in range(requests):
+            started = time.perf_counter()
+            run_conversion(SAMPLE_DOC, os.path.join(out_dir, f"doc_{i}.md"))
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def scenario_agent_batch(requests: int) -> list:
+    import crewai  # noqa: F401
+    from agents.soothsayer_agent import build_runtime, run_batch
+
+    runtime = build_runtime(SAMPLE_DOC)
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        run_batch(runtime)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run_child(name: str, requests: int, out_path: str) -> None:
+    """Runs one scenario in this process and writes its raw result to `out_path`."""
+    from configs.tools.core import interaction_log
+
+    interaction_log.configure(enabled=False)
+    result = {"scenario": name}
+    started = time.perf_counter()
+    try:
+        latencies = globals()[f"scenario_{name}"](requests)
+        result.update(status="ok", latencies_s=latencies)
+    except ImportError as e:
+        result.update(status="skipped", reason=f"missing dependency: {e.name or e}")
+    except Exception as e:
+        result.update(status="failed", reason=f"{type(e).__name__}: {e}")
+    result["wall_s"] = time.perf_counter() - started
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+# === Orchestration (parent process) ===
+def _pct(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1e3 if ordered else 0.0
+
+
+def summarize(raw: dict) -> dict:
+    """Turns a child's raw latencies into the p50/p95/p99, requests/s and RSS summary."""
+    summary = {k: v for k, v in raw.items() if k != "latencies_s"}
+    samples = raw.get("latencies_s") or []
+    if samples:
+        summary.update(
+            requests=len(samples),
+            p50_ms=_pct(samples, 50),
+            p95_ms=_pct(samples, 95),
+            p99_ms=_pct(samples, 99),
+            requests_per_s=len(samples) / sum(samples),
+        )
+    return summary
+
+
+def run_scenario(name: str, requests: int, env: dict) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        out_path = tmp.name
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.e2e_suite", "--child", name, "--requests", str(requests), "--out", out_path],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            with open(out_path, encoding="utf-8") as f:
+                return summarize(json.load(f))
+        except (OSError, ValueError):
+            return {"scenario": name, "status": "failed", "reason": f"exit {proc.returncode}: {proc.stderr[-500:]}"}
+    finally:
+        os.remove(out_path)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(results: list, baseline: dict = None) -> None:
+    print(f"{'scenario':<16} {'status':<8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'RSS MB':>8}")
+    for r in results:
+        if r["status"] != "ok":
+            print(f"{r['scenario']:<16} {r['status']:<8} {r.get('reason', '')}")
+            continue
+        line = (
+            f"{r['scenario']:<16} {'ok':<8} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}"
+            f" {r['requests_per_s']:>8.2f} {r['peak_rss_mb']:>8.1f}"
+        )
+        old = (baseline or {}).get(r["scenario"])
+        if old and old.get("status") == "ok":
+            line += f"   p95 {(r['p95_ms'] / old['p95_ms'] - 1) * 100:+.1f}% vs {old['commit']}"
+        print(line)
+
+
+def load_baseline(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {r["scenario"]: dict(r, commit=report.get("commit", "?")) for r in report["scenarios"]}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=20, help="requests per scenario")
+    ap.add_argument("--only", help="comma-separated subset of: " + ",".join(SCENARIOS))
+    ap.add_argument("--out", help="results JSON (default benchmarks/results/e2e_<commit>_<time>.json)")
+    ap.add_argument("--compare", help="earlier results JSON to diff p95 against")
+    ap.add_argument("--latency", type=float, default=0.05, help="stub prompt-eval latency (s)")
+    ap.add_argument("--token-rate", type=float, default=400.0, help="stub tokens per second")
+    ap.add_argument("--tokens", type=int, default=40, help="stub tokens per reply")
+    ap.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        run_child(args.child, args.requests, args.out)
+        return
+
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        ap.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    stub = {"latency": args.latency, "token_rate": args.token_rate, "tokens": args.tokens}
+    server, url = start_stub(**stub)
+    env = dict(os.environ, SOOTHSAYER_OLLAMA_URL=url, SOOTHSAYER_NO_CACHE="1", SOOTHSAYER_INTERACTION_LOG="0")
+    try:
+        results = []
+        for name in names:
+            print(f"[⏳] {name} ...", flush=True)
+            results.append(run_scenario(name, args.requests, env))
+    finally:
+        server.shutdown()
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "requests_per_scenario": args.requests,
+        "stub": stub,
+        "scenarios": results,
+    }
+    out_path = args.out or os.path.join(
+        "benchmarks", "results", f"e2e_{commit}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print_report(results, load_baseline(args.compare) if args.compare else None)
+    print(f"[✅] Results written to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Load test: concurrent streamed requests through the Gradio app's admission
+controller against a local stub Ollama server.
+
+Fires `--users` requests at once, each streaming a full reply via
+SoothsayerRuntime, and reports completions, fast rejections, timeouts,
+latency percentiles and the controller's /status payload.
+
+Usage (from the repo root):
+    python -m benchmarks.load_serving [--users 40] [--max-inflight 4] [--max-queue 16] [--timeout 10]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.stub_ollama import start_stub
+from configs.tools.core import interaction_log
+from configs.tools.core.llm_cache import LLMCache
+from configs.tools.core.runtime import SoothsayerRuntime
+from configs.tools.core.serving import AdmissionController, OverloadedError
+
+
+async def one_user(i: int, controller: AdmissionController, runtime: SoothsayerRuntime) -> tuple:
+    started = time.perf_counter()
+    try:
+        async for _ in controller.stream(lambda: runtime.stream(f"user {i}: reframe this update")):
+            pass
+        return "completed", time.perf_counter() - started
+    except OverloadedError:
+        return "rejected", time.perf_counter() - started
+    except asyncio.TimeoutError:
+        return "timed_out", time.perf_counter() - started
+
+
+def _pct(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1e3 if ordered else 0.0
+
+
+async def run_load(args, url: str) -> dict:
+    controller = AdmissionController(args.max_inflight, args.max_queue, args.timeout)
+    runtime = SoothsayerRuntime(
+        "You are Soothsayer.", agent_factory=lambda llm: None, base_url=url, cache=LLMCache(enabled=False)
+    )
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one_user(i, controller, runtime) for i in range(args.users)))
+    wall = time.perf_counter() - started
+
+    by_outcome = {}
+    for outcome, seconds in results:
+        by_outcome.setdefault(outcome, []).append(seconds)
+    print(f"[📊] {args.users} users, max_inflight={args.max_inflight}, max_queue={args.max_queue}: {wall:.2f}s wall")
+    for outcome, samples in sorted(by_outcome.items()):
+        print(
+            f"  {outcome:<10} {len(samples):>4}   p50 {_pct(samples, 50):8.1f} ms"
+            f"   p95 {_pct(samples, 95):8.1f} ms   max {max(samples) * 1e3:8.1f} ms"
+        )
+    status = controller.status()
+    print("  /status:", json.dumps(status))
+    return status
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=40)
+    ap.add_argument("--max-inflight", type=int, default=4)
+    ap.add_argument("--max-queue", type=int, default=16)
+    ap.add_argument("--timeout", type=float, default=10.0)
+    ap.add_argument("--latency", type=float, default=0.2, help="stub prompt-eval latency (s)")
+    ap.add_argument("--token-rate", type=float, default=40.0, help="stub tokens per second")
+    ap.add_argument("--tokens", type=int, default=40, help="stub tokens per reply")
+    args = ap.parse_args()
+    interaction_log.configure(enabled=False)
+
+    server, url = start_stub(latency=args.latency, token_rate=args.token_rate, tokens=args.tokens)
+    try:
+        asyncio.run(run_load(args, url))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Replay recorded interactions against the app, at a chosen rate and concurrency.
+
+Reads the interaction log (.cache/interactions/*.jsonl.gz, written by every
+entry point unless SOOTHSAYER_INTERACTION_LOG=0) or, with --flagged, the
+Gradio flagging CSVs, and re-sends each recorded prompt through a target:
+
+    interact   gradio_ui.app.interact_with_soothsayer (CrewAI path)
+    stream     gradio_ui.app.stream_with_soothsayer, drained
+    runtime    SoothsayerRuntime.stream with a generic system prompt (no app imports)
+
+Arrivals are open-loop: request i is due at its recorded offset divided by
+--speed, or every 1/--rate seconds with --rate. --speed 0 sends as fast as
+--concurrency workers allow. Latency is measured from the due time, so it
+includes any wait for a free worker; "service" is the call alone.
+
+Without --url, a stub Ollama is started (see benchmarks.stub_ollama), so
+traffic can be replayed without a model. The response cache is off unless
+--cache, and replayed requests are not logged again.
+
+Usage (from the repo root):
+    python -m benchmarks.replay [--log-dir .cache/interactions | --flagged] [--target stream]
+                                [--speed 1 | --rate 5] [--concurrency 4] [--limit 200] [--url URL]
+"""
+import argparse
+import csv
+import glob
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+from benchmarks.stub_ollama import start_stub
+
+TARGETS = ("interact", "stream", "runtime")
+
+
+def load_flagged(pattern: str = ".gradio/flagged/dataset*.csv") -> List[Dict]:
+    """Prompts from Gradio's flagging CSVs: first column is the input, `timestamp` the time."""
+    records = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if not row or row[0] in ("user_input", "🎯 Ask Soothsayer") or not row[0].strip():
+                    continue
+                try:
+                    ts = datetime.fromisoformat(row[-1]).timestamp()
+                except ValueError:
+                    ts = 0.0
+                records.append({"ts": ts, "prompt": row[0], "kind": "flagged"})
+    return records
+
+
+def load_log(directory: str) -> List[Dict]:
+    from configs.tools.core.interaction_log import iter_interactions, segments
+
+    return [r for r in iter_interactions(segments(directory)) if r.get("prompt")]
+
+
+def build_target(name: str):
+    if name == "interact":
+        from gradio_ui.app import interact_with_soothsayer
+
+        return interact_with_soothsayer
+    if name == "stream":
+        from gradio_ui.app import stream_with_soothsayer
+
+        def drain(prompt):
+            for _ in stream_with_soothsayer(prompt):
+                pass
+
+        return drain
+    from configs.tools.core.llm_cache import LLMCache
+    from configs.tools.core.runtime import SoothsayerRuntime
+
+    runtime = SoothsayerRuntime("You are Soothsayer.", agent_factory=lambda llm: None, cache=LLMCache())
+
+    def drain_runtime(prompt):
+        for _ in runtime.stream(prompt):
+            pass
+
+    return drain_runtime
+
+
+def schedule(records: List[Dict], speed: float, rate: float) -> List[float]:
+    """Due offset in seconds for every record."""
+    if rate > 0:
+        return [i / rate for i in range(len(records))]
+    if speed <= 0:
+        return [0.0] * len(records)
+    first = records[0].get("ts", 0.0)
+    return [max(0.0, (r.get("ts", first) - first) / speed) for r in records]
+
+
+def _pct(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1e3 if ordered else 0.0
+
+
+def replay(records: List[Dict], call, offsets: List[float], concurrency: int) -> Dict:
+    latencies, service, errors = [], [], {}
+    lock = threading.Lock()
+
+    def one(prompt: str, due: float) -> None:
+        started = time.perf_counter()
+        try:
+            call(prompt)
+            ok = True
+        except Exception as e:
+            ok = False
+            with lock:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        done = time.perf_counter()
+        if ok:
+            with lock:
+                latencies.append(done - due)
+                service.append(done - started)
+
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for record, offset in zip(records, offsets):
+            due = begin + offset
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(one, record["prompt"], due)
+    wall = time.perf_counter() - begin
+    return {"latencies": latencies, "service": service, "errors": errors, "wall": wall}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--log-dir", default=None, help="interaction log folder (default: SOOTHSAYER_INTERACTION_LOG or .cache/interactions)")
+    ap.add_argument("--flagged", action="store_true", help="replay .gradio/flagged/dataset*.csv instead of the log")
+    ap.add_argument("--target", choices=TARGETS, default="stream")
+    ap.add_argument("--speed", type=float, default=1.0, help="time compression of recorded gaps (0: no gaps)")
+    ap.add_argument("--rate", type=float, default=0.0, help="fixed arrivals per second instead of recorded timing")
+    ap.add_argument("--concurrency", type=int, default=4, help="requests in flight at once")
+    ap.add_argument("--limit", type=int, default=0, help="replay at most this many records")
+    ap.add_argument("--kind", default="", help="only records of this kind (run, stream, session, ...)")
+    ap.add_argument("--url", help="Ollama base URL (default: start a stub)")
+    ap.add_argument("--cache", action="store_true", help="keep the response cache on")
+    ap.add_argument("--latency", type=float, default=0.2, help="stub prompt-eval latency (s)")
+    ap.add_argument("--token-rate", type=float, default=50.0, help="stub tokens per second")
+    args = ap.parse_args()
+
+    # Read the log before turning logging off for this process (the folder comes from the same variable).
+    from configs.tools.core import interaction_log
+
+    records = load_flagged() if args.flagged else load_log(args.log_dir or interaction_log.log_dir())
+    if args.kind:
+        records = [r for r in records if r.get("kind") == args.kind]
+    records.sort(key=lambda r: r.get("ts", 0.0))
+    if args.limit:
+        records = records[: args.limit]
+    if not records:
+        print("[❌] Nothing to replay. Use the app with interaction logging on, or pass --flagged.")
+        raise SystemExit(1)
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_stub(latency=args.latency, token_rate=args.token_rate)
+    # Set before the app modules are imported: they read these once.
+    os.environ["SOOTHSAYER_OLLAMA_URL"] = url
+    if not args.cache:
+        os.environ["SOOTHSAYER_NO_CACHE"] = "1"
+    interaction_log.configure(enabled=False)
+    try:
+        call = build_target(args.target)
+        offsets = schedule(records, args.speed, args.rate)
+        result = replay(records, call, offsets, args.concurrency)
+    finally:
+        if server:
+            server.shutdown()
+
+    latencies, service = result["latencies"], result["service"]
+    recorded = [r["ms"] / 1e3 for r in records if "ms" in r]
+    print(f"[🧪] {len(records)} records → {args.target} at {'rate ' + str(args.rate) + '/s' if args.rate else 'speed ' + str(args.speed) + 'x'}, "
+          f"concurrency {args.concurrency}, backend {url}")
+    print(f"{'':<10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, samples in (("latency", latencies), ("service", service), ("recorded", recorded)):
+        if samples:
+            print(f"{name:<10} {len(samples):>6} {_pct(samples, 50):>9.1f} {_pct(samples, 95):>9.1f} {_pct(samples, 99):>9.1f} {max(samples) * 1e3:>9.1f}")
+    for error, count in sorted(result["errors"].items()):
+        print(f"[❌] {error}: {count}")
+    print(f"[📊] {len(latencies)} ok in {result['wall']:.1f}s ({len(latencies) / result['wall']:.1f} req/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Stub Ollama server for load tests and benchmarks.
+
+Implements enough of the Ollama HTTP API (/api/generate, /api/chat,
+/api/tags, /api/version) to drive the Soothsayer client code, langchain_ollama
+and CrewAI's LiteLLM backend without a model: every reply is a fixed lorem
+string, emitted after a configurable prompt-eval latency at a configurable
+token rate. With --prompt-eval-rate the pre-token delay also grows with the
+prompt, and a request carrying `context` is charged only for its new tokens,
+as Ollama's prefix cache would; the returned `context` holds one id per
+word seen so far.
+
+--fault makes the next --fault-count generate/chat requests misbehave
+(-1: all of them): `error` answers 503, `stall` sends nothing for
+--stall seconds, `stall_midstream` stalls after the first token, `truncate`
+ends a stream after two tokens without its final chunk, `drop` closes the
+connection without answering. POST /_stub/fault with
+{"fault": ..., "count": ...} changes the fault while the stub runs.
+
+A request with a JSON schema `format` gets a JSON object with the schema's
+properties, streamed a few characters per token; --json-invalid-rate is the
+chance that any one field comes back empty, to exercise field repair.
+
+With --load-s, a model that is not resident pays that many seconds before
+its first token, as Ollama does when it loads weights; it then stays resident
+for the request's keep_alive (default 5m, negative: forever). A generate
+request with an empty prompt only loads the model, and GET /api/ps lists
+the resident models.
+
+--model NAME=SPEED[,INVALID] gives one model its own behaviour: SPEED
+divides the latency and per-token time (a small model is faster), and
+INVALID replaces --json-invalid-rate for it and is also the chance a plain
+reply comes back empty, to exercise model routing and escalation.
+
+Usage (from the repo root):
+    python -m benchmarks.stub_ollama [--port 11434] [--latency 0.2] [--token-rate 50] [--tokens 40] [--prompt-eval-rate 0]
+                                     [--fault none|error|stall|stall_midstream|truncate|drop] [--fault-count -1] [--stall 600]
+                                     [--json-invalid-rate 0] [--load-s 0] [--model llama3.2:3b=3,0.2 ...]
+"""
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+WORDS = "clarity bridges intent and action so every update lands with purpose".split()
+FAULTS = ("none", "error", "stall", "stall_midstream", "truncate", "drop")
+
+
+def parse_duration(value, default: float = 300.0) -> float:
+    """Ollama keep_alive (seconds, or "30s" / "5m" / "1h") in seconds; negative means forever."""
+    if value is None or value == "":
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    units = {"s": 1, "m": 60, "h": 3600}
+    text = str(value).strip()
+    if text[-1:] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+class StubConfig:
+    """Behaviour knobs shared by every request the stub serves."""
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        token_rate: float = 50.0,
+        tokens: int = 40,
+        prompt_eval_rate: float = 0.0,
+        fault: str = "none",
+        fault_count: int = -1,
+        stall_s: float = 600.0,
+        json_invalid_rate: float = 0.0,
+        seed: int = 0,
+        models: Optional[Dict[str, Tuple[float, float]]] = None,
+        load_s: float = 0.0,
+        paragraphs: int = 1,
+    ):
+        self.latency = latency
+        self.token_rate = token_rate
+        self.tokens = tokens
+        self.prompt_eval_rate = prompt_eval_rate
+        self.stall_s = stall_s
+        self.json_invalid_rate = json_invalid_rate
+        self.rng = random.Random(seed)
+        self.models = dict(models or {})
+        self.load_s = load_s
+        self.paragraphs = max(1, paragraphs)
+        # model -> (loaded at, unloads at), in time.time() seconds
+        self.resident: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.set_fault(fault, fault_count)
+
+    def set_fault(self, fault: str, count: int = -1) -> None:
+        """Injects `fault` into the next `count` requests (-1: until changed)."""
+        if fault not in FAULTS:
+            raise ValueError(f"unknown fault {fault!r}; expected one of {FAULTS}")
+        with self._lock:
+            self.fault = fault
+            self.fault_count = count
+
+    def take_fault(self) -> str:
+        """The fault for the request being served, using up one of fault_count."""
+        with self._lock:
+            if self.fault == "none" or self.fault_count == 0:
+                return "none"
+            if self.fault_count > 0:
+                self.fault_count -= 1
+            return self.fault
+
+    def for_model(self, model: str) -> Tuple[float, float]:
+        """(speed factor, invalid rate) for a model; names match with or without a `:latest` tag."""
+        speed, invalid = self.models.get(model) or self.models.get(model.split(":latest")[0]) or (1.0, self.json_invalid_rate)
+        return speed, invalid
+
+    def load(self, model: str, keep_alive) -> float:
+        """Seconds this request waits for `model` to load (0 when resident); keeps it resident for keep_alive after."""
+        now = time.time()
+        seconds = parse_duration(keep_alive)
+        with self._lock:
+            ready_at, expires = self.resident.get(model, (0.0, 0.0))
+            if expires <= now:
+                ready_at = now + self.load_s
+            self.resident[model] = (ready_at, float("inf") if seconds < 0 else max(ready_at, now) + seconds)
+        return max(0.0, ready_at - now)
+
+    def chance(self, rate: float) -> bool:
+        with self._lock:
+            return self.rng.random() < rate
+
+    def json_pieces(self, schema: dict, invalid_rate: Optional[float] = None) -> list:
+        """
+        A JSON object for the schema's properties (`tokens` words each), split into token-sized pieces.
+
+        Free-text values are split into `paragraphs` blank-line-separated paragraphs.
+        """
+        properties = schema.get("properties") or {"response": {}}
+        rate = self.json_invalid_rate if invalid_rate is None else invalid_rate
+        obj = {}
+        for i, (key, rules) in enumerate(properties.items()):
+            invalid = self.chance(rate)
+            if invalid:
+                obj[key] = ""
+            elif "pattern" in rules:
+                obj[key] = "stub" + key.title().replace("_", "")
+            else:
+                words = [WORDS[(i + j) % len(WORDS)] for j in range(self.tokens)]
+                step = -(-len(words) // self.paragraphs)
+                text = "\n\n".join(" ".join(words[p:p + step]) for p in range(0, len(words), step))
+                obj[key] = text[: rules.get("maxLength", len(text))]
+        text = json.dumps(obj)
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    config = StubConfig()
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, payload: dict) -> None:
+        data = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": "mistral:latest"}]})
+        elif self.path == "/api/ps":
+            now = time.time()
+            with self.config._lock:
+                resident = [(m, t) for m, (_, t) in self.config.resident.items() if t > now]
+            self._send_json(200, {"models": [
+                {"name": m, "model": m, "expires_at": "forever" if t == float("inf") else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))}
+                for m, t in resident
+            ]})
+        elif self.path == "/api/version":
+            self._send_json(200, {"version": "0.0.0-stub"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.config
+        if self.path == "/_stub/fault":
+            try:
+                config.set_fault(request.get("fault", "none"), int(request.get("count", -1)))
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            self._send_json(200, {"fault": config.fault, "count": config.fault_count})
+            return
+        if self.path not in ("/api/generate", "/api/chat"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        fault = config.take_fault()
+        if fault == "error":
+            self._send_json(503, {"error": "stub: injected server error"})
+            return
+        if fault == "drop":
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if fault == "stall":
+            time.sleep(config.stall_s)
+
+        load_s = config.load(request.get("model", ""), request.get("keep_alive")) if config.load_s else 0.0
+        time.sleep(load_s)
+        chat = self.path == "/api/chat"
+        if not chat and not request.get("prompt") and not request.get("format"):
+            # An empty prompt only loads the model.
+            self._send_json(200, {"model": request.get("model", ""), "done": True, "done_reason": "load",
+                                  "response": "", "load_duration": int(load_s * 1e9)})
+            return
+        if chat:
+            prompt = " ".join(str(m.get("content", "")) for m in request.get("messages", []))
+        else:
+            prompt = request.get("system", "") + " " + request.get("prompt", "")
+        prompt_tokens = len(prompt.split())
+        speed, invalid_rate = config.for_model(request.get("model", ""))
+        if isinstance(request.get("format"), dict):
+            pieces = config.json_pieces(request["format"], invalid_rate)
+        elif config.models and config.chance(invalid_rate):
+            pieces = []
+        else:
+            pieces = [WORDS[i % len(WORDS)] + " " for i in range(config.tokens)]
+        token_s = 1.0 / (config.token_rate * speed)
+        prompt_eval_s = (config.latency + (prompt_tokens / config.prompt_eval_rate if config.prompt_eval_rate else 0.0)) / speed
+        started = time.perf_counter()
+        time.sleep(prompt_eval_s)
+        final = {
+            "model": request.get("model", ""),
+            "done": True,
+            "load_duration": int(load_s * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_eval_s * 1e9),
+            "eval_count": len(pieces),
+        }
+        if not chat:
+            final["context"] = list(request.get("context") or []) + [1] * (prompt_tokens + len(pieces))
+
+        def body(text):
+            return {"message": {"role": "assistant", "content": text}} if chat else {"response": text}
+
+        if not request.get("stream", True):
+            time.sleep(len(pieces) * token_s)
+            final["eval_duration"] = int((time.perf_counter() - started - prompt_eval_s) * 1e9)
+            self._send_json(200, {**final, **body("".join(pieces))})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i, piece in enumerate(pieces):
+                time.sleep(token_s)
+                self._write_chunk({"model": final["model"], **body(piece), "done": False})
+                if i == 0 and fault == "stall_midstream":
+                    time.sleep(config.stall_s)
+                if i == 1 and fault == "truncate":
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.close_connection = True
+                    return
+            final["eval_duration"] = int((time.perf_counter() - started - prompt_eval_s) * 1e9)
+            self._write_chunk({**final, **body("")})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (e.g. its read timeout fired during a stall).
+            self.close_connection = True
+
+
+def parse_models(specs) -> Dict[str, Tuple[float, float]]:
+    """`NAME=SPEED[,INVALID]` strings (see --model) as a StubConfig `models` dict."""
+    models = {}
+    for spec in specs:
+        name, _, values = spec.rpartition("=")
+        speed, _, invalid = values.partition(",")
+        models[name] = (float(speed), float(invalid or 0.0))
+    return models
+
+
+def start_stub(port: int = 0, **config) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Starts the stub on a background thread.
+
+    Returns:
+        tuple: (server, base_url). Call server.shutdown() when done.
+    """
+    handler = type("ConfiguredStub", (StubOllamaHandler,), {"config": StubConfig(**config)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=11434)
+    ap.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    ap.add_argument("--token-rate", type=float, default=50.0, help="tokens per second")
+    ap.add_argument("--tokens", type=int, default=40, help="tokens per response")
+    ap.add_argument("--prompt-eval-rate", type=float, default=0.0, help="prompt tokens per second (0: fixed latency)")
+    ap.add_argument("--fault", choices=FAULTS, default="none", help="failure to inject into generate/chat requests")
+    ap.add_argument("--fault-count", type=int, default=-1, help="requests affected by --fault (-1: all)")
+    ap.add_argument("--stall", type=float, default=600.0, help="seconds a stall fault lasts")
+    ap.add_argument("--json-invalid-rate", type=float, default=0.0, help="chance each JSON field comes back empty")
+    ap.add_argument("--paragraphs", type=int, default=1, help="paragraphs per free-text JSON field")
+    ap.add_argument("--load-s", type=float, default=0.0, help="seconds to load a model that is not resident")
+    ap.add_argument("--model", action="append", default=[], metavar="NAME=SPEED[,INVALID]",
+                    help="per-model speed factor and invalid-output rate (repeatable)")
+    args = ap.parse_args()
+
+    server, url = start_stub(
+        args.port,
+        latency=args.latency,
+        token_rate=args.token_rate,
+        tokens=args.tokens,
+        prompt_eval_rate=args.prompt_eval_rate,
+        fault=args.fault,
+        fault_count=args.fault_count,
+        stall_s=args.stall,
+        json_invalid_rate=args.json_invalid_rate,
+        models=parse_models(args.model),
+        load_s=args.load_s,
+        paragraphs=args.paragraphs,
+    )
+    print(f"[🧪] Stub Ollama listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
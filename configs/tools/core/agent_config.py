@@ -0,0 +1,129 @@
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+# SOOTHSAYER_AGENT_CONFIG points every entry point at another agent config file.
+AGENT_CONFIG_PATH = Path(os.environ.get("SOOTHSAYER_AGENT_CONFIG", REPO_ROOT / "templates" / "agent_config_template.yaml"))
+
+logger = logging.getLogger("soothsayer.config")
+
+_loaded: Dict[str, Tuple[int, Dict]] = {}
+
+
+def load_agent_config(path: Optional[Path] = None) -> Dict:
+    """
+    Reads the agent config YAML, reusing the parsed result until the file changes.
+
+    A missing file, a missing PyYAML or a malformed document yields an empty
+    dict (and a log line), so callers fall back to their defaults.
+
+    Args:
+        path (Path, optional): Config file. Defaults to AGENT_CONFIG_PATH.
+
+    Returns:
+        dict: The parsed config. Treat it as read-only; it is shared.
+    """
+    path = Path(path or AGENT_CONFIG_PATH)
+    key = str(path)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        logger.warning("agent config %s not found; using defaults", path)
+        return {}
+    cached = _loaded.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        import yaml
+
+        with open(path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+    except (ImportError, OSError, ValueError) as e:
+        logger.warning("agent config %s unreadable (%s); using defaults", path, e)
+        config = {}
+    if not isinstance(config, dict):
+        config = {}
+    _loaded[key] = (mtime_ns, config)
+    return config
+
+
+class LLMConstraints:
+    """
+    The agent config's `constraints` block, applied to every LLM call.
+
+    Args:
+        max_attempts (int): Tries per call, the first one included.
+        retry_on_fail (bool): False makes every call single-shot.
+        token_buffer (int): Context-window tokens kept free for the reply.
+        connect_timeout_s (float): TCP connect timeout.
+        read_timeout_s (float): Longest silence allowed while waiting for response bytes.
+        total_timeout_s (float): Budget for all attempts of one call; no retry
+            starts once it would be exceeded.
+        backoff_base_s (float): First retry waits up to this long (full jitter).
+        backoff_max_s (float): Cap on the jittered wait before any retry.
+        breaker_threshold (int): Consecutive backend failures that open the circuit.
+        breaker_cooldown_s (float): How long an open circuit fails fast before
+            letting one probe call through.
+    """
+
+    FIELDS = {
+        "max_attempts": int,
+        "retry_on_fail": bool,
+        "token_buffer": int,
+        "connect_timeout_s": float,
+        "read_timeout_s": float,
+        "total_timeout_s": float,
+        "backoff_base_s": float,
+        "backoff_max_s": float,
+        "breaker_threshold": int,
+        "breaker_cooldown_s": float,
+    }
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        retry_on_fail: bool = True,
+        token_buffer: int = 200,
+        connect_timeout_s: float = 5.0,
+        read_timeout_s: float = 120.0,
+        total_timeout_s: float = 300.0,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 8.0,
+        breaker_threshold: int = 5,
+        breaker_cooldown_s: float = 30.0,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.retry_on_fail = retry_on_fail
+        self.token_buffer = max(0, token_buffer)
+        self.connect_timeout_s = connect_timeout_s
+        self.read_timeout_s = read_timeout_s
+        self.total_timeout_s = total_timeout_s
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.breaker_threshold = max(1, breaker_threshold)
+        self.breaker_cooldown_s = breaker_cooldown_s
+
+    @property
+    def attempts(self) -> int:
+        return self.max_attempts if self.retry_on_fail else 1
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict] = None) -> "LLMConstraints":
+        """Builds constraints from a parsed agent config; unknown or malformed keys are ignored."""
+        block = (config if config is not None else load_agent_config()).get("constraints") or {}
+        kwargs = {}
+        for name, kind in cls.FIELDS.items():
+            if name in block and block[name] is not None:
+                try:
+                    kwargs[name] = kind(block[name])
+                except (TypeError, ValueError):
+                    logger.warning("constraints.%s=%r is not a valid %s; using the default", name, block[name], kind.__name__)
+        return cls(**kwargs)
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __repr__(self):
+        return f"LLMConstraints({self.as_dict()})"
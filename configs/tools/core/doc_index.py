@@ -0,0 +1,381 @@
+import hashlib
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from configs.tools.doc_schemas import SCHEMA_VERSION, parse_doc_text, schema_for
+
+DEFAULT_INDEX_PATH = ".cache/doc_index.sqlite3"
+DEFAULT_ROOTS = ("input_docs", "output_docs")
+
+# Each doc's schema (doc_schemas.SCHEMAS[mode].index_fields) names the fields indexed as
+# separate sections; a prompt gets the best sections, not whole docs.
+FIELD_BOOST = {"function_name": 2.0, "title": 2.0, "tags": 1.5, "explanation": 1.0, "code": 1.0}
+
+# Per-term postings kept in memory between index changes.
+MAX_CACHED_TERMS = 50_000
+# Candidates come from each term's highest-impact postings; deeper postings are
+# only scored while a section outside the candidates could still reach the top k.
+HEAD_POSTINGS = 128
+# Query terms in more than this share of sections act as scoring-only terms.
+COMMON_TERM_RATIO = 0.1
+
+# BM25 parameters (Robertson/Sparck Jones defaults).
+K1 = 1.2
+B = 0.75
+
+TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercases and splits text into index terms.
+
+    Identifiers are kept whole and also split on underscores, so `add_numbers`
+    matches `add_numbers`, `add` and `numbers`.
+    """
+    terms = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        terms.append(token)
+        if "_" in token:
+            terms.extend(part for part in token.split("_") if part and part not in STOPWORDS)
+    return terms
+
+
+def _ranked(scores: Dict[int, float], shortlist: int) -> Iterator[Tuple[int, float]]:
+    """Yields (section_id, score) best first (ties by section id), sorting everything only if the shortlist runs out."""
+    top = heapq.nlargest(shortlist, scores.items(), key=_rank_key)
+    yield from top
+    if len(top) < len(scores):
+        # nlargest equals sorted(...)[:n], so this continues in the same order.
+        yield from sorted(scores.items(), key=_rank_key, reverse=True)[len(top):]
+
+
+def _rank_key(item: Tuple[int, float]) -> Tuple[float, int]:
+    return item[1], -item[0]
+
+
+class DocIndex:
+    """
+    On-disk BM25 index over the dev_docs in `roots`, stored in SQLite.
+
+    Every indexed field of every document is its own section, so searches
+    return the few sections that matter instead of whole files. `update`
+    re-parses only files whose size, mtime and then content hash changed,
+    and drops files that were deleted.
+
+    Args:
+        path (str): SQLite file location.
+        roots (tuple): Directories scanned for `.md` dev_docs.
+        refresh_s (float): `context_for` re-runs `update` at most this often;
+            0 re-checks on every call.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, roots: Sequence[str] = DEFAULT_ROOTS, refresh_s: float = 30.0):
+        self.path = path
+        self.roots = tuple(roots)
+        self.refresh_s = refresh_s
+        self._lock = threading.Lock()
+        self._conn = None
+        self._corpus = None  # (section count, average section length), reset on every change
+        self._postings = {}  # term -> ([(weight without idf, section_id, field)] best first, {section_id: weight})
+        self._last_update = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache for bulk (re)indexing
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY, sha256 TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sections ("
+                " id INTEGER PRIMARY KEY, path TEXT NOT NULL, function_name TEXT NOT NULL,"
+                " field TEXT NOT NULL, text TEXT NOT NULL, length INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS sections_path ON sections(path)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings ("
+                " term TEXT NOT NULL, section_id INTEGER NOT NULL, tf INTEGER NOT NULL,"
+                " PRIMARY KEY (term, section_id)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            if row is None or row[0] != SCHEMA_VERSION:
+                # Indexed under other doc schemas: forget every file so the next update re-indexes it.
+                for table in ("files", "sections", "postings"):
+                    conn.execute(f"DELETE FROM {table}")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,))
+            self._conn = conn
+        return self._conn
+
+    # === Incremental indexing ===
+    def _scan(self) -> Dict[str, os.stat_result]:
+        found = {}
+        for root in self.roots:
+            if not os.path.isdir(root):
+                continue
+            for dirpath, _dirnames, filenames in os.walk(root):
+                for name in filenames:
+                    if name.endswith(".md"):
+                        path = os.path.join(dirpath, name)
+                        found[path] = os.stat(path)
+        return found
+
+    def _remove(self, db: sqlite3.Connection, path: str) -> None:
+        # Postings are keyed by (term, section_id) only; re-tokenizing the stored text
+        # finds them without a second index that every bulk insert would have to maintain.
+        sections = db.execute("SELECT id, text FROM sections WHERE path = ?", (path,)).fetchall()
+        db.executemany(
+            "DELETE FROM postings WHERE term = ? AND section_id = ?",
+            ((term, section_id) for section_id, text in sections for term in set(tokenize(text))),
+        )
+        db.execute("DELETE FROM sections WHERE path = ?", (path,))
+
+    def _add(self, db: sqlite3.Connection, path: str, text: str, postings: list) -> None:
+        """Inserts a document's sections and appends its (term, section_id, tf) rows to `postings`."""
+        doc = parse_doc_text(text)
+        schema = schema_for(doc.get("mode"))
+        function_name = doc.get(schema.name_key) or Path(path).stem
+        doc.setdefault(schema.name_key, function_name)
+        for field in schema.index_fields:
+            body = doc.get(field) or ""
+            terms = tokenize(body)
+            if not terms:
+                continue
+            section_id = db.execute(
+                "INSERT INTO sections (path, function_name, field, text, length) VALUES (?, ?, ?, ?, ?)",
+                (path, function_name, field, body, len(terms)),
+            ).lastrowid
+            postings.extend((term, section_id, tf) for term, tf in Counter(terms).items())
+
+    def update(self) -> Dict[str, float]:
+        """
+        Brings the index in line with the files under `roots`.
+
+        Returns:
+            dict: Counts of added, updated, removed and unchanged files, plus seconds taken.
+        """
+        started = time.perf_counter()
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        with self._lock:
+            db = self._db()
+            known = {row[0]: row[1:] for row in db.execute("SELECT path, sha256, mtime_ns, size FROM files")}
+            found = self._scan()
+            postings = []
+            db.execute("BEGIN")
+            try:
+                for path, st in found.items():
+                    previous = known.get(path)
+                    if previous and previous[1] == st.st_mtime_ns and previous[2] == st.st_size:
+                        counts["unchanged"] += 1
+                        continue
+                    with open(path, "rb") as f:
+                        raw = f.read()
+                    sha = hashlib.sha256(raw).hexdigest()
+                    if previous and previous[0] == sha:
+                        counts["unchanged"] += 1
+                    else:
+                        if previous:
+                            self._remove(db, path)
+                        self._add(db, path, raw.decode("utf-8", "replace"), postings)
+                        counts["updated" if previous else "added"] += 1
+                    db.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, sha, st.st_mtime_ns, st.st_size)
+                    )
+                for path in known.keys() - found.keys():
+                    self._remove(db, path)
+                    db.execute("DELETE FROM files WHERE path = ?", (path,))
+                    counts["removed"] += 1
+                # Inserting in key order appends to the B-tree instead of splitting pages at random.
+                postings.sort()
+                db.executemany("INSERT INTO postings VALUES (?, ?, ?)", postings)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            if counts["added"] or counts["updated"] or counts["removed"]:
+                self._corpus = None
+                self._postings = {}
+            self._last_update = time.monotonic()
+        counts["seconds"] = time.perf_counter() - started
+        return counts
+
+    # === Queries ===
+    def _corpus_stats(self, db: sqlite3.Connection):
+        if self._corpus is None:
+            count, avg = db.execute("SELECT COUNT(*), COALESCE(AVG(length), 0) FROM sections").fetchone()
+            self._corpus = (count, avg or 1.0)
+        return self._corpus
+
+    def _term_postings(self, db: sqlite3.Connection, term: str) -> Tuple[list, Dict[int, float]]:
+        """
+        A term's postings, best first, and the same weights by section id. A weight
+        is the length-normalised, field-boosted BM25 tf part, i.e. everything but idf.
+        """
+        cached = self._postings.get(term)
+        if cached is None:
+            _, avg_length = self._corpus_stats(db)
+            postings = [
+                (tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length)) * FIELD_BOOST.get(field, 1.0), section_id, field)
+                for section_id, tf, length, field in db.execute(
+                    "SELECT p.section_id, p.tf, s.length, s.field FROM postings p"
+                    " JOIN sections s ON s.id = p.section_id WHERE p.term = ?",
+                    (term,),
+                )
+            ]
+            postings.sort(reverse=True)
+            if len(self._postings) >= MAX_CACHED_TERMS:
+                self._postings.clear()
+            cached = self._postings[term] = (postings, {section_id: weight for weight, section_id, _ in postings})
+        return cached
+
+    def search(self, query: str, k: int = 5, fields: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Ranks sections against a free-text query with BM25.
+
+        Sections must match at least one of the query's rarer terms. Terms found
+        in more than COMMON_TERM_RATIO of sections add to the score but do not
+        select sections on their own, unless the query has nothing rarer.
+        Candidates are the union of the rarer terms' top `head` postings
+        (HEAD_POSTINGS to start). A section outside that union scores at most
+        the idf-weighted first weights past each head, plus every common term's
+        best weight. Once the k-th candidate beats that bound the ranking is
+        exact. Until then the heads grow fourfold, ending with the full lists.
+
+        Args:
+            query (str): Free text, e.g. the user's message.
+            k (int): Maximum number of sections to return.
+            fields (iterable, optional): Restrict results to these fields.
+
+        Returns:
+            list: Dicts with path, function_name, field, text and score, best first.
+            Sections with identical text (e.g. a doc and its regenerated copy) appear once.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        wanted = set(fields) if fields else None
+        with self._lock:
+            db = self._db()
+            n_sections, _ = self._corpus_stats(db)
+            lists = []
+            for term in terms:
+                postings, weights = self._term_postings(db, term)
+                if wanted is not None:
+                    postings = [posting for posting in postings if posting[2] in wanted]
+                if postings:
+                    idf = math.log(1 + (n_sections - len(weights) + 0.5) / (len(weights) + 0.5))
+                    lists.append((idf, postings, weights))
+
+            # Like Lucene's CommonTermsQuery: terms found in more than COMMON_TERM_RATIO of
+            # sections only add to the scores of sections that a rarer query term matched.
+            rare = [entry for entry in lists if len(entry[2]) <= COMMON_TERM_RATIO * n_sections]
+            common = [entry for entry in lists if len(entry[2]) > COMMON_TERM_RATIO * n_sections]
+            if not rare:
+                rare, common = common, []
+            common_max = sum(idf * postings[0][0] for idf, postings, _ in common)
+
+            head = HEAD_POSTINGS
+            while True:
+                candidates = set()
+                tail_bound = 0.0
+                for idf, postings, _ in rare:
+                    candidates.update(section_id for _, section_id, _ in postings[:head])
+                    if len(postings) > head:
+                        tail_bound += idf * postings[head][0]
+                scores = {
+                    section_id: sum(idf * weights.get(section_id, 0.0) for idf, _, weights in lists)
+                    for section_id in candidates
+                }
+                top = heapq.nlargest(k, scores.values())
+                if not tail_bound or (len(top) == k and top[-1] > tail_bound + common_max):
+                    break
+                head *= 4
+
+            results, seen_text = [], set()
+            for section_id, score in _ranked(scores, k * 2):
+                path, function_name, field, text = db.execute(
+                    "SELECT path, function_name, field, text FROM sections WHERE id = ?", (section_id,)
+                ).fetchone()
+                if (field, text) in seen_text:
+                    continue
+                seen_text.add((field, text))
+                results.append(
+                    {"path": path, "function_name": function_name, "field": field, "text": text, "score": score}
+                )
+                if len(results) == k:
+                    break
+        return results
+
+    def context_for(self, query: str, k: int = 3, max_chars: int = 1500) -> str:
+        """
+        Formats the top-k sections for a query as a prompt preamble.
+
+        Refreshes the index first when it is older than `refresh_s`.
+
+        Returns:
+            str: A "Relevant documentation" block, or "" when nothing matches.
+        """
+        if self._last_update is None or time.monotonic() - self._last_update >= self.refresh_s:
+            self.update()
+        hits = self.search(query, k)
+        if not hits:
+            return ""
+        lines = ["Relevant documentation:"]
+        budget = max_chars
+        for hit in hits:
+            text = hit["text"] if len(hit["text"]) <= budget else hit["text"][:budget].rstrip() + " …"
+            lines.append(f"[{hit['function_name']} · {hit['field']}] {text}")
+            budget -= len(text)
+            if budget <= 0:
+                break
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or query the local dev_doc BM25 index.")
+    parser.add_argument("query", nargs="?", help="Free-text query; omit to only update the index")
+    parser.add_argument("-k", type=int, default=5, help="Number of sections to return")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="SQLite index path")
+    parser.add_argument("--roots", default=",".join(DEFAULT_ROOTS), help="Comma-separated doc folders")
+    args = parser.parse_args()
+
+    index = DocIndex(args.index, roots=args.roots.split(","))
+    summary = index.update()
+    print(
+        f"[📚] Index updated in {summary['seconds'] * 1e3:.1f} ms — added: {summary['added']}, "
+        f"updated: {summary['updated']}, removed: {summary['removed']}, unchanged: {summary['unchanged']}"
+    )
+    if args.query:
+        started = time.perf_counter()
+        hits = index.search(args.query, args.k)
+        elapsed = time.perf_counter() - started
+        print(f"[🔍] {len(hits)} sections in {elapsed * 1e3:.3f} ms")
+        for hit in hits:
+            print(f"  {hit['score']:6.2f}  {hit['function_name']} · {hit['field']}  ({hit['path']})")
+            print(f"          {hit['text'][:100]}")
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from configs.tools.template_renderer import atomic_write_text
+
+# Sidecar next to each generated doc, e.g. output_docs/add_numbers.md.sections.json.
+# It holds the accepted field values too: the rendered Markdown does not round-trip
+# multi-paragraph sections (the parser stops at a blank line), so kept fields are
+# never rebuilt from it.
+STATE_SUFFIX = ".sections.json"
+STATE_VERSION = 2
+
+# The input sections each generated field is written from. A field is regenerated
+# only when one of these changed; everything else is copied from the sidecar.
+FIELD_INPUTS = {
+    "function_name": ("function_name",),
+    "language": ("language",),
+    "code": ("code",),
+    "explanation": ("code", "explanation"),
+    "example": ("function_name", "code", "example"),
+    "complexity": ("code", "complexity"),
+    "insight": ("code", "explanation", "insight"),
+    "limitations": ("code", "limitations"),
+    "tags": ("function_name", "tags"),
+}
+
+
+def _sha(parts: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def run_salt(*parts: object) -> str:
+    """Hash of what applies to every field (request, model, ...); a new salt makes every field stale."""
+    return _sha(str(part) for part in parts)[:16]
+
+
+def section_hashes(doc: Mapping[str, str], keys: Sequence[str] = tuple(FIELD_INPUTS)) -> Dict[str, str]:
+    """
+    Per-field input hashes of a parsed source doc.
+
+    Returns:
+        dict: field -> sha256 of the (stripped) input sections FIELD_INPUTS lists for it.
+    """
+    return {
+        key: _sha(f"{name}={(doc.get(name) or '').strip()}" for name in FIELD_INPUTS[key])
+        for key in keys
+    }
+
+
+def inputs_for(keys: Iterable[str]) -> List[str]:
+    """The input sections needed to regenerate `keys`, in FIELD_INPUTS order."""
+    needed = {name for key in keys for name in FIELD_INPUTS[key]}
+    return [name for name in FIELD_INPUTS if name in needed]
+
+
+def state_path(output_path: str) -> str:
+    return output_path + STATE_SUFFIX
+
+
+def load_state(output_path: str) -> Dict:
+    """The sidecar of a generated doc; empty when missing, unreadable or from another version."""
+    try:
+        with open(state_path(output_path), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return state if isinstance(state, dict) and state.get("version") == STATE_VERSION else {}
+
+
+def save_state(
+    output_path: str, source: str, salt: str, fields: Mapping[str, str], values: Mapping[str, str]
+) -> None:
+    """
+    Records the input hashes the doc at `output_path` was generated from, and its field values.
+
+    Args:
+        output_path (str): The generated doc.
+        source (str): The input doc it came from.
+        salt (str): run_salt() of the run.
+        fields (dict): field -> input hash, for the fields now current in the output.
+        values (dict): field -> the text written for it, merged from on the next run.
+    """
+    state = {"version": STATE_VERSION, "source": source, "salt": salt, "fields": dict(fields), "values": dict(values)}
+    atomic_write_text(state_path(output_path), json.dumps(state, indent=2, sort_keys=True) + "\n")
+
+
+def previous_values(output_path: str, state: Mapping) -> Optional[Dict[str, str]]:
+    """The field values recorded with the output; None when the output or its values are missing."""
+    values = state.get("values")
+    if not isinstance(values, dict) or not os.path.exists(output_path):
+        return None
+    return {key: value for key, value in values.items() if isinstance(value, str)}
+
+
+def stale_fields(
+    hashes: Mapping[str, str],
+    state: Mapping,
+    salt: str,
+    previous: Optional[Mapping[str, str]] = None,
+) -> List[str]:
+    """
+    The fields that must be regenerated.
+
+    A field is stale when its input hash differs from the recorded one, when
+    the salt changed, or when the previous output is missing or lacks it.
+
+    Args:
+        hashes (dict): section_hashes() of the current input.
+        state (dict): load_state() of the output.
+        salt (str): run_salt() of this run.
+        previous (dict, optional): previous_values() of the output; None when there is none.
+    """
+    if previous is None or state.get("salt") != salt:
+        return list(hashes)
+    recorded = state.get("fields") or {}
+    return [
+        key for key, digest in hashes.items()
+        if recorded.get(key) != digest or not (previous.get(key) or "").strip()
+    ]
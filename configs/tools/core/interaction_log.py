@@ -0,0 +1,239 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Interactions are logged unless SOOTHSAYER_INTERACTION_LOG=0; a path value picks the folder.
+LOG_ENV_VAR = "SOOTHSAYER_INTERACTION_LOG"
+DEFAULT_LOG_DIR = ".cache/interactions"
+
+# A segment is closed and a new one started after this many uncompressed bytes.
+SEGMENT_BYTES = 8 * 1024 * 1024
+# Closed segments kept per folder; older ones are deleted.
+KEEP_SEGMENTS = 32
+# The writer thread drains at most this many records per write.
+MAX_BATCH = 256
+
+
+class InteractionLog:
+    """
+    Appends request/response records to rotated, gzip-compressed JSONL segments.
+
+    record() only enqueues; a background thread serializes, compresses and
+    writes in batches, syncing the gzip stream after each batch so a reader
+    (or a crash) sees every record written so far. Each process writes its
+    own segment, named by start time and pid.
+
+    Args:
+        directory (str): Folder for the `interactions-*.jsonl.gz` segments.
+        segment_bytes (int): Uncompressed size that triggers rotation.
+        keep (int): Closed segments to keep.
+    """
+
+    def __init__(self, directory: str = DEFAULT_LOG_DIR, segment_bytes: int = SEGMENT_BYTES, keep: int = KEEP_SEGMENTS):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.keep = keep
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._segment_seq = 0
+        self.dropped = 0
+
+    def record(self, item: Dict) -> None:
+        if self._closed:
+            self.dropped += 1
+            return
+        if self._thread is None:
+            self._start()
+        self._queue.put(item)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="soothsayer-interactions", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+            import multiprocessing.util
+
+            multiprocessing.util.Finalize(None, self.close, exitpriority=100)
+
+    def _open_segment(self):
+        self._segment_seq += 1
+        name = f"interactions-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._segment_seq}.jsonl.gz"
+        path = Path(self.directory) / name
+        return path, gzip.open(path, "ab", compresslevel=6)
+
+    def _prune(self, active: Path) -> None:
+        closed = [p for p in segments(self.directory) if p != active]
+        for path in closed[: max(0, len(closed) - self.keep)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        # Queue items are record dicts, threading.Events (flush barriers) or None (stop).
+        path, f = self._open_segment()
+        written = 0
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < MAX_BATCH and isinstance(batch[-1], dict):
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                lines = [json.dumps(r, ensure_ascii=False, separators=(",", ":")) for r in batch if isinstance(r, dict)]
+                if lines:
+                    data = ("\n".join(lines) + "\n").encode("utf-8")
+                    f.write(data)
+                    f.flush()
+                    written += len(data)
+                    if written >= self.segment_bytes:
+                        f.close()
+                        self._prune(path)
+                        path, f = self._open_segment()
+                        written = 0
+                if batch[-1] is None:
+                    return
+                if isinstance(batch[-1], threading.Event):
+                    batch[-1].set()
+        finally:
+            f.close()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Blocks until every record queued so far is written."""
+        if self._thread is None or self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Writes out every queued record and stops the writer thread."""
+        with self._lock:
+            if self._closed or self._thread is None:
+                self._closed = True
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+_log: Optional[InteractionLog] = None
+
+
+def log_dir() -> str:
+    """The folder SOOTHSAYER_INTERACTION_LOG names, or DEFAULT_LOG_DIR."""
+    env = os.environ.get(LOG_ENV_VAR, "")
+    return env if env not in ("", "0", "1") else DEFAULT_LOG_DIR
+
+
+def configure(directory: Optional[str] = None, enabled: Optional[bool] = None) -> None:
+    """
+    Turns interaction logging on or off for this process.
+
+    Args:
+        directory (str, optional): Segment folder. Defaults to log_dir().
+        enabled (bool, optional): Defaults to on unless SOOTHSAYER_INTERACTION_LOG=0.
+    """
+    global _log
+    if enabled is None:
+        enabled = os.environ.get(LOG_ENV_VAR, "1") != "0"
+    if _log is not None:
+        _log.close()
+    _log = InteractionLog(directory or log_dir()) if enabled else None
+
+
+def _after_fork() -> None:
+    # The writer thread does not survive fork; the child opens its own segment on first use.
+    global _log
+    if _log is not None:
+        _log = InteractionLog(_log.directory, _log.segment_bytes, _log.keep)
+
+
+os.register_at_fork(after_in_child=_after_fork)
+configure()
+
+
+def enabled() -> bool:
+    return _log is not None
+
+
+def record_interaction(kind: str, prompt: str, response: str, seconds: float, **attrs) -> None:
+    """
+    Logs one request/response pair without blocking the caller.
+
+    Args:
+        kind (str): How it was served, e.g. "run", "stream", "session".
+        prompt (str): The user's text, before any retrieved context is added.
+        response (str): The full reply.
+        seconds (float): Wall time from request to last token.
+        **attrs: Small extras (model, ttft_ms, cached, conversation, token counts).
+    """
+    log = _log
+    if log is None:
+        return
+    item = {"ts": time.time() - seconds, "kind": kind, "ms": round(seconds * 1e3, 3), "prompt": prompt, "response": response}
+    item.update({k: v for k, v in attrs.items() if v is not None})
+    log.record(item)
+
+
+def record_stream(kind: str, user_text: str, stream, started: float, **attrs) -> None:
+    """Logs a finished TokenStream, with its time to first token and Ollama's token counts."""
+    if _log is None:
+        return
+    record_interaction(
+        kind,
+        user_text,
+        stream.text,
+        time.perf_counter() - started,
+        model=stream.model,
+        ttft_ms=round(stream.ttft * 1e3, 3) if stream.ttft is not None else None,
+        prompt_tokens=stream.final.get("prompt_eval_count"),
+        eval_tokens=stream.final.get("eval_count"),
+        **attrs,
+    )
+
+
+def flush() -> None:
+    """Writes out queued records now; logging stays on."""
+    if _log is not None:
+        _log.flush()
+
+
+# === Reading ===
+def segments(directory: str = DEFAULT_LOG_DIR) -> List[Path]:
+    """Segment files in a folder, oldest first."""
+    folder = Path(directory)
+    if not folder.is_dir():
+        return []
+    return sorted(folder.glob("interactions-*.jsonl.gz"), key=lambda p: (p.stat().st_mtime, p.name))
+
+
+def iter_interactions(paths: Iterable[Path]) -> Iterator[Dict]:
+    """
+    Yields records from segment files in order.
+
+    The segment still being written, or one cut short by a crash, ends in an
+    unfinished gzip member; everything before it is still read.
+    """
+    for path in paths:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:  # a line cut short
+                        continue
+        except (EOFError, gzip.BadGzipFile, OSError):
+            continue
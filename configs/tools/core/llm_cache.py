@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = ".cache/llm_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_S = 30 * 24 * 3600
+
+# Set SOOTHSAYER_NO_CACHE=1 to bypass the cache in every entry point.
+BYPASS_ENV_VAR = "SOOTHSAYER_NO_CACHE"
+
+
+def make_cache_key(
+    system_prompt: str,
+    task_description: str,
+    model: str,
+    temperature: Optional[float],
+    expected_output: str = "",
+) -> str:
+    """
+    Content-addresses one LLM request.
+
+    Args:
+        system_prompt (str): Agent system prompt.
+        task_description (str): Task text or user input.
+        model (str): Model name as passed to the LLM client.
+        temperature (float, optional): Sampling temperature, None for the model default.
+        expected_output (str): CrewAI expected_output, which also shapes the prompt.
+
+    Returns:
+        str: Hex SHA-256 digest of the request fields.
+    """
+    blob = json.dumps(
+        [system_prompt, task_description, model, temperature, expected_output],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    On-disk LLM response cache backed by SQLite.
+
+    Entries older than `max_age_s` expire; once the stored responses exceed
+    `max_bytes`, the least recently used ones are evicted.
+
+    Args:
+        path (str): SQLite file location.
+        max_bytes (int): Size budget for stored responses.
+        max_age_s (float): Maximum entry age in seconds.
+        enabled (bool, optional): False bypasses reads and writes. Defaults to
+            on unless SOOTHSAYER_NO_CACHE is set.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        enabled: Optional[bool] = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.enabled = (not os.environ.get(BYPASS_ENV_VAR)) if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_access)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response for key, or None on a miss or when bypassed."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.max_age_s:
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Stores a response and evicts expired or least recently used entries."""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._evict(db, now)
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_s,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            doomed.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        """Drops every cached response."""
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process plus the current entry count and size."""
+        entries = size = 0
+        if self.enabled:
+            with self._lock:
+                entries, size = self._db().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
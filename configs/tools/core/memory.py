@@ -0,0 +1,406 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from configs.tools.core import interaction_log, tracing
+from configs.tools.core.agent_config import load_agent_config
+from configs.tools.core.ollama_client import OllamaClient, OllamaError, TokenStream
+from configs.tools.core.resilience import CircuitOpenError
+from configs.tools.core.session import DEFAULT_KEEP_ALIVE
+
+STRATEGIES = ("none", "short_term", "long_term")
+DEFAULT_STORE_PATH = ".cache/memory.sqlite3"
+DEFAULT_BUDGET_TOKENS = 1024
+DEFAULT_SUMMARY_TOKENS = 256
+
+# Token counts are estimated from characters; Ollama's tokenizers average close to this for English.
+CHARS_PER_TOKEN = 4
+# Reserved inside the budget for the block's headings and separators.
+HEADER_TOKENS = 24
+
+SUMMARIZER_SYSTEM = (
+    "You maintain the running summary of a conversation between a user and Soothsayer. "
+    "Merge the new turns into the summary. Keep names, decisions, open questions and user preferences; "
+    "drop pleasantries and wording. Answer with the summary only."
+)
+
+logger = logging.getLogger("soothsayer.memory")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clip_to_tokens(text: str, tokens: int) -> str:
+    """Cuts text to about `tokens` tokens at a word boundary, marking the cut with an ellipsis."""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit - 1)
+    return text[: cut if cut > limit // 2 else limit - 1].rstrip() + "…"
+
+
+def memory_settings(config: Optional[Dict] = None) -> Dict:
+    """
+    The agent config's `memory_strategy` and `memory` block, with defaults filled in.
+
+    Returns:
+        dict: strategy, budget_tokens, summary_tokens and store_path.
+    """
+    config = config if config is not None else load_agent_config()
+    block = config.get("memory") or {}
+    strategy = config.get("memory_strategy") or "none"
+    if strategy not in STRATEGIES:
+        logger.warning("memory_strategy=%r is not one of %s; using none", strategy, STRATEGIES)
+        strategy = "none"
+    return {
+        "strategy": strategy,
+        "budget_tokens": int(block.get("budget_tokens") or DEFAULT_BUDGET_TOKENS),
+        "summary_tokens": int(block.get("summary_tokens") or DEFAULT_SUMMARY_TOKENS),
+        "store_path": block.get("store_path") or DEFAULT_STORE_PATH,
+    }
+
+
+class MemoryStore:
+    """
+    Long-term memory on disk: one row per conversation with its summary and recent turns.
+
+    Args:
+        path (str): SQLite file location.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS conversations ("
+                " id TEXT PRIMARY KEY, summary TEXT NOT NULL, turns TEXT NOT NULL,"
+                " turn_count INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def load(self, conversation_id: str) -> Tuple[str, List[Tuple[str, str]], int]:
+        """Returns (summary, recent turns as (user, reply) pairs, total turns so far); empty for a new id."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT summary, turns, turn_count FROM conversations WHERE id = ?", (conversation_id,)
+            ).fetchone()
+        if row is None:
+            return "", [], 0
+        return row[0], [tuple(turn) for turn in json.loads(row[1])], row[2]
+
+    def save(self, conversation_id: str, summary: str, turns: List[Tuple[str, str]], turn_count: int) -> None:
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?, ?)",
+                (conversation_id, summary, json.dumps(turns, ensure_ascii=False), turn_count, time.time()),
+            )
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
+
+
+class _Worker:
+    """
+    One background thread per process for summaries and store writes.
+
+    Jobs run in submission order, so a conversation's writes never reorder.
+    Queue items are callables, threading.Events (flush barriers) or None (stop).
+    """
+
+    def __init__(self):
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[[], None]) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="soothsayer-memory", daemon=True)
+                    self._thread.start()
+        self._queue.put(job)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if isinstance(job, threading.Event):
+                job.set()
+                continue
+            try:
+                job()
+            except Exception:
+                logger.exception("memory job failed")
+
+    def flush(self, timeout: float = 60.0) -> bool:
+        """Waits until every job submitted so far has run."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+
+_worker = _Worker()
+
+
+def flush(timeout: float = 60.0) -> bool:
+    """Blocks until pending summaries and store writes are done, e.g. before exit."""
+    return _worker.flush(timeout)
+
+
+class MemoryChat:
+    """
+    A conversation whose history is sent with every turn, within a fixed token budget.
+
+    Each turn's prompt is the memory block followed by the new user text; the
+    system prompt stays byte-identical, so Ollama's prefix cache still covers it.
+
+    short_term: the newest turns that fit in `budget_tokens`; older ones are dropped.
+    long_term: the same sliding window in `budget_tokens - summary_tokens`, plus a
+    rolling summary of everything that slid out, capped at `summary_tokens`. The
+    summary is written by a background thread after the reply has streamed, so a
+    turn never waits for it; evicted turns leave the prompt at once and reappear
+    in the summary when it lands. Summary and window are saved to a MemoryStore
+    and reloaded for the same `conversation_id`.
+
+    Turns must not overlap; give every user their own MemoryChat.
+
+    Args:
+        client (OllamaClient): Pooled client shared with the runtime.
+        model (str): Model name, used for replies and summaries.
+        system_prompt (str): Sent verbatim with every turn.
+        strategy (str): "short_term" or "long_term".
+        budget_tokens (int): Hard cap on the memory block per turn (estimated tokens).
+        summary_tokens (int): long_term only: cap on the rolling summary.
+        conversation_id (str): long_term only: key in the store.
+        store (MemoryStore, optional): long_term only. Defaults to DEFAULT_STORE_PATH.
+        options (dict, optional): Ollama options.
+        keep_alive (str): Ollama keep_alive duration.
+        retriever (callable, optional): Maps user text to a context block for that turn only.
+    """
+
+    def __init__(
+        self,
+        client: OllamaClient,
+        model: str,
+        system_prompt: str,
+        strategy: str = "short_term",
+        budget_tokens: int = DEFAULT_BUDGET_TOKENS,
+        summary_tokens: int = DEFAULT_SUMMARY_TOKENS,
+        conversation_id: str = "default",
+        store: Optional[MemoryStore] = None,
+        options: Optional[Dict] = None,
+        keep_alive: str = DEFAULT_KEEP_ALIVE,
+        retriever: Optional[Callable[[str], str]] = None,
+    ):
+        if strategy not in ("short_term", "long_term"):
+            raise ValueError(f"MemoryChat needs strategy short_term or long_term, not {strategy!r}")
+        self.client = client
+        self.model = model
+        self.system_prompt = system_prompt
+        self.strategy = strategy
+        self.long_term = strategy == "long_term"
+        self.summary_tokens = min(summary_tokens, budget_tokens // 2) if self.long_term else 0
+        self.window_tokens = max(1, budget_tokens - self.summary_tokens - HEADER_TOKENS)
+        self.budget_tokens = budget_tokens
+        self.conversation_id = conversation_id
+        self.options = dict(options or {})
+        self.keep_alive = keep_alive
+        self.retriever = retriever
+        self.store = (store or MemoryStore()) if self.long_term else None
+        self.summary = ""
+        self.window: Deque[Tuple[str, str, int]] = deque()
+        self._window_used = 0
+        self._lock = threading.Lock()
+        self._summarized = 0
+        self._turn_count = 0
+        self.turns: List[Dict] = []
+        if self.store is not None:
+            summary, recent, self._turn_count = self.store.load(conversation_id)
+            self.summary = summary
+            for user_text, reply in recent:
+                self._push(user_text, reply)
+
+    # === Memory block ===
+    def _push(self, user_text: str, reply: str) -> List[Tuple[str, str]]:
+        """Adds a turn to the window and returns the turns evicted to stay within budget."""
+        entry = f"User: {user_text}\nAssistant: {reply}"
+        tokens = estimate_tokens(entry)
+        if tokens > self.window_tokens:
+            # A single turn larger than the window is kept, cut down to fit.
+            half = max(1, self.window_tokens // 2 - 8)
+            user_text, reply = clip_to_tokens(user_text, half), clip_to_tokens(reply, half)
+            tokens = estimate_tokens(f"User: {user_text}\nAssistant: {reply}")
+        self.window.append((user_text, reply, tokens))
+        self._window_used += tokens
+        evicted = []
+        while self._window_used > self.window_tokens and len(self.window) > 1:
+            old_user, old_reply, old_tokens = self.window.popleft()
+            self._window_used -= old_tokens
+            evicted.append((old_user, old_reply))
+        return evicted
+
+    def memory_block(self) -> str:
+        """The summary and recent turns as they are prepended to the next prompt."""
+        parts = []
+        with self._lock:
+            summary = self.summary
+        if summary:
+            parts.append(f"Summary of the earlier conversation:\n{summary}")
+        if self.window:
+            recent = "\n\n".join(f"User: {user}\nAssistant: {reply}" for user, reply, _ in self.window)
+            parts.append(f"Recent conversation:\n{recent}")
+        return "\n\n".join(parts)
+
+    def prompt_for(self, user_text: str) -> str:
+        """The full prompt for one turn: memory block, retrieved context, then the user's text."""
+        if self.retriever:
+            with tracing.span("prompt.context") as span:
+                context_block = self.retriever(user_text)
+                span.set(chars=len(context_block))
+            if context_block:
+                user_text = f"{context_block}\n\n{user_text}"
+        block = self.memory_block()
+        return f"{block}\n\nUser: {user_text}" if block else user_text
+
+    def remember(self, user_text: str, reply: str) -> None:
+        """Records a finished turn; evicted turns are summarized and the store updated in the background."""
+        self._turn_count += 1
+        evicted = self._push(user_text, reply)
+        if not self.long_term:
+            return
+        recent = [(user, text) for user, text, _ in self.window]
+        turn_count = self._turn_count
+        if evicted:
+            _worker.submit(lambda: self._summarize(evicted))
+        _worker.submit(lambda: self._save(recent, turn_count))
+
+    # === Background jobs ===
+    def _summarize(self, evicted: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            summary = self.summary
+        words = self.summary_tokens * CHARS_PER_TOKEN // 6
+        transcript = "\n\n".join(f"User: {user}\nAssistant: {reply}" for user, reply in evicted)
+        prompt = (
+            f"Current summary:\n{summary or '(empty)'}\n\nNew turns:\n{transcript}\n\n"
+            f"Write the updated summary in at most {words} words."
+        )
+        with tracing.span("memory.summarize", turns=len(evicted)):
+            try:
+                data = self.client.generate(
+                    self.model, prompt, system=SUMMARIZER_SYSTEM, options=self.options, keep_alive=self.keep_alive
+                )
+                updated = data.get("response", "").strip()
+            except (OllamaError, CircuitOpenError, OSError) as e:
+                # Without the model, keep each evicted question as a bullet so nothing vanishes silently.
+                logger.warning("summary for %s failed (%s); keeping the evicted questions verbatim", self.conversation_id, e)
+                bullets = "\n".join(f"- User asked: {clip_to_tokens(user, 24)}" for user, _ in evicted)
+                updated = f"{summary}\n{bullets}".strip()
+                updated = updated[-self.summary_tokens * CHARS_PER_TOKEN:]
+        with self._lock:
+            self.summary = clip_to_tokens(updated, self.summary_tokens)
+            self._summarized += len(evicted)
+
+    def _save(self, recent: List[Tuple[str, str]], turn_count: int) -> None:
+        with self._lock:
+            summary = self.summary
+        self.store.save(self.conversation_id, summary, recent, turn_count)
+
+    # === Turns ===
+    def stream(self, user_text: str) -> TokenStream:
+        """
+        Streams one turn with the memory block in the prompt.
+
+        Returns:
+            TokenStream: Iterable of text pieces. The turn is remembered, and its
+            stats appended to `turns`, once the stream has been read to the end.
+        """
+        started = time.perf_counter()
+        prompt = self.prompt_for(user_text)
+        memory_tokens = estimate_tokens(prompt) - estimate_tokens(user_text)
+        return self.client.stream(
+            model=self.model,
+            prompt=prompt,
+            system=self.system_prompt,
+            options=self.options,
+            on_done=lambda stream: self._finish_turn(user_text, stream, memory_tokens, started),
+            keep_alive=self.keep_alive,
+        )
+
+    def ask(self, user_text: str) -> str:
+        """Runs one turn to completion and returns the reply text."""
+        stream = self.stream(user_text)
+        for _ in stream:
+            pass
+        return stream.text
+
+    def _finish_turn(self, user_text: str, stream: TokenStream, memory_tokens: int, started: float) -> None:
+        self.remember(user_text, stream.text)
+        final = stream.final
+        turn = {
+            "turn": self._turn_count,
+            "reused_context": False,
+            "prompt_eval_count": final.get("prompt_eval_count", 0),
+            "prompt_eval_ms": final.get("prompt_eval_duration", 0) / 1e6,
+            "eval_count": final.get("eval_count", 0),
+            "eval_ms": final.get("eval_duration", 0) / 1e6,
+            "ttft_s": stream.ttft,
+            "memory_tokens": memory_tokens,
+            "window_turns": len(self.window),
+        }
+        self.turns.append(turn)
+        interaction_log.record_stream(
+            self.strategy, user_text, stream, started, conversation=self.conversation_id, turn=turn["turn"]
+        )
+        logger.info(
+            "turn %d: prompt_eval %d tokens in %.1f ms (%s memory %d tokens, %d recent turns)",
+            turn["turn"],
+            turn["prompt_eval_count"],
+            turn["prompt_eval_ms"],
+            self.strategy,
+            memory_tokens,
+            turn["window_turns"],
+        )
+
+    def forget(self) -> None:
+        """Drops the summary and window, including the stored copy."""
+        with self._lock:
+            self.summary = ""
+        self.window.clear()
+        self._window_used = 0
+        self._turn_count = 0
+        if self.store is not None:
+            _worker.submit(lambda: self.store.delete(self.conversation_id))
+
+    def stats(self) -> Dict:
+        """Turn count, memory size and per-turn stats."""
+        memory = [t["memory_tokens"] for t in self.turns]
+        return {
+            "turns": len(self.turns),
+            "strategy": self.strategy,
+            "budget_tokens": self.budget_tokens,
+            "window_turns": len(self.window),
+            "summary_tokens": estimate_tokens(self.summary),
+            "summarized_turns": self._summarized,
+            "max_memory_tokens": max(memory) if memory else 0,
+            "per_turn": list(self.turns),
+        }
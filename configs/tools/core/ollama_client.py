@@ -0,0 +1,412 @@
+import http.client
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from configs.tools.core import tracing
+from configs.tools.core.agent_config import LLMConstraints
+from configs.tools.core.resilience import CircuitBreaker, breaker_for, call_with_retries
+
+# SOOTHSAYER_OLLAMA_URL points every entry point at another server (e.g. benchmarks.stub_ollama).
+DEFAULT_BASE_URL = os.environ.get("SOOTHSAYER_OLLAMA_URL", "http://localhost:11434")
+
+logger = logging.getLogger("soothsayer.ollama")
+
+
+class OllamaError(RuntimeError):
+    """Raised when Ollama answers with an HTTP error or an in-stream error chunk."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class OllamaTimeoutError(OllamaError, TimeoutError):
+    """Raised when Ollama does not answer, or stops streaming, within the read timeout."""
+
+
+def trace_completion(model: str, final: Dict, wall_s: float, ttft: Optional[float] = None) -> None:
+    """Records one Ollama call, split into load / prompt eval / generation using Ollama's own timings."""
+    if not tracing.enabled():
+        return
+    tracing.record("llm.request", wall_s, model=model, ttft_ms=round(ttft * 1e3, 3) if ttft is not None else None)
+    if final.get("load_duration"):
+        tracing.record("llm.load", final["load_duration"] / 1e9, model=model)
+    if "prompt_eval_duration" in final:
+        tracing.record("llm.prompt_eval", final["prompt_eval_duration"] / 1e9, model=model, tokens=final.get("prompt_eval_count", 0))
+    if "eval_duration" in final:
+        tracing.record("llm.generate", final["eval_duration"] / 1e9, model=model, tokens=final.get("eval_count", 0))
+
+
+def ollama_model_name(model: str) -> str:
+    """Strips the LiteLLM-style `ollama/` prefix CrewAI uses, e.g. `ollama/mistral` -> `mistral`."""
+    return model.split("/", 1)[1] if model.startswith("ollama/") else model
+
+
+class TokenStream:
+    """
+    Iterates over the text pieces of a streamed /api/generate call.
+
+    After iteration, `ttft` holds the time to first token in seconds and
+    `final` the closing chunk (eval counts, durations, context). `on_done`,
+    if given, is called with the stream once the closing chunk arrives.
+    Call close() when abandoning a stream early; it frees the connection and
+    settles the call with the circuit breaker.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterator[dict],
+        model: str,
+        started: float,
+        on_done: Optional[Callable[["TokenStream"], None]] = None,
+        abort: Optional[Callable[[], None]] = None,
+    ):
+        self._chunks = chunks
+        self._abort = abort
+        self.model = model
+        self.started = started
+        self.on_done = on_done
+        self.ttft: Optional[float] = None
+        self.final: Dict = {}
+        self.cached = False
+        # True for a replay of another caller's stream (see singleflight); only the source is traced.
+        self.coalesced = False
+        self._parts = []
+
+    @classmethod
+    def from_text(cls, text: str, model: str) -> "TokenStream":
+        """Wraps an already-known completion (e.g. a cache hit) as a one-chunk stream."""
+        stream = cls(iter([{"response": text, "done": True}]), model, time.perf_counter())
+        stream.cached = True
+        return stream
+
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        return "".join(self._parts)
+
+    def close(self) -> None:
+        """
+        Stops reading; a stream closed before its last chunk is not counted as a success.
+
+        May be called from another thread while the stream is being read: the
+        connection is shut down, so a read blocked on a stalled server returns
+        at once and that thread's iteration ends without the closing chunk.
+        """
+        if self._abort:
+            self._abort()
+        close = getattr(self._chunks, "close", None)
+        if close:
+            try:
+                close()
+            except ValueError:
+                pass  # a generator running on another thread; the abort above ends it
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            piece = chunk.get("response", "")
+            if piece and self.ttft is None:
+                self.ttft = time.perf_counter() - self.started
+                logger.info("first token after %.3fs (model=%s)", self.ttft, self.model)
+            if piece:
+                self._parts.append(piece)
+                yield piece
+            if chunk.get("done"):
+                self.final = chunk
+                if not self.cached and not self.coalesced:
+                    trace_completion(self.model, chunk, time.perf_counter() - self.started, self.ttft)
+                if self.on_done:
+                    self.on_done(self)
+                break
+
+
+class _StreamAbort:
+    """Shuts down a streaming connection from any thread, until the stream hands it back to the pool."""
+
+    def __init__(self, conn: http.client.HTTPConnection):
+        self._conn = conn
+        self._lock = threading.Lock()
+        self._settled = False
+        self.requested = False
+
+    def __call__(self) -> None:
+        with self._lock:
+            if self._settled:
+                return
+            self.requested = True
+            sock = self._conn.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def settle(self) -> bool:
+        """Ends abortability; False when an abort already shut the connection down."""
+        with self._lock:
+            self._settled = True
+            return not self.requested
+
+
+class OllamaClient:
+    """
+    Minimal Ollama HTTP client built on the standard library.
+
+    Idle keep-alive connections are pooled and reused across calls and threads,
+    so repeated requests skip the TCP handshake. Every call runs under the
+    agent config's `constraints`: connect/read timeouts, jittered retries of
+    transient failures, and the circuit breaker shared by all clients of the
+    same server.
+
+    Args:
+        base_url (str): Ollama server URL, e.g. http://localhost:11434.
+        timeout (float, optional): Socket timeout in seconds; overrides both
+            the connect and the read timeout from the constraints.
+        pool_size (int): Maximum number of idle connections kept open.
+        constraints (LLMConstraints, optional): Defaults to the agent config's,
+            read on first use.
+        breaker (CircuitBreaker, optional): Defaults to the process-wide one for base_url.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: Optional[float] = None,
+        pool_size: int = 8,
+        constraints: Optional[LLMConstraints] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        parts = urlsplit(base_url)
+        self.base_url = base_url
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 11434
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self._constraints = constraints
+        self._breaker = breaker
+
+    @property
+    def constraints(self) -> LLMConstraints:
+        if self._constraints is None:
+            self._constraints = LLMConstraints.from_config()
+        return self._constraints
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        if self._breaker is None:
+            self._breaker = breaker_for(self.base_url, self.constraints)
+        return self._breaker
+
+    def _connect(self) -> http.client.HTTPConnection:
+        constraints = self.constraints
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout or constraints.connect_timeout_s)
+        conn.connect()
+        # http.client sends headers and body in separate writes; without this, Nagle's
+        # algorithm stalls every reused connection on the server's delayed ACK.
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # From here on the timeout bounds each wait for response bytes, not the whole reply.
+        conn.sock.settimeout(self.timeout or constraints.read_timeout_s)
+        return conn
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        """Returns a connection to the pool once its response has been fully read."""
+        if response.will_close or not response.isclosed():
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        """Closes every pooled connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _post_once(self, path: str, body: bytes):
+        headers = {"Content-Type": "application/json"}
+        conn = self._acquire()
+        try:
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                conn.close()
+                conn = self._connect()
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+        except TimeoutError as e:
+            conn.close()
+            raise OllamaTimeoutError(f"Ollama {path} sent nothing for {conn.timeout:.0f}s") from e
+        except OSError:
+            conn.close()
+            raise
+        if response.status != 200:
+            detail = response.read().decode("utf-8", "replace")
+            conn.close()
+            raise OllamaError(f"Ollama {path} returned {response.status}: {detail}", status=response.status)
+        return conn, response
+
+    def _post(self, path: str, payload: dict, settle: bool = True):
+        """POSTs with the constraints' retries and breaker; returns (connection, response) once headers arrive."""
+        body = json.dumps(payload).encode("utf-8")
+        return call_with_retries(lambda: self._post_once(path, body), self.constraints, self.breaker, label="llm", settle=settle)
+
+    def _get_json(self, path: str) -> dict:
+        """A single GET, no retries: for cheap status probes."""
+        conn = self._acquire()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            raw = response.read()
+        except OSError:
+            conn.close()
+            raise
+        if response.status != 200:
+            conn.close()
+            raise OllamaError(f"Ollama {path} returned {response.status}", status=response.status)
+        self._release(conn, response)
+        return json.loads(raw)
+
+    def loaded_models(self) -> List[dict]:
+        """Models Ollama holds in memory right now (/api/ps), each with its `expires_at`."""
+        return self._get_json("/api/ps").get("models", [])
+
+    def _payload(self, model, prompt, system, options, stream, extra) -> dict:
+        payload = {"model": ollama_model_name(model), "prompt": prompt, "stream": stream}
+        if system is not None:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+        payload.update(extra)
+        return payload
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        system: Optional[str] = None,
+        options: Optional[dict] = None,
+        **extra,
+    ) -> dict:
+        """
+        Runs a blocking /api/generate call.
+
+        Returns:
+            dict: Ollama's response object; the completion is under "response".
+        """
+        started = time.perf_counter()
+        body = json.dumps(self._payload(model, prompt, system, options, False, extra)).encode("utf-8")
+
+        def attempt() -> dict:
+            conn, response = self._post_once("/api/generate", body)
+            try:
+                raw = response.read()
+            except TimeoutError as e:
+                conn.close()
+                raise OllamaTimeoutError(f"Ollama stalled for {conn.timeout:.0f}s while answering") from e
+            self._release(conn, response)
+            return json.loads(raw)
+
+        data = call_with_retries(attempt, self.constraints, self.breaker, label="llm")
+        if "error" in data:
+            raise OllamaError(data["error"])
+        trace_completion(ollama_model_name(model), data, time.perf_counter() - started)
+        return data
+
+    def _lines(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> Iterator[bytes]:
+        """Response lines; a stall longer than the read timeout counts against the breaker and raises."""
+        while True:
+            try:
+                line = response.readline()
+            except TimeoutError as e:
+                self.breaker.record_failure()
+                raise OllamaTimeoutError(f"Ollama stopped streaming for {conn.timeout:.0f}s") from e
+            if not line:
+                return
+            yield line
+
+    def _iter_chunks(
+        self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse, abort: _StreamAbort
+    ) -> Iterator[dict]:
+        """
+        Parsed chunks up to `done`. The breaker hears exactly one outcome per stream:
+        success at `done`, failure on a stall, an error chunk or EOF without `done`,
+        and release_probe() when the stream is closed, aborted or collected before either.
+        """
+        released = settled = False
+        try:
+            for line in self._lines(conn, response):
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    settled = True
+                    self.breaker.record_failure()
+                    raise OllamaError(chunk["error"])
+                if chunk.get("done"):
+                    response.read()  # drain the chunked terminator so the connection can be reused
+                    if abort.settle():
+                        self._release(conn, response)
+                        released = True
+                    self.breaker.record_success()
+                    settled = True
+                    yield chunk
+                    return
+                yield chunk
+            if abort.requested:
+                return
+            # EOF without `done`: the server dropped the stream, so the text so far is cut short.
+            settled = True
+            self.breaker.record_failure()
+            raise OllamaError("Ollama closed the stream before its final chunk")
+        except OllamaTimeoutError:
+            settled = True  # _lines already counted the stall
+            raise
+        except Exception:
+            if abort.requested:
+                return  # closed from another thread; the read it interrupted is not a backend failure
+            raise
+        finally:
+            if not released:
+                conn.close()
+            if not settled:
+                self.breaker.release_probe()
+
+    def stream(
+        self,
+        model: str,
+        prompt: str,
+        system: Optional[str] = None,
+        options: Optional[dict] = None,
+        on_done: Optional[Callable[[TokenStream], None]] = None,
+        **extra,
+    ) -> TokenStream:
+        """
+        Starts a streaming /api/generate call.
+
+        Returns:
+            TokenStream: Iterable of text pieces as Ollama emits them.
+        """
+        started = time.perf_counter()
+        # The breaker hears about this call once the stream ends, not when the headers arrive.
+        conn, response = self._post("/api/generate", self._payload(model, prompt, system, options, True, extra), settle=False)
+        abort = _StreamAbort(conn)
+        return TokenStream(self._iter_chunks(conn, response, abort), ollama_model_name(model), started, on_done, abort)
@@ -0,0 +1,243 @@
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from configs.tools.core import tracing
+from configs.tools.core.llm_cache import BYPASS_ENV_VAR
+from configs.tools.doc_schemas import ALL_KEYS, SCHEMA_VERSION, parse_doc_markdown, parse_doc_text
+from configs.tools.parse_md_function import LAZY_THRESHOLD_BYTES
+
+DEFAULT_PARSE_CACHE_PATH = ".cache/parse_cache.sqlite3"
+# Parsed docs kept in memory, most recently used first out last.
+DEFAULT_MEMORY_ENTRIES = 1024
+# Disk entries not read for this long are dropped when the cache is opened.
+DEFAULT_MAX_AGE_S = 30 * 24 * 3600
+
+# Changes whenever a doc schema or the parser's patterns do, so stale parses are never served.
+PARSER_VERSION = SCHEMA_VERSION
+
+PARSED_KEYS = ALL_KEYS
+
+
+class ParseCache:
+    """
+    Parsed docs (every mode in doc_schemas), cached in memory and in SQLite, keyed by file content hash.
+
+    A file whose size and mtime match what was recorded last time is served
+    without being read. A changed (or new) file is read and hashed; if that
+    content was parsed before, anywhere, the stored result is reused, so only
+    new content is ever parsed. Files of LAZY_THRESHOLD_BYTES or more are
+    parsed lazily and never cached.
+
+    Args:
+        path (str): SQLite file location.
+        memory_entries (int): Parsed docs kept in memory.
+        max_age_s (float): Disk entries unused this long are dropped.
+        enabled (bool, optional): False parses every time. Defaults to on
+            unless SOOTHSAYER_NO_CACHE is set.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_PARSE_CACHE_PATH,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        enabled: Optional[bool] = None,
+    ):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_age_s = max_age_s
+        self.enabled = (not os.environ.get(BYPASS_ENV_VAR)) if enabled is None else enabled
+        # sha256 -> parsed doc, and path -> (mtime_ns, size, sha256)
+        self._docs: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._stats: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self.counts = {"memory": 0, "disk": 0, "parsed": 0, "uncached": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS parsed ("
+                " sha256 TEXT NOT NULL, parser TEXT NOT NULL, doc TEXT NOT NULL, last_access REAL NOT NULL,"
+                " PRIMARY KEY (sha256, parser))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, sha256 TEXT NOT NULL)"
+            )
+            conn.execute("DELETE FROM parsed WHERE last_access < ?", (time.time() - self.max_age_s,))
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, sha: str, doc: Dict[str, str]) -> None:
+        self._docs[sha] = doc
+        self._docs.move_to_end(sha)
+        while len(self._docs) > self.memory_entries:
+            self._docs.popitem(last=False)
+
+    def get(self, file_path: str) -> Optional[Dict[str, str]]:
+        """
+        Parses one doc with its mode's schema, from the cache when its content was parsed before.
+
+        Returns:
+            dict: A fresh copy of the parsed doc (callers may modify it), a
+            LazyDevDoc for large files, or None when the file does not exist.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            print(f"[ERROR] File not found: {file_path}")
+            return None
+        if not self.enabled or st.st_size >= LAZY_THRESHOLD_BYTES:
+            self.counts["uncached"] += 1
+            return parse_doc_markdown(file_path)
+
+        key = os.path.abspath(file_path)
+        with self._lock:
+            known = self._stats.get(key)
+            if known is None:
+                row = self._db().execute("SELECT mtime_ns, size, sha256 FROM files WHERE path = ?", (key,)).fetchone()
+                known = tuple(row) if row else None
+            if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+                doc = self._lookup(known[2])
+                if doc is not None:
+                    self._stats[key] = known
+                    return dict(doc)
+
+        # Changed, new, or its parse was evicted: hash the content, and parse only unseen content.
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        sha = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            doc = self._lookup(sha)
+        if doc is None:
+            with tracing.span("md.parse", bytes=len(raw), lazy=False):
+                doc = parse_doc_text(raw.decode("utf-8"))
+            with self._lock:
+                self.counts["parsed"] += 1
+                self._remember(sha, doc)
+                self._db().execute(
+                    "INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?)",
+                    (sha, PARSER_VERSION, json.dumps(doc, ensure_ascii=False), time.time()),
+                )
+        with self._lock:
+            self._stats[key] = (st.st_mtime_ns, st.st_size, sha)
+            self._db().execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (key, st.st_mtime_ns, st.st_size, sha))
+        return dict(doc)
+
+    def _lookup(self, sha: str) -> Optional[Dict[str, str]]:
+        """Memory, then disk; counts the hit. Caller holds the lock."""
+        doc = self._docs.get(sha)
+        if doc is not None:
+            self._docs.move_to_end(sha)
+            self.counts["memory"] += 1
+            return doc
+        db = self._db()
+        row = db.execute("SELECT doc FROM parsed WHERE sha256 = ? AND parser = ?", (sha, PARSER_VERSION)).fetchone()
+        if row is None:
+            return None
+        db.execute("UPDATE parsed SET last_access = ? WHERE sha256 = ? AND parser = ?", (time.time(), sha, PARSER_VERSION))
+        doc = json.loads(row[0])
+        self._remember(sha, doc)
+        self.counts["disk"] += 1
+        return doc
+
+    def stats(self) -> Dict[str, int]:
+        """Docs served from memory, from disk, parsed, and parsed uncached (large or bypassed)."""
+        with self._lock:
+            return dict(self.counts, memory_entries=len(self._docs))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default: Optional[ParseCache] = None
+_default_lock = threading.Lock()
+
+
+def parse_cache() -> ParseCache:
+    """The process-wide ParseCache, shared by the Ingestor tool and the batch entry points."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ParseCache()
+        return _default
+
+
+# === Multi-file parsing with field projection ===
+def _split(value: Union[str, Sequence[str], None]) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    return [str(part).strip() for part in value if str(part).strip()]
+
+
+def expand_paths(paths: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Resolves paths, globs (`**` included) and folders (every .md below) into a sorted, de-duplicated file list.
+
+    Args:
+        paths: One entry, a comma-separated string of entries, or a list.
+    """
+    found = []
+    for entry in _split(paths):
+        if glob.has_magic(entry):
+            found.extend(p for p in glob.glob(entry, recursive=True) if os.path.isfile(p))
+        elif os.path.isdir(entry):
+            found.extend(glob.glob(os.path.join(entry, "**", "*.md"), recursive=True))
+        else:
+            found.append(entry)
+    return sorted(set(found))
+
+
+def project(doc: Mapping[str, str], fields: Iterable[str]) -> Dict[str, str]:
+    """The requested keys of a parsed doc, in the order asked for."""
+    return {key: doc.get(key, "") for key in fields}
+
+
+def parse_many(
+    paths: Union[str, Sequence[str]],
+    fields: Union[str, Sequence[str], None] = None,
+    cache: Optional[ParseCache] = None,
+) -> Dict[str, Dict[str, str]]:
+    """
+    Parses every doc the paths name, each with its mode's schema, keeping only `fields`.
+
+    Args:
+        paths: Paths, globs or folders; a list or a comma-separated string.
+        fields: Keys to keep (e.g. "function_name,tags"); None or empty keeps all.
+        cache (ParseCache, optional): Defaults to the process-wide parse_cache().
+
+    Returns:
+        dict: path -> parsed (projected) doc. Missing files are left out.
+
+    Raises:
+        ValueError: When a requested field is not a key of any doc schema.
+    """
+    wanted = _split(fields)
+    unknown = [key for key in wanted if key not in PARSED_KEYS]
+    if unknown:
+        raise ValueError(f"unknown field(s) {', '.join(unknown)}; expected some of {', '.join(PARSED_KEYS)}")
+    cache = cache or parse_cache()
+    docs = {}
+    for path in expand_paths(paths):
+        doc = cache.get(path)
+        if doc is not None:
+            docs[path] = project(doc, wanted) if wanted else dict(doc)
+    return docs
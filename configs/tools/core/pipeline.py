@@ -0,0 +1,198 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+_STOP = object()
+
+
+class StageFailure:
+    """
+    Placeholder result for an item that raised in a stage; later stages skip it.
+
+    Args:
+        stage (str): The stage that raised.
+        error (Exception): What it raised.
+        item: The item as that stage received it, so callers can say which one failed.
+    """
+
+    def __init__(self, stage: str, error: Exception, item: Any = None):
+        self.stage = stage
+        self.error = error
+        self.item = item
+
+    def __repr__(self):
+        return f"StageFailure({self.stage!r}, {self.error!r})"
+
+
+class Stage:
+    """
+    One step of a Pipeline.
+
+    Args:
+        name (str): Label used in stats.
+        worker_factory (callable): Called once per worker thread; returns the
+            callable that processes one item. Per-thread construction lets each
+            worker own objects that are not thread-safe (e.g. a CrewAI agent).
+        workers (int): Number of worker threads for this stage.
+    """
+
+    def __init__(self, name: str, worker_factory: Callable[[], Callable[[Any], Any]], workers: int = 1):
+        self.name = name
+        self.worker_factory = worker_factory
+        self.workers = workers
+
+
+class _StageStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+        self.busy_s = 0.0
+        self.latencies = []
+        self.first_start: Optional[float] = None
+        self.last_end: Optional[float] = None
+
+    def record(self, started: float, ended: float, ok: bool) -> None:
+        with self.lock:
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+            self.busy_s += ended - started
+            self.latencies.append(ended - started)
+            if self.first_start is None or started < self.first_start:
+                self.first_start = started
+            if self.last_end is None or ended > self.last_end:
+                self.last_end = ended
+
+    def summary(self, workers: int) -> Dict[str, float]:
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1e3 if ordered else 0.0
+
+        active = (self.last_end - self.first_start) if self.first_start is not None else 0.0
+        return {
+            "workers": workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_s": self.busy_s,
+            "items_per_s": (self.processed + self.failed) / active if active else 0.0,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+        }
+
+
+class Pipeline:
+    """
+    Runs items through stages connected by bounded queues.
+
+    Each stage has its own worker threads, so item N+1 can be in stage 1 while
+    item N is in stage 3; wall time approaches the slowest stage's total
+    instead of the sum of all stages.
+
+    Args:
+        stages (list): Stages in order; each receives the previous stage's output.
+        queue_size (int): Capacity of each inter-stage queue (backpressure bound).
+    """
+
+    def __init__(self, stages: Sequence[Stage], queue_size: int = 4):
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self._stats = [_StageStats() for _ in self.stages]
+        self.wall_s = 0.0
+
+    def _worker(self, index: int, inbox: queue.Queue, outbox: queue.Queue, remaining: List[int], lock) -> None:
+        stage = self.stages[index]
+        stats = self._stats[index]
+        try:
+            process = stage.worker_factory()
+        except Exception as e:
+            setup_error = e
+
+            def process(_item):
+                raise setup_error
+        while True:
+            message = inbox.get()
+            if message is _STOP:
+                break
+            position, item = message
+            if not isinstance(item, StageFailure):
+                started = time.perf_counter()
+                try:
+                    item = process(item)
+                    ok = True
+                except Exception as e:
+                    item = StageFailure(stage.name, e, item)
+                    ok = False
+                stats.record(started, time.perf_counter(), ok)
+            outbox.put((position, item))
+        with lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last:
+            downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            for _ in range(downstream):
+                outbox.put(_STOP)
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Processes every item through all stages.
+
+        Returns:
+            list: Final outputs in input order; items that raised hold a StageFailure.
+
+        Raises:
+            Exception: Whatever the `items` iterable raised, after in-flight items drain.
+        """
+        started = time.perf_counter()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        remaining = [stage.workers for stage in self.stages]
+        lock = threading.Lock()
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, queues[index], queues[index + 1], remaining, lock),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        feed_errors = []
+
+        def feed():
+            try:
+                for position, item in enumerate(items):
+                    queues[0].put((position, item))
+            except Exception as e:
+                feed_errors.append(e)
+            finally:
+                for _ in range(self.stages[0].workers):
+                    queues[0].put(_STOP)
+
+        threading.Thread(target=feed, name="pipeline-feed", daemon=True).start()
+
+        results = {}
+        while True:
+            message = queues[-1].get()
+            if message is _STOP:
+                break
+            position, item = message
+            results[position] = item
+        for thread in threads:
+            thread.join()
+
+        self.wall_s = time.perf_counter() - started
+        if feed_errors:
+            raise feed_errors[0]
+        return [results[position] for position in range(len(results))]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage processed/failed counts, busy time, throughput and latency percentiles."""
+        report = {stage.name: stats.summary(stage.workers) for stage, stats in zip(self.stages, self._stats)}
+        report["pipeline"] = {"wall_s": self.wall_s}
+        return report
@@ -0,0 +1,241 @@
+import logging
+import random
+import socket
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from configs.tools.core import tracing
+from configs.tools.core.agent_config import LLMConstraints
+
+logger = logging.getLogger("soothsayer.resilience")
+
+T = TypeVar("T")
+
+# Exception class names from httpx / litellm / ollama that mean "the backend
+# is unreachable or struggling", matched by name so none of them is imported.
+TRANSIENT_ERROR_NAMES = {
+    "ConnectError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "ReadError",
+    "RemoteProtocolError",
+    "PoolTimeout",
+    "Timeout",
+    "APIConnectionError",
+    "ServiceUnavailableError",
+    "InternalServerError",
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the backend while its circuit breaker is open."""
+
+    def __init__(self, name: str, retry_in_s: float):
+        super().__init__(f"{name} is failing; not calling it for another {retry_in_s:.1f}s")
+        self.retry_in_s = retry_in_s
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    True for failures worth retrying and counting against the backend.
+
+    Connection errors, timeouts, HTTP 429/5xx and their httpx/litellm
+    equivalents are transient. Bad requests (unknown model, 4xx) are not.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = getattr(error, "status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(error, (OSError, socket.timeout, TimeoutError)):
+        return True
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def is_model_missing(error: BaseException) -> bool:
+    """True when the backend answered that the requested model is not installed (HTTP 404 / "model ... not found")."""
+    if getattr(error, "status", None) == 404 or getattr(error, "status_code", None) == 404:
+        return True
+    message = str(error).lower()
+    return "model" in message and "not found" in message
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a backend keeps failing.
+
+    Closed: calls pass; consecutive transient failures are counted. After
+    `threshold` of them the circuit opens: calls raise CircuitOpenError at once
+    for `cooldown_s`. Then it is half-open: one probe call goes through; its
+    success closes the circuit, its failure re-opens it for another cooldown.
+    A probe that is abandoned without an outcome (see release_probe), or that
+    has not reported within `cooldown_s`, frees the slot for the next probe,
+    so one lost probe cannot keep the circuit open.
+
+    Args:
+        name (str): Label for errors and logs, usually the backend URL.
+        threshold (int): Consecutive failures that open the circuit.
+        cooldown_s (float): Seconds an open circuit rejects calls.
+    """
+
+    def __init__(self, name: str, threshold: int = 5, cooldown_s: float = 30.0):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._probe_started = 0.0
+        self._counts = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._probing and now - self._probe_started >= self.cooldown_s:
+            logger.warning("probe of %s gave no outcome within %.1fs; allowing another", self.name, self.cooldown_s)
+            self._probing = False
+        return "open" if now - self._opened_at < self.cooldown_s or self._probing else "half_open"
+
+    def before_call(self) -> None:
+        """Raises CircuitOpenError unless the call may go ahead."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == "closed":
+                return
+            if state == "half_open":
+                self._probing = True
+                self._probe_started = now
+                return
+            self._counts["rejected"] += 1
+            if self._probing:
+                retry_in = max(0.0, self.cooldown_s - (now - self._probe_started))
+            else:
+                retry_in = max(0.0, self.cooldown_s - (now - self._opened_at))
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("circuit for %s closed", self.name)
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """
+        Ends a call that gave no outcome (e.g. a stream closed before its last chunk).
+
+        Nothing is counted; if the call was the half-open probe, the next call may probe instead.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.threshold):
+                self._opened_at = time.monotonic()
+                self._probing = False
+                self._counts["opened"] += 1
+                logger.warning("circuit for %s opened after %d failures", self.name, self._failures)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {"state": self._state(time.monotonic()), "consecutive_failures": self._failures, **self._counts}
+
+    def reconfigure(self, threshold: int, cooldown_s: float) -> None:
+        with self._lock:
+            self.threshold = threshold
+            self.cooldown_s = cooldown_s
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(name: str, constraints: Optional[LLMConstraints] = None) -> CircuitBreaker:
+    """
+    The process-wide breaker for one backend, so every client of it shares the same view.
+
+    Args:
+        name (str): Backend identity, e.g. the Ollama base URL.
+        constraints (LLMConstraints, optional): Threshold and cooldown to apply.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            constraints = constraints or LLMConstraints()
+            breaker = _breakers[name] = CircuitBreaker(name, constraints.breaker_threshold, constraints.breaker_cooldown_s)
+        elif constraints is not None:
+            breaker.reconfigure(constraints.breaker_threshold, constraints.breaker_cooldown_s)
+        return breaker
+
+
+def backoff_delay(constraints: LLMConstraints, attempt: int, rng: random.Random = random) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+    cap = min(constraints.backoff_max_s, constraints.backoff_base_s * (2 ** (attempt - 1)))
+    return rng.uniform(0.0, cap)
+
+
+def call_with_retries(
+    fn: Callable[[], T],
+    constraints: LLMConstraints,
+    breaker: Optional[CircuitBreaker] = None,
+    label: str = "llm",
+    settle: bool = True,
+) -> T:
+    """
+    Calls `fn` under the constraints' retry budget and the backend's breaker.
+
+    Transient failures (see is_transient) are retried with full-jitter
+    backoff until `attempts` tries are used or the next wait would pass
+    `total_timeout_s`. Other errors are raised at once. An open breaker
+    raises CircuitOpenError without calling `fn`.
+
+    Args:
+        fn (callable): The call to make; takes no arguments.
+        constraints (LLMConstraints): Attempts, backoff and time budget.
+        breaker (CircuitBreaker, optional): Shared per backend.
+        label (str): Names the call in logs and trace spans.
+        settle (bool): Record a breaker success when `fn` returns. Pass False
+            when the result can still fail (e.g. a stream still being read),
+            and record the outcome on the breaker once it is known.
+
+    Returns:
+        Whatever `fn` returns.
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        if breaker is not None:
+            breaker.before_call()
+        attempt += 1
+        try:
+            result = fn()
+        except Exception as e:
+            transient = is_transient(e)
+            if breaker is not None and transient:
+                breaker.record_failure()
+            elif breaker is not None:
+                # A non-transient error (e.g. unknown model) still proves the backend is answering.
+                breaker.record_success()
+            if not transient or attempt >= constraints.attempts:
+                raise
+            delay = backoff_delay(constraints, attempt)
+            if time.monotonic() - started + delay > constraints.total_timeout_s:
+                raise
+            logger.warning("%s attempt %d/%d failed (%s: %s); retrying in %.2fs", label, attempt, constraints.attempts, type(e).__name__, e, delay)
+            tracing.record(f"{label}.retry_wait", delay, attempt=attempt, error=type(e).__name__)
+            time.sleep(delay)
+            continue
+        if breaker is not None and settle:
+            breaker.record_success()
+        return result
@@ -0,0 +1,282 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from configs.tools.core import tracing
+from configs.tools.core.agent_config import LLMConstraints, load_agent_config
+from configs.tools.core.memory import estimate_tokens
+from configs.tools.core.ollama_client import DEFAULT_BASE_URL
+from configs.tools.core.resilience import is_model_missing
+from configs.tools.core.runtime import build_ollama_llm
+
+MODES = ("dev_doc", "user_doc", "comms")
+DEFAULT_MODE = "dev_doc"
+DEFAULT_MODEL = "mistral"
+
+# Keys a route entry may set; anything else in the YAML is ignored.
+ROUTE_KEYS = ("model", "escalate_to", "min_chars", "must_include")
+
+logger = logging.getLogger("soothsayer.routing")
+
+
+class Route:
+    """
+    The model one agent role uses in one mode, and the check its output must pass.
+
+    Args:
+        role (str): Agent role, lower-case (clarifier, ingestor, investigator, scribe, soothsayer).
+        mode (str): Document mode (dev_doc, user_doc, comms).
+        model (str): Model name for this role and mode.
+        escalate_to (str, optional): Model that re-runs the call when the output fails check().
+        min_chars (int): Shortest acceptable output.
+        must_include (list): Phrases the output must contain (case-insensitive).
+    """
+
+    def __init__(
+        self,
+        role: str,
+        mode: str,
+        model: str,
+        escalate_to: Optional[str] = None,
+        min_chars: int = 1,
+        must_include: Optional[List[str]] = None,
+    ):
+        self.role = role
+        self.mode = mode
+        self.model = model
+        self.escalate_to = escalate_to if escalate_to and escalate_to != model else None
+        self.min_chars = max(1, min_chars)
+        self.must_include = [must_include] if isinstance(must_include, str) else list(must_include or [])
+
+    def check(self, text: str) -> Optional[str]:
+        """
+        Validates one output.
+
+        Returns:
+            str: What is wrong with it, or None when it passes.
+        """
+        text = (text or "").strip()
+        if not text:
+            return "empty output"
+        if len(text) < self.min_chars:
+            return f"too short ({len(text)} characters, need at least {self.min_chars})"
+        lowered = text.lower()
+        missing = [phrase for phrase in self.must_include if phrase.lower() not in lowered]
+        if missing:
+            return f"missing {', '.join(repr(p) for p in missing)}"
+        return None
+
+    def __repr__(self):
+        escalation = f" → {self.escalate_to}" if self.escalate_to else ""
+        return f"Route({self.role}/{self.mode}: {self.model}{escalation})"
+
+
+class ModelRouter:
+    """
+    Picks a model per agent role and mode from the agent config's `routing` block.
+
+    An entry is resolved by merging, in order: `routing.default`, then
+    `routing.roles.<role>`, then `routing.modes.<mode>.<role>`; a later entry
+    overrides only the keys it sets. Without a `routing` block, every role uses
+    `model.name`.
+
+    run() executes a call on the route's model and, when the output fails the
+    route's check and `escalate_to` is set, once more on the escalation model.
+    Every call is recorded per (role, mode, model) for report().
+
+    Args:
+        config (dict, optional): Parsed agent config. Defaults to load_agent_config().
+        base_url (str): Ollama server URL for the LLMs built by llm().
+        constraints (LLMConstraints, optional): Timeouts for those LLMs.
+        override (str, optional): Forces every route onto this model, without escalation.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        constraints: Optional[LLMConstraints] = None,
+        override: Optional[str] = None,
+    ):
+        config = config if config is not None else load_agent_config()
+        block = config.get("routing") or {}
+        self.default_model = (config.get("model") or {}).get("name") or DEFAULT_MODEL
+        self.default = dict(block.get("default") or {})
+        self.roles = {str(k).lower(): dict(v or {}) for k, v in (block.get("roles") or {}).items()}
+        self.modes = {
+            str(mode): {str(k).lower(): dict(v or {}) for k, v in (entries or {}).items()}
+            for mode, entries in (block.get("modes") or {}).items()
+        }
+        self.costs = {str(k): float(v) for k, v in (block.get("cost_per_1k_tokens") or {}).items()}
+        self.base_url = base_url
+        self.constraints = constraints
+        self.override = override
+        self._llms: Dict[str, object] = {}
+        self._stats: Dict[Tuple[str, str, str], Dict] = {}
+        self._lock = threading.Lock()
+        for mode in self.modes:
+            if mode not in MODES:
+                logger.warning("routing.modes.%s is not one of %s", mode, MODES)
+
+    def route(self, role: str, mode: Optional[str] = None) -> Route:
+        """The route for an agent role in a mode (DEFAULT_MODE when not given)."""
+        role = role.lower()
+        mode = mode or DEFAULT_MODE
+        entry = {"model": self.default_model}
+        for layer in (self.default, self.roles.get(role, {}), self.modes.get(mode, {}).get(role, {})):
+            entry.update({k: v for k, v in layer.items() if k in ROUTE_KEYS and v is not None})
+        if self.override:
+            entry["model"], entry["escalate_to"] = self.override, None
+        try:
+            min_chars = int(entry.get("min_chars", 1))
+        except (TypeError, ValueError):
+            logger.warning("routing min_chars=%r for %s/%s is not an int; using 1", entry.get("min_chars"), role, mode)
+            min_chars = 1
+        return Route(role, mode, str(entry["model"]), entry.get("escalate_to"), min_chars, entry.get("must_include"))
+
+    def llm(self, model: str):
+        """The shared OllamaLLM for a model, built on first use."""
+        with self._lock:
+            if model not in self._llms:
+                self._llms[model] = build_ollama_llm(model, self.base_url, constraints=self.constraints)
+            return self._llms[model]
+
+    # === Execution ===
+    def run(self, route: Route, call: Callable[[str], str], prompt: str = "") -> str:
+        """
+        Runs `call(model)` on the route's model, escalating once if the output fails route.check().
+
+        A route's model that the backend reports as not installed also falls
+        back to `escalate_to` (with a warning) instead of failing the call.
+        Token counts are estimated from `prompt` and the output text. When the
+        escalated output fails too, it is still returned (and logged).
+
+        Args:
+            route (Route): From route().
+            call (callable): Takes a model name, returns the output text.
+            prompt (str): The text sent, for the token estimate.
+
+        Returns:
+            str: The accepted output.
+        """
+        try:
+            text, problem = self._call(route, route.model, call, prompt, escalating=bool(route.escalate_to))
+        except Exception as e:
+            if not route.escalate_to or route.escalate_to == route.model or not is_model_missing(e):
+                raise
+            logger.warning(
+                "%s/%s: %s is not available (%s); using %s", route.role, route.mode, route.model, e, route.escalate_to
+            )
+            return self._call(route, route.escalate_to, call, prompt)[0]
+        if problem is None or not route.escalate_to:
+            return text
+        logger.info("%s/%s: %s output rejected (%s); escalating to %s", route.role, route.mode, route.model, problem, route.escalate_to)
+        text, problem = self._call(route, route.escalate_to, call, prompt)
+        if problem:
+            logger.warning("%s/%s: escalated output from %s rejected too (%s)", route.role, route.mode, route.escalate_to, problem)
+        return text
+
+    def _call(
+        self, route: Route, model: str, call: Callable[[str], str], prompt: str, escalating: bool = False
+    ) -> Tuple[str, Optional[str]]:
+        started = time.perf_counter()
+        with tracing.span("route.call", role=route.role, mode=route.mode, model=model) as span:
+            text = call(model)
+            problem = route.check(text)
+            span.set(rejected=problem is not None)
+        self.record(
+            route, model, time.perf_counter() - started, estimate_tokens(prompt), estimate_tokens(text or ""),
+            rejected=problem is not None, escalated=escalating and problem is not None
+        )
+        return text, problem
+
+    # === Accounting ===
+    def record(
+        self,
+        route: Route,
+        model: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        eval_tokens: int = 0,
+        calls: int = 1,
+        rejected: int = 0,
+        escalated: int = 0,
+    ) -> None:
+        """
+        Adds one call (or `calls` calls totalling `seconds`) to the (role, mode, model) row.
+
+        `rejected` and `escalated` count those calls whose output failed its
+        checks, and those whose failure was passed on to the escalation model;
+        a bool counts as one call.
+        """
+        with self._lock:
+            row = self._row(route, model)
+            row["calls"] += calls
+            row["rejected"] += int(rejected)
+            row["escalated"] += int(escalated)
+            row["seconds"].append(seconds)
+            row["prompt_tokens"] += prompt_tokens
+            row["eval_tokens"] += eval_tokens
+
+    def _row(self, route: Route, model: str) -> Dict:
+        key = (route.role, route.mode, model)
+        if key not in self._stats:
+            self._stats[key] = {"calls": 0, "rejected": 0, "escalated": 0, "seconds": [], "prompt_tokens": 0, "eval_tokens": 0}
+        return self._stats[key]
+
+    def report(self) -> List[Dict]:
+        """
+        Per-route totals.
+
+        Returns:
+            list: One dict per (role, mode, model) with calls, rejected, escalated,
+            p50_ms, p95_ms, total_s, prompt_tokens, eval_tokens and cost
+            (cost_per_1k_tokens × all tokens; 0 when the model has no price).
+        """
+        rows = []
+        with self._lock:
+            for (role, mode, model), row in sorted(self._stats.items()):
+                seconds = sorted(row["seconds"])
+                tokens = row["prompt_tokens"] + row["eval_tokens"]
+                rows.append({
+                    "role": role,
+                    "mode": mode,
+                    "model": model,
+                    "calls": row["calls"],
+                    "rejected": row["rejected"],
+                    "escalated": row["escalated"],
+                    "p50_ms": seconds[len(seconds) // 2] * 1e3 if seconds else 0.0,
+                    "p95_ms": seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))] * 1e3 if seconds else 0.0,
+                    "total_s": sum(seconds),
+                    "prompt_tokens": row["prompt_tokens"],
+                    "eval_tokens": row["eval_tokens"],
+                    "cost": tokens / 1000 * self.costs.get(model, 0.0),
+                })
+        return rows
+
+    def print_report(self) -> None:
+        rows = self.report()
+        if not rows:
+            return
+        print(f"\n{'route':<24} {'model':<16} {'calls':>5} {'rejected':>8} {'escalated':>9} {'p50 s':>7} {'p95 s':>7} {'tokens':>8} {'cost':>8}")
+        for row in rows:
+            print(
+                f"{row['role'] + '/' + row['mode']:<24} {row['model']:<16} {row['calls']:>5} {row['rejected']:>8} "
+                f"{row['escalated']:>9} {row['p50_ms'] / 1e3:>7.1f} {row['p95_ms'] / 1e3:>7.1f} "
+                f"{row['prompt_tokens'] + row['eval_tokens']:>8} {row['cost']:>8.3f}"
+            )
+        print(f"[📊] Routed cost: {sum(r['cost'] for r in rows):.3f} over {sum(r['calls'] for r in rows)} calls")
+
+
+_default: Optional[ModelRouter] = None
+_default_lock = threading.Lock()
+
+
+def default_router() -> ModelRouter:
+    """The process-wide router over the agent config, so every entry point reports into one table."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ModelRouter()
+        return _default
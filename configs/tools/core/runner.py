@@ -1,31 +1,270 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from configs.tools.parse_md_function import parse_dev_doc_markdown
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from configs.tools.core import tracing
+from configs.tools.doc_schemas import parse_doc_markdown, parse_doc_text, write_doc_markdown
+from configs.tools.parse_md_function import LAZY_THRESHOLD_BYTES
 from configs.tools.write_md_function import write_dev_doc_markdown
 
+MANIFEST_NAME = ".conversion_manifest.json"
+
+# Below this many changed files a process pool costs more than it saves.
+MIN_POOL_JOBS = 32
+
+
 def run_conversion(input_file: str, output_file: str):
     """
-    Parses a dev_doc markdown file and regenerates it using the writer.
-    
+    Parses a markdown doc (any mode) and regenerates it using its mode's writer.
+
     Args:
         input_file (str): Path to the input Markdown file.
         output_file (str): Path to the regenerated output Markdown file.
     """
     print(f"[🔍] Parsing: {input_file}")
-    parsed_data = parse_dev_doc_markdown(input_file)
+    parsed_data = parse_doc_markdown(input_file)
 
     if parsed_data:
         print(f"[✍️ ] Writing new version to: {output_file}")
-        write_dev_doc_markdown(parsed_data, output_file)
+        write_doc_markdown(parsed_data, output_file)
     else:
         print("[❌] Could not parse input file.")
 
+
+def _walk_markdown(root: str, skip: Set[str] = frozenset()) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Yields (relative path, stat) for every .md file under root, using scandir stats.
+
+    Directories whose real path is in `skip` are not entered.
+    """
+    root = os.path.realpath(root)
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in skip:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    yield os.path.relpath(entry.path, root), entry.stat()
+
+
+def _load_manifest(path: Path) -> Dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_manifest(path: Path, manifest: Dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _convert_one(job: Tuple[str, str, Optional[str]]) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """
+    Worker: hashes one input, and parses/writes it unless the hash is unchanged.
+
+    Returns:
+        tuple: (input path, status, sha256, error) where status is converted, unchanged or failed.
+    """
+    input_path, output_path, previous_sha = job
+    with tracing.span("runner.convert") as span:
+        result = _convert_file(input_path, output_path, previous_sha)
+        span.set(status=result[1])
+    return result
+
+
+def _convert_file(input_path: str, output_path: str, previous_sha: Optional[str]):
+    try:
+        with open(input_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size >= LAZY_THRESHOLD_BYTES:
+                # Large inputs are hashed in chunks and parsed from an mmap, never read whole.
+                raw = None
+                sha = hashlib.file_digest(f, "sha256").hexdigest()
+            else:
+                raw = f.read()
+                sha = hashlib.sha256(raw).hexdigest()
+        if sha == previous_sha and os.path.exists(output_path):
+            return input_path, "unchanged", sha, None
+        if raw is None:
+            parsed_data = parse_doc_markdown(input_path, lazy=True)
+        else:
+            with tracing.span("md.parse", bytes=len(raw), lazy=False):
+                parsed_data = parse_doc_text(raw.decode("utf-8"))
+        write_doc_markdown(parsed_data, output_path, verbose=False)
+        return input_path, "converted", sha, None
+    except Exception as e:  # reported in the summary, never fatal for the batch
+        return input_path, "failed", None, f"{type(e).__name__}: {e}"
+
+
+def run_directory_conversion(
+    input_dir: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, float]:
+    """
+    Converts every dev_doc under input_dir into output_dir, mirroring the tree.
+
+    Files whose size and mtime match the manifest are skipped without being read;
+    files whose content hash matches are skipped without being parsed. Changed files
+    are parsed and written on a process pool. An output_dir inside input_dir is
+    left out of the walk, so earlier outputs are never read back as inputs.
+
+    Args:
+        input_dir (str): Root folder to walk recursively for .md files.
+        output_dir (str): Root folder for the regenerated Markdown files.
+        workers (int, optional): Process pool size. Defaults to the CPU count.
+        force (bool): Ignore the manifest and convert every file.
+
+    Returns:
+        dict: Summary with total, converted, skipped, failed, seconds and files_per_s.
+
+    Raises:
+        ValueError: When output_dir is input_dir, which would overwrite the inputs.
+    """
+    if os.path.realpath(output_dir) == os.path.realpath(input_dir):
+        raise ValueError(f"output directory {output_dir!r} is the input directory; choose a separate folder")
+    start = time.perf_counter()
+    manifest_path = Path(output_dir) / MANIFEST_NAME
+    manifest = {} if force else _load_manifest(manifest_path)
+    new_manifest = {}
+    jobs = []
+    stats_by_input = {}
+    skipped = 0
+
+    for rel, st in _walk_markdown(input_dir, skip={os.path.realpath(output_dir)}):
+        output_path = os.path.join(output_dir, rel)
+        entry = manifest.get(rel)
+        if (
+            entry
+            and entry["mtime_ns"] == st.st_mtime_ns
+            and entry["size"] == st.st_size
+            and os.path.exists(output_path)
+        ):
+            new_manifest[rel] = entry
+            skipped += 1
+            continue
+        input_path = os.path.join(input_dir, rel)
+        stats_by_input[input_path] = (rel, st)
+        jobs.append((input_path, output_path, entry["sha256"] if entry else None))
+
+    if len(jobs) >= MIN_POOL_JOBS and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+            results = list(pool.map(_convert_one, jobs, chunksize=chunksize))
+    else:
+        results = [_convert_one(job) for job in jobs]
+
+    converted = failed = 0
+    for input_path, status, sha, error in results:
+        rel, st = stats_by_input[input_path]
+        if status == "failed":
+            failed += 1
+            print(f"[❌] {input_path}: {error}")
+            continue
+        if status == "converted":
+            converted += 1
+        else:
+            skipped += 1
+        new_manifest[rel] = {"sha256": sha, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    _save_manifest(manifest_path, new_manifest)
+
+    seconds = time.perf_counter() - start
+    total = converted + skipped + failed
+    tracing.record("runner.directory", seconds, total=total, converted=converted, failed=failed)
+    summary = {
+        "total": total,
+        "converted": converted,
+        "skipped": skipped,
+        "failed": failed,
+        "seconds": seconds,
+        "files_per_s": total / seconds if seconds else 0.0,
+    }
+    print(
+        f"[📊] {total} files in {seconds:.2f}s ({summary['files_per_s']:.0f} files/s) — "
+        f"converted: {converted}, skipped: {skipped}, failed: {failed}"
+    )
+    return summary
+
+
+def run_bundle_conversion(bundle_file: str, output_dir: str) -> Dict[str, float]:
+    """
+    Splits a bundle of concatenated dev_docs into one regenerated file per document.
+
+    The bundle is memory-mapped and walked as an iterator, so document text is
+    never held beyond the one being written; only the output names are kept,
+    to detect clashes. Outputs are named after each document's function_name,
+    with its position in the bundle appended on a clash.
+
+    Args:
+        bundle_file (str): File of frontmatter-delimited dev_docs.
+        output_dir (str): Folder for the regenerated Markdown files.
+
+    Returns:
+        dict: Summary with total, converted, failed, seconds and files_per_s.
+    """
+    from configs.tools.lazy_md import iter_dev_docs
+
+    start = time.perf_counter()
+    seen = set()
+    converted = failed = 0
+    for position, doc in enumerate(iter_dev_docs(bundle_file)):
+        name = doc.get("function_name") or f"doc_{position}"
+        if name in seen:
+            name = f"{name}_{position}"
+        seen.add(name)
+        try:
+            write_dev_doc_markdown(doc, os.path.join(output_dir, f"{name}.md"), verbose=False)
+            converted += 1
+        except (OSError, KeyError) as e:
+            failed += 1
+            print(f"[❌] {bundle_file} #{position} ({name}): {type(e).__name__}: {e}")
+
+    seconds = time.perf_counter() - start
+    total = converted + failed
+    summary = {
+        "total": total,
+        "converted": converted,
+        "failed": failed,
+        "seconds": seconds,
+        "files_per_s": total / seconds if seconds else 0.0,
+    }
+    print(f"[📊] {total} bundled docs in {seconds:.2f}s — converted: {converted}, failed: {failed}")
+    return summary
+
+
 # 🔧 CLI support
 if __name__ == "__main__":
-    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Regenerate dev_doc Markdown. Directories are converted recursively and incrementally."
+    )
+    parser.add_argument("input_path", help="Input Markdown file or directory (e.g. input_docs/)")
+    parser.add_argument("output_path", help="Output Markdown file or directory (e.g. output_docs/)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size for directory mode")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and convert everything")
+    parser.add_argument("--bundle", action="store_true", help="Input is one file of many dev_docs; output is a directory")
+    args = parser.parse_args()
 
-    if len(sys.argv) != 3:
-        print("Usage: python core/runner.py <input_markdown_path> <output_markdown_path>")
+    if args.bundle:
+        run_bundle_conversion(args.input_path, args.output_path)
+    elif os.path.isdir(args.input_path):
+        try:
+            run_directory_conversion(args.input_path, args.output_path, workers=args.workers, force=args.force)
+        except ValueError as e:
+            parser.error(str(e))
     else:
-        input_path = sys.argv[1]
-        output_path = sys.argv[2]
-        run_conversion(input_path, output_path)
+        run_conversion(args.input_path, args.output_path)
@@ -0,0 +1,329 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from configs.tools.core import interaction_log, tracing
+from configs.tools.core.agent_config import LLMConstraints
+from configs.tools.core.llm_cache import LLMCache, make_cache_key
+from configs.tools.core.memory import MemoryChat, MemoryStore, memory_settings
+from configs.tools.core.ollama_client import DEFAULT_BASE_URL, OllamaClient, TokenStream
+from configs.tools.core.resilience import CircuitBreaker, call_with_retries
+from configs.tools.core.session import DEFAULT_NUM_CTX, ChatSession
+from configs.tools.core.singleflight import SingleFlight, flight_key, flights
+from configs.tools.core.warmup import ModelWarmer, warmup_settings
+
+
+def build_ollama_llm(
+    model: str,
+    base_url: str = DEFAULT_BASE_URL,
+    temperature: Optional[float] = None,
+    constraints: Optional[LLMConstraints] = None,
+    keep_alive: Optional[str] = None,
+):
+    """
+    Builds the LangChain OllamaLLM handed to CrewAI agents, with the constraints' timeouts.
+
+    Older langchain_ollama releases have no `client_kwargs` (or `keep_alive`);
+    there the calls stay bounded by execute_task's retry budget only, and
+    use Ollama's default keep_alive.
+    """
+    from langchain_ollama import OllamaLLM
+
+    constraints = constraints or LLMConstraints.from_config()
+    kwargs = {"base_url": base_url, "model": model}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if keep_alive is not None and "keep_alive" in getattr(OllamaLLM, "model_fields", {}):
+        kwargs["keep_alive"] = keep_alive
+    if "client_kwargs" in getattr(OllamaLLM, "model_fields", {}):
+        import httpx
+
+        kwargs["client_kwargs"] = {
+            "timeout": httpx.Timeout(constraints.read_timeout_s, connect=constraints.connect_timeout_s)
+        }
+    return OllamaLLM(**kwargs)
+
+
+def execute_task(agent, task, constraints: LLMConstraints, breaker: Optional[CircuitBreaker] = None, label: str = "crew") -> str:
+    """Runs `agent.execute_task(task)` under the constraints' retries and the backend's breaker."""
+    return call_with_retries(lambda: str(agent.execute_task(task)), constraints, breaker, label=label)
+
+
+class SoothsayerRuntime:
+    """
+    Long-lived owner of one agent, its LLM and a pooled Ollama client.
+
+    The agent and LLM are built once, on first use. Each request then costs a
+    single `Task` (CrewAI path) or a single pooled HTTP call (streaming path);
+    no Crew, Agent or client is rebuilt per request.
+
+    Args:
+        system_prompt (str): System prompt shared by every request.
+        agent_factory (callable): Builds the CrewAI agent from the LLM instance.
+        model (str): Model name, e.g. `mistral` or `ollama/mistral`.
+        base_url (str): Ollama server URL.
+        temperature (float, optional): Sampling temperature, None for the model default.
+        expected_output (str): Default CrewAI expected_output for `run`.
+        cache (LLMCache, optional): Response cache. Defaults to a fresh LLMCache.
+        retriever (callable, optional): Maps a request to a context block (e.g.
+            DocIndex.context_for). The block is prepended to the request, never the
+            system prompt, so the prompt prefix stays byte-stable.
+        coalesce (SingleFlight or bool): Concurrent identical requests (same
+            system prompt, model, temperature and request, ignoring line endings and surrounding whitespace)
+            share one generation. Defaults to the process-wide "llm" group;
+            False runs every request on its own.
+        keep_alive (str, optional): Sent with every request so Ollama keeps the
+            model loaded between them. Defaults to the agent config's
+            `warmup.keep_alive` (or SOOTHSAYER_KEEP_ALIVE).
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        agent_factory: Callable,
+        model: str = "mistral",
+        base_url: str = DEFAULT_BASE_URL,
+        temperature: Optional[float] = None,
+        expected_output: str = "",
+        cache: Optional[LLMCache] = None,
+        retriever: Optional[Callable[[str], str]] = None,
+        coalesce=True,
+        keep_alive: Optional[str] = None,
+    ):
+        self.system_prompt = system_prompt
+        self.agent_factory = agent_factory
+        self.model = model
+        self.base_url = base_url
+        self.temperature = temperature
+        self.expected_output = expected_output
+        self.cache = cache if cache is not None else LLMCache()
+        self.retriever = retriever
+        self.flights: Optional[SingleFlight] = flights() if coalesce is True else (coalesce or None)
+        self.keep_alive = keep_alive or warmup_settings()["keep_alive"]
+        self.warmer: Optional[ModelWarmer] = None
+        self.first_request: Optional[Dict] = None
+        self.client = OllamaClient(base_url=base_url)
+        self._llm = None
+        self._agent = None
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._overhead_s = 0.0
+
+    # === Long-lived components ===
+    @property
+    def llm(self):
+        if self._llm is None:
+            self._llm = build_ollama_llm(self.model, self.base_url, self.temperature, self.client.constraints, self.keep_alive)
+        return self._llm
+
+    @property
+    def agent(self):
+        with self._lock:
+            if self._agent is None:
+                with tracing.span("crew.setup", model=self.model):
+                    self._agent = self.agent_factory(self.llm)
+        return self._agent
+
+    @property
+    def options(self) -> Dict:
+        return {} if self.temperature is None else {"temperature": self.temperature}
+
+    def _record(self, overhead_s: float) -> None:
+        with self._lock:
+            self._requests += 1
+            self._overhead_s += overhead_s
+
+    def _note_first(self, seconds: float, warm: bool) -> None:
+        """Keeps the first model-served request's latency, and whether warm-up had finished before it."""
+        with self._lock:
+            if self.first_request is None:
+                self.first_request = {"ms": seconds * 1e3, "warm": warm}
+
+    def warm_up(self, heartbeat_s: Optional[float] = None) -> ModelWarmer:
+        """
+        Starts loading the model in the background (once) and returns its ModelWarmer.
+
+        Args:
+            heartbeat_s (float, optional): Keep-resident ping interval. Defaults
+                to the agent config's `warmup.heartbeat_s`.
+        """
+        with self._lock:
+            if self.warmer is None:
+                if heartbeat_s is None:
+                    heartbeat_s = warmup_settings()["heartbeat_s"]
+                self.warmer = ModelWarmer(self.client, self.model, self.keep_alive, self.options, heartbeat_s)
+        return self.warmer.start()
+
+    def _is_warm(self) -> bool:
+        return self.warmer is not None and self.warmer.ready
+
+    def with_context(self, description: str) -> str:
+        """Prepends the retriever's context block, if any, to a request."""
+        if not self.retriever:
+            return description
+        with tracing.span("prompt.context") as span:
+            context = self.retriever(description)
+            span.set(chars=len(context))
+        return f"{context}\n\n{description}" if context else description
+
+    # === Per-request executions ===
+    def run(self, description: str, expected_output: Optional[str] = None) -> str:
+        """
+        Executes one task on the shared agent and returns its final text.
+
+        Args:
+            description (str): Task description (usually the user's input).
+            expected_output (str, optional): Overrides the runtime's default.
+
+        Returns:
+            str: The agent's answer, from the cache when the request was seen before.
+        """
+        from crewai import Task
+
+        started = time.perf_counter()
+        user_text = description
+        description = self.with_context(description)
+        expected_output = self.expected_output if expected_output is None else expected_output
+        key = make_cache_key(self.system_prompt, description, self.model, self.temperature, expected_output)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._record(time.perf_counter() - started)
+            interaction_log.record_interaction("run", user_text, cached, time.perf_counter() - started, model=self.model, cached=True)
+            return cached
+
+        def generate() -> str:
+            agent = self.agent
+            with tracing.span("crew.task"):
+                task = Task(description=description, expected_output=expected_output, agent=agent)
+            self._record(time.perf_counter() - started)
+            with tracing.span("crew.execute", model=self.model):
+                text = execute_task(agent, task, self.client.constraints, self.client.breaker)
+            self.cache.put(key, text)
+            led.append(True)
+            return text
+
+        led = []
+        warm = self._is_warm()
+        prepared_s = time.perf_counter() - started
+        if self.flights is None:
+            text = generate()
+        else:
+            fkey = flight_key("run", self.system_prompt, description, self.model, self.temperature, expected_output)
+            text = self.flights.do(fkey, generate)
+            if not led:
+                self._record(prepared_s)
+        self._note_first(time.perf_counter() - started, warm)
+        interaction_log.record_interaction(
+            "run", user_text, text, time.perf_counter() - started, model=self.model, coalesced=None if led else True
+        )
+        return text
+
+    def stream(self, description: str) -> TokenStream:
+        """
+        Streams one completion over the pooled connection.
+
+        Returns:
+            TokenStream: Iterable of text pieces; a cache hit arrives as one piece,
+            and a request identical to one in flight replays that stream.
+        """
+        started = time.perf_counter()
+        user_text = description
+        description = self.with_context(description)
+        key = make_cache_key(self.system_prompt, description, self.model, self.temperature)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._record(time.perf_counter() - started)
+            interaction_log.record_interaction("stream", user_text, cached, time.perf_counter() - started, model=self.model, cached=True)
+            return TokenStream.from_text(cached, self.model)
+
+        def start(log: bool = False) -> TokenStream:
+            def done(stream: TokenStream) -> None:
+                self.cache.put(key, stream.text)
+                if log:
+                    log_view(stream)
+
+            led.append(True)
+            return self.client.stream(
+                model=self.model,
+                prompt=description,
+                system=self.system_prompt,
+                options=self.options,
+                on_done=done,
+                keep_alive=self.keep_alive,
+            )
+
+        def log_view(stream: TokenStream) -> None:
+            self._note_first(time.perf_counter() - started, warm)
+            interaction_log.record_stream("stream", user_text, stream, started, coalesced=None if led else True)
+
+        led = []
+        warm = self._is_warm()
+        self._record(time.perf_counter() - started)
+        if self.flights is None:
+            return start(log=True)
+        fkey = flight_key("stream", self.system_prompt, description, self.model, self.temperature)
+        return self.flights.stream(fkey, start, on_done=log_view)
+
+    def session(self, keep_alive: Optional[str] = None, max_context_tokens: Optional[int] = None) -> ChatSession:
+        """
+        Starts a multi-turn conversation on this runtime's client, model and system prompt.
+
+        Session turns skip the response cache, because each reply depends on
+        the earlier turns. Unless `max_context_tokens` is given, history is
+        trimmed to leave the constraints' `token_buffer` free for the reply.
+        """
+        if max_context_tokens is None:
+            max_context_tokens = self.options.get("num_ctx", DEFAULT_NUM_CTX) - self.client.constraints.token_buffer
+        return ChatSession(
+            self.client,
+            self.model,
+            self.system_prompt,
+            options=self.options,
+            keep_alive=keep_alive or self.keep_alive,
+            max_context_tokens=max_context_tokens,
+            retriever=self.retriever,
+        )
+
+    def memory_session(self, strategy: Optional[str] = None, conversation_id: str = "default") -> Optional[MemoryChat]:
+        """
+        Starts a conversation that carries its history in the prompt, per the agent config's memory settings.
+
+        Args:
+            strategy (str, optional): Overrides the config's `memory_strategy`.
+            conversation_id (str): long_term only: which stored conversation to resume.
+
+        Returns:
+            MemoryChat, or None when the strategy is "none" (every turn stands alone).
+        """
+        settings = memory_settings()
+        strategy = strategy or settings["strategy"]
+        if strategy == "none":
+            return None
+        return MemoryChat(
+            self.client,
+            self.model,
+            self.system_prompt,
+            strategy=strategy,
+            budget_tokens=settings["budget_tokens"],
+            summary_tokens=settings["summary_tokens"],
+            conversation_id=conversation_id,
+            store=MemoryStore(settings["store_path"]) if strategy == "long_term" else None,
+            options=self.options,
+            keep_alive=self.keep_alive,
+            retriever=self.retriever,
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Request count, mean per-request framework overhead (everything before the
+        model call), and how many requests were coalesced onto one in flight.
+        """
+        with self._lock:
+            mean = self._overhead_s / self._requests if self._requests else 0.0
+            stats = {"requests": self._requests, "mean_overhead_ms": mean * 1e3}
+        if self.flights is not None:
+            stats["deduplicated"] = self.flights.stats()["deduplicated"]
+        if self.first_request is not None:
+            stats["first_request_ms"] = self.first_request["ms"]
+            stats["first_request_warm"] = self.first_request["warm"]
+        return stats
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterator
+
+_DONE = object()
+
+
+class OverloadedError(RuntimeError):
+    """Raised immediately when the wait queue is full, instead of queueing without bound."""
+
+
+def _percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class AdmissionController:
+    """
+    Admission control in front of blocking LLM calls for an asyncio server.
+
+    At most `max_inflight` calls run at once (each on its own worker thread);
+    up to `max_queue` more may wait for a slot. Anything beyond that is rejected
+    with OverloadedError. Every request, queue wait included, is bounded by
+    `timeout_s`. A slot is only freed once its worker thread has really
+    finished, so timed-out calls never push Ollama past the limit.
+
+    Args:
+        max_inflight (int): Concurrent calls allowed to reach the backend.
+        max_queue (int): Requests allowed to wait for a slot.
+        timeout_s (float): Per-request deadline in seconds.
+    """
+
+    def __init__(self, max_inflight: int = 2, max_queue: int = 16, timeout_s: float = 120.0):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.timeout_s = timeout_s
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="soothsayer-llm")
+        self._queued = 0
+        self._inflight = 0
+        self._counts = {"completed": 0, "rejected": 0, "timed_out": 0, "failed": 0, "cancelled": 0}
+        self._latency = deque(maxlen=1000)
+        self._queue_wait = deque(maxlen=1000)
+
+    async def _admit(self, deadline: float) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if not self._slots.locked():
+            await self._slots.acquire()  # free slot: returns without suspending
+        else:
+            if self._queued >= self.max_queue:
+                self._counts["rejected"] += 1
+                raise OverloadedError(f"{self._queued} requests already waiting")
+            self._queued += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                self._counts["timed_out"] += 1
+                raise
+            finally:
+                self._queued -= 1
+        self._inflight += 1
+        self._queue_wait.append(loop.time() - started)
+
+    def _release(self, _future=None) -> None:
+        self._inflight -= 1
+        self._slots.release()
+
+    def _finish(self, started: float, outcome: str) -> None:
+        self._counts[outcome] += 1
+        if outcome == "completed":
+            self._latency.append(time.perf_counter() - started)
+
+    async def run(self, fn: Callable, *args):
+        """
+        Runs a blocking callable under admission control.
+
+        Raises:
+            OverloadedError: The wait queue is full.
+            asyncio.TimeoutError: The request exceeded timeout_s.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        deadline = loop.time() + self.timeout_s
+        await self._admit(deadline)
+        future = loop.run_in_executor(self._executor, fn, *args)
+        future.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            self._finish(started, "timed_out")
+            raise
+        except Exception:
+            self._finish(started, "failed")
+            raise
+        self._finish(started, "completed")
+        return result
+
+    async def stream(self, make_iter: Callable[[], Iterator]) -> AsyncIterator:
+        """
+        Relays a blocking iterator (e.g. a token stream) under admission control.
+
+        The iterator is created and consumed on a worker thread; items are handed
+        to the event loop as they arrive. If the consumer stops early or the
+        deadline passes, the worker stops pulling, and the iterator's close() is
+        called right away from the event loop, so an iterator whose close() is
+        thread-safe (e.g. a TokenStream) stops a read blocked on a stalled
+        backend and frees its slot without waiting for the read timeout.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        deadline = loop.time() + self.timeout_s
+        await self._admit(deadline)
+
+        items = asyncio.Queue()
+        stop = threading.Event()
+        opened = []
+
+        def pump():
+            iterator = None
+            try:
+                iterator = make_iter()
+                opened.append(iterator)
+                if stop.is_set():
+                    return  # abandoned while it was being created
+                for item in iterator:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(items.put_nowait, (item, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(items.put_nowait, (_DONE, e))
+                return
+            finally:
+                close = getattr(iterator, "close", None)
+                if close:
+                    close()
+            loop.call_soon_threadsafe(items.put_nowait, (_DONE, None))
+
+        def abandon():
+            close = getattr(opened[0], "close", None) if opened else None
+            if close:
+                try:
+                    close()
+                except ValueError:
+                    pass  # a plain generator running on the worker; it stops at its next item
+
+        future = loop.run_in_executor(self._executor, pump)
+        future.add_done_callback(self._release)
+        outcome = "failed"
+        try:
+            while True:
+                item, error = await asyncio.wait_for(items.get(), max(0.0, deadline - loop.time()))
+                if error is not None:
+                    raise error
+                if item is _DONE:
+                    outcome = "completed"
+                    return
+                yield item
+        except asyncio.TimeoutError:
+            outcome = "timed_out"
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            outcome = "cancelled"
+            raise
+        finally:
+            stop.set()
+            if outcome in ("timed_out", "cancelled"):
+                abandon()
+            self._finish(started, outcome)
+
+    def status(self) -> Dict:
+        """Queue depth, in-flight calls, outcome counters and latency percentiles in ms."""
+        latency = list(self._latency)
+        waits = list(self._queue_wait)
+        return {
+            "queued": self._queued,
+            "in_flight": self._inflight,
+            "max_inflight": self.max_inflight,
+            "max_queue": self.max_queue,
+            "timeout_s": self.timeout_s,
+            **self._counts,
+            "latency_ms": {p: _percentile(latency, int(p[1:])) * 1e3 for p in ("p50", "p95", "p99")},
+            "queue_wait_ms": {p: _percentile(waits, int(p[1:])) * 1e3 for p in ("p50", "p95", "p99")},
+        }
@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from configs.tools.core import interaction_log, tracing
+from configs.tools.core.ollama_client import OllamaClient, TokenStream
+
+# How long Ollama keeps the model (and its KV cache) loaded between turns.
+DEFAULT_KEEP_ALIVE = os.environ.get("SOOTHSAYER_KEEP_ALIVE", "30m")
+# Ollama's num_ctx when the options do not set one.
+DEFAULT_NUM_CTX = 2048
+
+logger = logging.getLogger("soothsayer.session")
+
+
+class ChatSession:
+    """
+    A multi-turn conversation that lets Ollama evaluate only the new text each turn.
+
+    The first turn sends the system prompt exactly as given. Each later turn
+    sends just the user's text, plus the `context` token array Ollama returned
+    for the previous turn, and the same `keep_alive`. The prompt Ollama builds
+    therefore starts with exactly the tokens it evaluated last time, so its
+    prefix cache covers everything except the new turn. Once the context would
+    pass `max_context_tokens`, the session starts over from the system prompt
+    instead of letting Ollama truncate silently.
+
+    A session is one conversation. Turns must not overlap; give every user
+    their own session.
+
+    Args:
+        client (OllamaClient): Pooled client shared with the runtime.
+        model (str): Model name.
+        system_prompt (str): Sent verbatim on the first turn of each context window.
+        options (dict, optional): Ollama options. Keep them fixed for the whole
+            session, because changing num_ctx reloads the model.
+        keep_alive (str): Ollama keep_alive duration, e.g. "30m".
+        max_context_tokens (int, optional): Context length that triggers a fresh
+            window. Defaults to 3/4 of num_ctx, leaving room for the reply.
+        retriever (callable, optional): Maps user text to a context block that is
+            prepended to that turn only.
+    """
+
+    def __init__(
+        self,
+        client: OllamaClient,
+        model: str,
+        system_prompt: str,
+        options: Optional[Dict] = None,
+        keep_alive: str = DEFAULT_KEEP_ALIVE,
+        max_context_tokens: Optional[int] = None,
+        retriever: Optional[Callable[[str], str]] = None,
+    ):
+        self.client = client
+        self.model = model
+        self.system_prompt = system_prompt
+        self.options = dict(options or {})
+        self.keep_alive = keep_alive
+        self.retriever = retriever
+        num_ctx = self.options.get("num_ctx", DEFAULT_NUM_CTX)
+        self.max_context_tokens = max_context_tokens or num_ctx * 3 // 4
+        self.prefix_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:12]
+        self.context: Optional[List[int]] = None
+        self.turns: List[Dict] = []
+
+    def reset(self) -> None:
+        """Drops the context; the next turn re-sends the system prompt."""
+        self.context = None
+
+    def stream(self, user_text: str) -> TokenStream:
+        """
+        Streams one turn.
+
+        Returns:
+            TokenStream: Iterable of text pieces. Per-turn stats are appended to
+            `turns` once the stream has been read to the end.
+        """
+        started = time.perf_counter()
+        raw_text = user_text
+        if self.retriever:
+            with tracing.span("prompt.context") as span:
+                context_block = self.retriever(user_text)
+                span.set(chars=len(context_block))
+            if context_block:
+                user_text = f"{context_block}\n\n{user_text}"
+        extra = {"keep_alive": self.keep_alive}
+        system = None
+        if self.context:
+            extra["context"] = self.context
+        else:
+            system = self.system_prompt
+        return self.client.stream(
+            model=self.model,
+            prompt=user_text,
+            system=system,
+            options=self.options,
+            on_done=lambda stream: self._finish_turn(stream, reused=system is None, user_text=raw_text, started=started),
+            **extra,
+        )
+
+    def ask(self, user_text: str) -> str:
+        """Runs one turn to completion and returns the reply text."""
+        stream = self.stream(user_text)
+        for _ in stream:
+            pass
+        return stream.text
+
+    def _finish_turn(self, stream: TokenStream, reused: bool, user_text: str, started: float) -> None:
+        final = stream.final
+        context = final.get("context") or None
+        restart = context is not None and len(context) > self.max_context_tokens
+        self.context = None if restart else context
+        turn = {
+            "turn": len(self.turns) + 1,
+            "reused_context": reused,
+            "prompt_eval_count": final.get("prompt_eval_count", 0),
+            "prompt_eval_ms": final.get("prompt_eval_duration", 0) / 1e6,
+            "eval_count": final.get("eval_count", 0),
+            "eval_ms": final.get("eval_duration", 0) / 1e6,
+            "ttft_s": stream.ttft,
+            "context_tokens": len(context or ()),
+            "restarted": restart,
+        }
+        self.turns.append(turn)
+        interaction_log.record_stream("session", user_text, stream, started, conversation=self.prefix_hash, turn=turn["turn"])
+        logger.info(
+            "turn %d: prompt_eval %d tokens in %.1f ms (%s, prefix %s, context %d)",
+            turn["turn"],
+            turn["prompt_eval_count"],
+            turn["prompt_eval_ms"],
+            "context reused" if reused else "full prompt",
+            self.prefix_hash,
+            turn["context_tokens"],
+        )
+
+    def stats(self) -> Dict:
+        """Turn count, per-turn stats, and prompt-eval totals for the first turn vs later turns."""
+        later = [t for t in self.turns if t["reused_context"]]
+        return {
+            "turns": len(self.turns),
+            "prefix_hash": self.prefix_hash,
+            "first_turn_prompt_eval_count": self.turns[0]["prompt_eval_count"] if self.turns else 0,
+            "mean_reused_prompt_eval_count": sum(t["prompt_eval_count"] for t in later) / len(later) if later else 0.0,
+            "mean_reused_prompt_eval_ms": sum(t["prompt_eval_ms"] for t in later) / len(later) if later else 0.0,
+            "per_turn": list(self.turns),
+        }
@@ -0,0 +1,305 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from configs.tools.core import tracing
+from configs.tools.core.ollama_client import TokenStream
+
+T = TypeVar("T")
+
+_LINE_ENDINGS = re.compile(r"\r\n?")
+
+logger = logging.getLogger("soothsayer.singleflight")
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Unifies line endings and trims the ends, so prompts differing only there share a flight.
+
+    Whitespace inside the text is kept: indentation in code changes its meaning.
+    """
+    return _LINE_ENDINGS.sub("\n", text).strip()
+
+
+def flight_key(*parts) -> str:
+    """Hex SHA-256 of the parts; strings are normalized with normalize_prompt first."""
+    h = hashlib.sha256()
+    for part in parts:
+        text = normalize_prompt(part) if isinstance(part, str) else repr(part)
+        h.update(text.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class _Call:
+    """One in-flight blocking call: followers wait on `done`."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class _SharedStream:
+    """
+    One in-flight TokenStream, replayed to every caller that joined it.
+
+    There is no pump thread: whichever view needs a piece nobody has read yet
+    pulls it from the source, under `_pump`. A view that stops reading (a
+    closed browser tab) therefore never stalls the others.
+
+    Views are counted (under the group's lock, so no caller can join a flight
+    being abandoned). When the last one is closed or collected before the
+    source ends, the source is closed, freeing its connection and the
+    generation, and the key is released. Views may be closed from another
+    thread while one of them is blocked reading the source.
+    """
+
+    def __init__(self, on_finish: Callable[[], None], lock: threading.RLock):
+        self.source: Optional[TokenStream] = None
+        self._iter = None
+        self._on_finish = on_finish
+        self._lock = lock
+        self._pump = threading.Lock()
+        self._parts: List[str] = []
+        self.ready = threading.Event()
+        self.finished = False
+        self.abandoned = False
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        # Views handed out or reserved; guarded by the group's lock.
+        self.views = 0
+
+    def attach(self, source: TokenStream) -> None:
+        self.source = source
+        self._iter = iter(source)
+        self.ready.set()
+
+    def fail(self, error: BaseException) -> None:
+        """The source could not be opened; every view raises `error`."""
+        self.error = error
+        self._finish()
+        self.ready.set()
+
+    def _pull(self, index: int) -> bool:
+        """Makes piece `index` available; False once the source has ended (or failed) before it."""
+        with self._pump:
+            while len(self._parts) <= index and not self.finished:
+                try:
+                    self._parts.append(next(self._iter))
+                except StopIteration:
+                    self._finish()
+                except BaseException as e:
+                    self.error = e
+                    self._finish()
+            return len(self._parts) > index
+
+    def _finish(self) -> None:
+        if self.finished:
+            return  # detach() already released an abandoned stream
+        self.finished = True
+        self._on_finish()
+
+    def detach(self) -> None:
+        """One view is done with the stream; the last one to leave early closes the source."""
+        with self._lock:
+            self.views -= 1
+            abandon = self.views == 0 and not self.finished
+            if abandon:
+                self.finished = self.abandoned = True
+        if not abandon:
+            return
+        # Closing the source first unblocks a reader holding `_pump` (TokenStream.close is thread-safe).
+        if self.source is not None:
+            self.source.close()
+        with self._pump:
+            if self._iter is not None:
+                self._iter.close()
+        logger.info("every reader left an unfinished stream; closed it")
+        self._on_finish()
+
+    def chunks(self):
+        index = 0
+        while True:
+            if index < len(self._parts) or self._pull(index):
+                yield {"response": self._parts[index], "done": False}
+                index += 1
+                continue
+            if self.error is not None:
+                raise self.error
+            if self.abandoned:
+                return
+            yield {**self.source.final, "response": "", "done": True}
+            return
+
+    def view(self, on_done: Optional[Callable[[TokenStream], None]] = None) -> TokenStream:
+        self.ready.wait()
+        if self.source is None:
+            raise self.error
+        view = TokenStream(_ViewChunks(self), self.source.model, time.perf_counter(), on_done=on_done)
+        # The source stream already traces the one real completion.
+        view.coalesced = True
+        return view
+
+
+class _ViewChunks:
+    """One view's chunk iterator; leaving it (end, error, close() or garbage collection) detaches the view once."""
+
+    def __init__(self, shared: _SharedStream):
+        self._shared = shared
+        self._chunks = shared.chunks()
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            try:
+                self._chunks.close()
+            except ValueError:
+                pass  # being read on another thread; detach() below stops the source under it
+            self._shared.detach()
+
+    def __del__(self):
+        self.close()
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent LLM calls onto one execution.
+
+    The first caller for a key (the leader) runs the call; callers that
+    arrive with the same key while it is in flight wait for it and get the
+    same result, the same exception, or a replay of the same token stream.
+    Once the call ends, the key is free again: later callers go through the
+    response cache or start a new call.
+
+    Args:
+        name (str): Label for logs and stats.
+    """
+
+    def __init__(self, name: str = "llm"):
+        self.name = name
+        # Re-entrant: a view collected while this thread holds the lock detaches under it.
+        self._lock = threading.RLock()
+        self._calls: Dict[str, _Call] = {}
+        self._streams: Dict[str, _SharedStream] = {}
+        self.leaders = 0
+        self.deduplicated = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Runs `fn()` once for all concurrent callers with the same key.
+
+        Returns:
+            The leader's result; its exception is raised in every caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                call.followers += 1
+                self.deduplicated += 1
+        if not leader:
+            with tracing.span("singleflight.wait", group=self.name):
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.followers:
+                logger.info("%s: %d identical call(s) served by one execution", self.name, call.followers)
+
+    def stream(
+        self,
+        key: str,
+        start: Callable[[], TokenStream],
+        on_done: Optional[Callable[[TokenStream], None]] = None,
+    ) -> TokenStream:
+        """
+        Returns a view of the in-flight stream for `key`, starting it with `start()` if there is none.
+
+        Every caller gets its own TokenStream carrying all pieces from the
+        first one on, with its own `ttft` and `text`. `start()`'s on_done (e.g.
+        the cache write) runs once, when the source ends; `on_done` here runs
+        for this caller's view.
+
+        Args:
+            key (str): From flight_key().
+            start (callable): Opens the source stream; called by the leader only.
+            on_done (callable, optional): Called with this caller's view at its end.
+        """
+        with self._lock:
+            shared = self._streams.get(key)
+            leader = shared is None
+            if leader:
+                shared = self._streams[key] = _SharedStream(on_finish=lambda: self._release(key, shared), lock=self._lock)
+                self.leaders += 1
+            else:
+                shared.followers += 1
+                self.deduplicated += 1
+            shared.views += 1
+        if leader:
+            # Followers arriving while the request is being sent wait in view() until it is attached.
+            try:
+                shared.attach(start())
+            except BaseException as e:
+                shared.fail(e)
+                raise
+        return shared.view(on_done)
+
+    def _release(self, key: str, shared: _SharedStream) -> None:
+        with self._lock:
+            if self._streams.get(key) is shared:
+                del self._streams[key]
+        if shared.followers:
+            logger.info("%s: %d identical stream(s) served by one generation", self.name, shared.followers)
+
+    def stats(self) -> Dict:
+        """Executions started, calls deduplicated onto one already in flight, and the share deduplicated."""
+        with self._lock:
+            total = self.leaders + self.deduplicated
+            return {
+                "executions": self.leaders,
+                "deduplicated": self.deduplicated,
+                "dedup_rate": self.deduplicated / total if total else 0.0,
+                "in_flight": len(self._calls) + len(self._streams),
+            }
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def flights(name: str = "llm") -> SingleFlight:
+    """The process-wide SingleFlight group for a name, so every runtime in the process coalesces together."""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+# Entry points return right before their first prompt / server launch when this is set.
+EXIT_AT_PROMPT_ENV = "SOOTHSAYER_EXIT_AT_PROMPT"
+
+
+def exit_at_prompt() -> bool:
+    """True when running under --profile-startup and the entry point should stop at its prompt."""
+    return bool(os.environ.get(EXIT_AT_PROMPT_ENV))
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, int, str]]:
+    """
+    Parses `python -X importtime` output.
+
+    Returns:
+        list: (self_us, cumulative_us, depth, module) rows in import order.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def profile_startup(argv: List[str], top: int = 15) -> None:
+    """
+    Re-runs an entry point under `-X importtime` up to its first prompt and prints
+    the wall time plus the slowest top-level imports.
+
+    Args:
+        argv (list): Arguments after the interpreter, e.g. ["main.py"] or ["-m", "gradio_ui.app"].
+        top (int): Number of top-level imports to list.
+    """
+    env = dict(os.environ, **{EXIT_AT_PROMPT_ENV: "1"})
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    rows = parse_importtime(proc.stderr)
+    top_level = sorted((r for r in rows if r[2] == 0), key=lambda r: r[1], reverse=True)
+    total_us = sum(r[1] for r in top_level)
+
+    print(f"[⏱️ ] Time to first prompt: {wall * 1e3:.0f} ms (imports: {total_us / 1e3:.0f} ms, {len(rows)} modules)")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for self_us, cumulative_us, _depth, name in top_level[:top]:
+        print(f"{cumulative_us / 1e3:>14.1f} {self_us / 1e3:>9.1f}  {name}")
+    if proc.returncode:
+        print(f"[❌] Entry point exited with {proc.returncode}:")
+        print("\n".join(l for l in proc.stderr.splitlines() if not l.startswith("import time:"))[-2000:])
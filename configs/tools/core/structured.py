@@ -0,0 +1,308 @@
+import json
+import logging
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from configs.tools.core import interaction_log, tracing
+from configs.tools.core.llm_cache import LLMCache, make_cache_key
+from configs.tools.core.ollama_client import OllamaClient, OllamaError
+from configs.tools.core.session import DEFAULT_KEEP_ALIVE
+
+# The nine dev_doc keys, in template order.
+DEV_DOC_KEYS = ("function_name", "language", "code", "explanation", "example", "complexity", "insight", "limitations", "tags")
+
+# Per-field JSON schema. Ollama enforces types and required keys while decoding;
+# minLength / maxLength / pattern are checked here, field by field, as values complete.
+FIELD_SCHEMAS = {
+    "function_name": {"type": "string", "pattern": r"^[A-Za-z_][A-Za-z0-9_.]*$", "maxLength": 120},
+    "language": {"type": "string", "pattern": r"^[A-Za-z][A-Za-z0-9+#. -]*$", "maxLength": 40},
+    "code": {"type": "string", "minLength": 1, "maxLength": 20000},
+    "explanation": {"type": "string", "minLength": 20, "maxLength": 8000},
+    "example": {"type": "string", "minLength": 1, "maxLength": 8000},
+    "complexity": {"type": "string", "minLength": 1, "maxLength": 400},
+    "insight": {"type": "string", "minLength": 20, "maxLength": 8000},
+    "limitations": {"type": "string", "minLength": 10, "maxLength": 8000},
+    "tags": {"type": "string", "minLength": 1, "maxLength": 400},
+}
+
+_PATTERNS = {key: re.compile(rules["pattern"]) for key, rules in FIELD_SCHEMAS.items() if "pattern" in rules}
+
+logger = logging.getLogger("soothsayer.structured")
+
+
+def dev_doc_schema(keys: Iterable[str] = DEV_DOC_KEYS) -> Dict:
+    """JSON schema for an object holding `keys`, all required; pass it as Ollama's `format`."""
+    keys = list(keys)
+    return {
+        "type": "object",
+        "properties": {key: FIELD_SCHEMAS[key] for key in keys},
+        "required": keys,
+        "additionalProperties": False,
+    }
+
+
+def validate_field(key: str, value) -> Optional[str]:
+    """
+    Checks one field against FIELD_SCHEMAS.
+
+    Returns:
+        str: What is wrong with the value, or None when it is valid.
+    """
+    rules = FIELD_SCHEMAS.get(key)
+    if rules is None:
+        return "unexpected key"
+    if not isinstance(value, str):
+        return f"must be a string, got {type(value).__name__}"
+    text = value.strip()
+    if len(text) < rules.get("minLength", 1):
+        return f"too short ({len(text)} characters, need at least {rules.get('minLength', 1)})"
+    if len(text) > rules.get("maxLength", len(text)):
+        return f"too long ({len(text)} characters, limit {rules['maxLength']})"
+    if key in _PATTERNS and not _PATTERNS[key].match(text):
+        return f"does not match {rules['pattern']}"
+    return None
+
+
+_INCOMPLETE = object()
+
+
+class IncrementalObjectParser:
+    """
+    Parses a streamed top-level JSON object, yielding each member as soon as its value is complete.
+
+    Feed it text pieces as they arrive. A member whose value is cut off or
+    malformed is never yielded; everything before it still is, so a broken
+    stream loses only the fields it did not finish.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._stalled = False
+        self.done = False
+
+    def feed(self, text: str) -> List[Tuple[str, object]]:
+        """Adds text and returns the (key, value) members completed by it."""
+        self._buf += text
+        # A pending string, object or array can only complete once one of these arrives.
+        if self._stalled and not any(c in text for c in '"}],'):
+            return []
+        members = []
+        buf = self._buf
+        while not self.done:
+            while self._pos < len(buf) and buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos >= len(buf):
+                break
+            ch = buf[self._pos]
+            if self._state == "start":
+                if ch != "{":
+                    raise ValueError(f"expected a JSON object, got {ch!r}")
+                self._pos += 1
+                self._state = "key"
+            elif self._state == "key":
+                if ch == ",":
+                    self._pos += 1
+                    continue
+                if ch == "}":
+                    self._pos += 1
+                    self.done = True
+                    break
+                key = self._decode()
+                if key is _INCOMPLETE:
+                    break
+                if not isinstance(key, str):
+                    raise ValueError("object keys must be strings")
+                self._key = key
+                self._state = "colon"
+            elif self._state == "colon":
+                if ch != ":":
+                    raise ValueError(f"expected ':' after {self._key!r}, got {ch!r}")
+                self._pos += 1
+                self._state = "value"
+            else:
+                value = self._decode()
+                if value is _INCOMPLETE:
+                    break
+                members.append((self._key, value))
+                self._state = "key"
+        if self._pos > 65536:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        return members
+
+    def _decode(self):
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            self._stalled = True
+            return _INCOMPLETE
+        if not isinstance(value, (str, dict, list)) and (end == len(self._buf) or self._buf[end] not in " \t\r\n,}]"):
+            # A number is only complete once a delimiter follows ("12" may become "12.5").
+            self._stalled = True
+            return _INCOMPLETE
+        self._stalled = False
+        self._pos = end
+        return value
+
+
+def _stream_fields(
+    client: OllamaClient,
+    model: str,
+    prompt: str,
+    system: str,
+    keys: List[str],
+    options: Optional[Dict],
+    keep_alive: str,
+) -> Tuple[Dict[str, str], Dict[str, str], Dict]:
+    """
+    One constrained generation for `keys`; returns (valid fields, errors by key, Ollama's final chunk).
+
+    A stream that fails partway (stall, error chunk, dropped connection) keeps
+    the fields it completed; the rest are reported as cut off.
+    """
+    parser = IncrementalObjectParser()
+    fields: Dict[str, str] = {}
+    errors: Dict[str, str] = {}
+    wanted = set(keys)
+    stream = client.stream(
+        model, prompt, system=system, options=options, format=dev_doc_schema(keys), keep_alive=keep_alive
+    )
+    try:
+        for piece in stream:
+            for key, value in parser.feed(piece):
+                if key not in wanted:
+                    continue
+                problem = validate_field(key, value)
+                if problem:
+                    errors[key] = problem
+                else:
+                    fields[key] = value.strip() if key not in ("code", "example") else value
+                    errors.pop(key, None)
+    except OllamaError as e:
+        logger.warning("structured stream failed (%s); keeping %d complete fields", e, len(fields))
+    except ValueError as e:
+        logger.warning("structured output is not a JSON object (%s); keeping %d complete fields", e, len(fields))
+    for key in keys:
+        if key not in fields and key not in errors:
+            errors[key] = "missing" if parser.done else "cut off before it was complete"
+    return fields, errors, stream.final
+
+
+def _repair_prompt(request: str, fields: Dict[str, str], errors: Dict[str, str]) -> str:
+    problems = "\n".join(f"- {key}: {problem}" for key, problem in errors.items())
+    return (
+        f"{request}\n\nThese fields are already final:\n{json.dumps(fields, ensure_ascii=False, indent=2)}\n\n"
+        f"Rewrite only these fields, which were rejected:\n{problems}\n\n"
+        "Return a JSON object with exactly those keys."
+    )
+
+
+def generate_dev_doc(
+    client: OllamaClient,
+    model: str,
+    system_prompt: str,
+    request: str,
+    options: Optional[Dict] = None,
+    max_repairs: int = 2,
+    keep_alive: str = DEFAULT_KEEP_ALIVE,
+    cache: Optional[LLMCache] = None,
+    escalate_model: Optional[str] = None,
+    keys: Sequence[str] = DEV_DOC_KEYS,
+) -> Dict:
+    """
+    Generates a dev_doc as schema-constrained JSON, re-asking only for the fields that fail validation.
+
+    The first call asks for all of `keys` under Ollama's `format` schema. Fields
+    are parsed and validated as they stream in. Each repair call then asks only
+    for the keys still missing or invalid, with the accepted fields as context,
+    up to `max_repairs` times. If fields are still rejected after that and
+    `escalate_model` is set, that model gets one more repair call for them.
+
+    Args:
+        client (OllamaClient): Pooled client.
+        model (str): Model name.
+        system_prompt (str): Carries the original doc.
+        request (str): What to do with it.
+        options (dict, optional): Ollama options.
+        max_repairs (int): Follow-up calls allowed for rejected fields.
+        keep_alive (str): Ollama keep_alive duration.
+        cache (LLMCache, optional): A fully valid result is stored and reused.
+        escalate_model (str, optional): Larger model for fields `model` could not fix.
+        keys (sequence): The fields to generate; defaults to all nine, and a
+            subset regenerates just those sections.
+
+    Returns:
+        dict: `doc` (accepted fields), `errors` (key -> problem for fields still
+        rejected), `valid`, `generations`, `repaired` (keys fixed by a repair
+        call), `escalated` (keys fixed by the escalation model), `eval_tokens`,
+        `seconds`, and `by_model` (model -> generations, rejected (calls that
+        left fields invalid), escalated (calls whose rejections went to
+        `escalate_model`), seconds, prompt_tokens, eval_tokens).
+    """
+    started = time.perf_counter()
+    keys = [k for k in DEV_DOC_KEYS if k in keys]
+    kind = "json:dev_doc" if len(keys) == len(DEV_DOC_KEYS) else "json:" + ",".join(keys)
+    key = make_cache_key(system_prompt, request, model, (options or {}).get("temperature"), kind)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            doc = json.loads(cached)
+            return {"doc": doc, "errors": {}, "valid": True, "generations": 0, "repaired": [], "escalated": [],
+                    "eval_tokens": 0, "seconds": time.perf_counter() - started, "by_model": {}}
+
+    by_model: Dict[str, Dict] = {}
+
+    def generate(name: str, prompt: str, keys: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        call_started = time.perf_counter()
+        fields, errors, final = _stream_fields(client, name, prompt, system_prompt, keys, options, keep_alive)
+        usage = by_model.setdefault(
+            name, {"generations": 0, "rejected": 0, "escalated": 0, "seconds": 0.0, "prompt_tokens": 0, "eval_tokens": 0}
+        )
+        usage["generations"] += 1
+        usage["rejected"] += int(bool(errors))
+        usage["seconds"] += time.perf_counter() - call_started
+        usage["prompt_tokens"] += final.get("prompt_eval_count", 0)
+        usage["eval_tokens"] += final.get("eval_count", 0)
+        return fields, errors
+
+    with tracing.span("structured.generate", model=model, fields=len(keys)) as span:
+        doc, errors = generate(model, request, keys)
+        generations, repaired, escalated = 1, [], []
+        while errors and generations <= max_repairs:
+            logger.info("re-asking %d rejected fields: %s", len(errors), ", ".join(f"{k} ({v})" for k, v in errors.items()))
+            fixed, errors = generate(model, _repair_prompt(request, doc, errors), list(errors))
+            doc.update(fixed)
+            repaired.extend(fixed)
+            generations += 1
+        if errors and escalate_model and escalate_model != model:
+            logger.info("escalating %d rejected fields to %s", len(errors), escalate_model)
+            by_model[model]["escalated"] += 1
+            fixed, errors = generate(escalate_model, _repair_prompt(request, doc, errors), list(errors))
+            doc.update(fixed)
+            escalated.extend(fixed)
+            generations += 1
+        span.set(generations=generations, repaired=len(repaired), escalated=len(escalated), rejected=len(errors))
+
+    doc = {k: doc[k] for k in keys if k in doc}
+    if not errors and cache is not None:
+        cache.put(key, json.dumps(doc, ensure_ascii=False))
+    interaction_log.record_interaction(
+        "structured", request, json.dumps(doc, ensure_ascii=False), time.perf_counter() - started,
+        model=model, generations=generations, rejected=len(errors) or None, escalated=len(escalated) or None,
+    )
+    return {
+        "doc": doc,
+        "errors": errors,
+        "valid": not errors,
+        "generations": generations,
+        "repaired": repaired,
+        "escalated": escalated,
+        "eval_tokens": sum(usage["eval_tokens"] for usage in by_model.values()),
+        "seconds": time.perf_counter() - started,
+        "by_model": by_model,
+    }
@@ -0,0 +1,344 @@
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Set SOOTHSAYER_TRACE=1 (default file) or SOOTHSAYER_TRACE=<path> to record spans.
+TRACE_ENV_VAR = "SOOTHSAYER_TRACE"
+DEFAULT_TRACE_PATH = ".cache/traces.jsonl"
+
+# The writer thread drains at most this many spans per write.
+MAX_BATCH = 1024
+
+
+class _NullSpan:
+    """Returned by span() while tracing is off: entering and leaving it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+_current: contextvars.ContextVar = contextvars.ContextVar("soothsayer_span", default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    """
+    One timed stage. Use via `span()`; nesting follows the caller's context.
+
+    Attributes given to span() or set() are written with the span; keep them
+    small (counts, flags, names), not payloads.
+    """
+
+    __slots__ = ("name", "attrs", "span_id", "parent_id", "trace_id", "_started", "_wall", "_previous")
+
+    def __init__(self, name: str, attrs: Dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        self.span_id = f"{os.getpid():x}.{next(_ids):x}"
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self._previous = parent
+        _current.set(self)
+        self._wall = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ms = (time.perf_counter() - self._started) * 1e3
+        # set() rather than reset(): a generator may finish in another context (e.g. a Gradio worker thread).
+        _current.set(self._previous)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _emit(self.name, self._wall, ms, self.trace_id, self.span_id, self.parent_id, self.attrs)
+        return False
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+class JsonlSink:
+    """
+    Appends span records to a JSONL file from a background thread.
+
+    Callers only enqueue a dict; serialization and file writes happen on the
+    writer thread, in batches. close() drains whatever is queued.
+
+    Args:
+        path (str): JSONL file, created with its parent folder if missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def emit(self, record: Dict) -> None:
+        if self._thread is None:
+            self._start()
+        self._queue.put(record)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="soothsayer-trace", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+            # Pool workers leave through os._exit, which skips atexit; multiprocessing's finalizers still run.
+            import multiprocessing.util
+
+            multiprocessing.util.Finalize(None, self.close, exitpriority=100)
+
+    def _run(self) -> None:
+        # Queue items are span dicts, threading.Events (flush barriers) or None (stop).
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < MAX_BATCH and isinstance(batch[-1], dict):
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                lines = []
+                for r in batch:
+                    if isinstance(r, dict):
+                        r["ms"] = round(r["ms"], 3)
+                        lines.append(json.dumps(r, ensure_ascii=False, separators=(",", ":")))
+                if lines:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+                if batch[-1] is None:
+                    return
+                if isinstance(batch[-1], threading.Event):
+                    batch[-1].set()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Blocks until every span queued so far is in the file."""
+        if self._thread is None or self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Writes out every queued span and stops the writer thread."""
+        with self._lock:
+            if self._closed or self._thread is None:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+_sink: Optional[JsonlSink] = None
+
+
+def trace_path() -> str:
+    """The file SOOTHSAYER_TRACE names, or DEFAULT_TRACE_PATH when it is just a switch."""
+    env = os.environ.get(TRACE_ENV_VAR, "")
+    return env if env not in ("", "0", "1") else DEFAULT_TRACE_PATH
+
+
+def configure(path: Optional[str] = None, enabled: Optional[bool] = None) -> None:
+    """
+    Turns tracing on or off for this process.
+
+    Args:
+        path (str, optional): JSONL file. Defaults to SOOTHSAYER_TRACE when it
+            holds a path, else DEFAULT_TRACE_PATH.
+        enabled (bool, optional): Defaults to on when SOOTHSAYER_TRACE is set.
+    """
+    global _sink
+    if enabled is None:
+        enabled = os.environ.get(TRACE_ENV_VAR, "0") != "0"
+    if _sink is not None:
+        _sink.close()
+    _sink = JsonlSink(path or trace_path()) if enabled else None
+
+
+def _after_fork() -> None:
+    # The writer thread does not survive fork; the child gets its own sink on first use.
+    global _sink, _ids
+    if _sink is not None:
+        _sink = JsonlSink(_sink.path)
+    _ids = itertools.count(1)
+
+
+os.register_at_fork(after_in_child=_after_fork)
+configure()
+
+
+def enabled() -> bool:
+    return _sink is not None
+
+
+def _emit(name, wall, ms, trace_id, span_id, parent_id, attrs) -> None:
+    sink = _sink
+    if sink is None:
+        return
+    record = {"ts": wall, "name": name, "ms": ms, "trace": trace_id, "span": span_id, "pid": os.getpid()}
+    if parent_id:
+        record["parent"] = parent_id
+    if attrs:
+        record["attrs"] = attrs
+    sink.emit(record)
+
+
+def span(name: str, **attrs):
+    """
+    Times a `with` block as one stage.
+
+    Costs one global lookup while tracing is off.
+
+    Args:
+        name (str): Stage name, dotted by area, e.g. "md.parse" or "llm.generate".
+        **attrs: Small values stored with the span.
+    """
+    if _sink is None:
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def record(name: str, seconds: float, **attrs) -> None:
+    """
+    Records a stage that was timed elsewhere, e.g. Ollama's own prompt_eval_duration.
+
+    The span is attached to the current span, if any, and ends now.
+    """
+    if _sink is None:
+        return
+    parent = _current.get()
+    span_id = f"{os.getpid():x}.{next(_ids):x}"
+    _emit(
+        name,
+        time.time() - seconds,
+        seconds * 1e3,
+        parent.trace_id if parent else span_id,
+        span_id,
+        parent.span_id if parent else None,
+        attrs,
+    )
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of span(); the check for tracing happens per call."""
+
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _sink is None:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def flush() -> None:
+    """Writes out queued spans now; tracing stays on."""
+    if _sink is not None:
+        _sink.flush()
+
+
+# === Report ===
+def _iter_spans(path: str, since: Optional[float] = None) -> Iterator[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:  # a line cut short by a crash
+                continue
+            if since is None or item.get("ts", 0) >= since:
+                yield item
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(path: str = DEFAULT_TRACE_PATH, since: Optional[float] = None, prefix: str = "") -> List[Dict]:
+    """
+    Aggregates a trace file into per-stage latency percentiles.
+
+    Args:
+        path (str): JSONL trace file.
+        since (float, optional): Only spans that started at or after this Unix time.
+        prefix (str): Only stages whose name starts with this.
+
+    Returns:
+        list: One dict per stage (name, count, p50, p95, p99, mean, max and total, in ms),
+        sorted by total time, largest first.
+    """
+    by_name: Dict[str, List[float]] = {}
+    for item in _iter_spans(path, since):
+        if item["name"].startswith(prefix):
+            by_name.setdefault(item["name"], []).append(item["ms"])
+    rows = []
+    for name, samples in by_name.items():
+        samples.sort()
+        total = sum(samples)
+        rows.append({
+            "name": name,
+            "count": len(samples),
+            "p50": _percentile(samples, 50),
+            "p95": _percentile(samples, 95),
+            "p99": _percentile(samples, 99),
+            "mean": total / len(samples),
+            "max": samples[-1],
+            "total": total,
+        })
+    rows.sort(key=lambda row: row["total"], reverse=True)
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-stage latency report from a Soothsayer trace file.")
+    parser.add_argument("path", nargs="?", default=trace_path(), help="Trace file (default: SOOTHSAYER_TRACE or .cache/traces.jsonl)")
+    parser.add_argument("--since", type=float, default=None, help="Only spans from the last N minutes")
+    parser.add_argument("--stage", default="", help="Only stages starting with this prefix, e.g. llm.")
+    parser.add_argument("--json", action="store_true", help="Print the rows as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"[❌] No trace file at {args.path}. Run with SOOTHSAYER_TRACE=1 (or --trace) first.")
+        raise SystemExit(1)
+    since = time.time() - args.since * 60 if args.since is not None else None
+    rows = summarize(args.path, since, args.stage)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"{'stage':<22} {'count':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10} {'total s':>9}")
+        for row in rows:
+            print(
+                f"{row['name']:<22} {row['count']:>7} {row['p50']:>10.2f} {row['p95']:>10.2f} {row['p99']:>10.2f}"
+                f" {row['max']:>10.2f} {row['total'] / 1e3:>9.2f}"
+            )
+        grand = sum(row["count"] for row in rows)
+        print(f"[📊] {grand} spans across {len(rows)} stages from {args.path}")
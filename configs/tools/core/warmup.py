@@ -0,0 +1,160 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from configs.tools.core import tracing
+from configs.tools.core.agent_config import load_agent_config
+from configs.tools.core.ollama_client import OllamaClient, ollama_model_name
+
+# Set SOOTHSAYER_NO_WARMUP=1 to skip the startup preload in every entry point.
+NO_WARMUP_ENV_VAR = "SOOTHSAYER_NO_WARMUP"
+
+STATES = ("cold", "warming", "ready", "failed")
+
+logger = logging.getLogger("soothsayer.warmup")
+
+
+def warmup_settings(config: Optional[Dict] = None) -> Dict:
+    """
+    The agent config's `warmup` block, with defaults filled in.
+
+    SOOTHSAYER_KEEP_ALIVE, when set, wins over the config's keep_alive, and
+    SOOTHSAYER_NO_WARMUP=1 turns the preload off.
+
+    Returns:
+        dict: enabled, keep_alive and heartbeat_s.
+    """
+    config = config if config is not None else load_agent_config()
+    block = config.get("warmup") or {}
+    try:
+        heartbeat_s = float(block.get("heartbeat_s") or 0.0)
+    except (TypeError, ValueError):
+        logger.warning("warmup.heartbeat_s=%r is not a number; heartbeat off", block.get("heartbeat_s"))
+        heartbeat_s = 0.0
+    return {
+        "enabled": bool(block.get("enabled", True)) and not os.environ.get(NO_WARMUP_ENV_VAR),
+        "keep_alive": os.environ.get("SOOTHSAYER_KEEP_ALIVE") or str(block.get("keep_alive") or "30m"),
+        "heartbeat_s": max(0.0, heartbeat_s),
+    }
+
+
+class ModelWarmer:
+    """
+    Loads a model into Ollama in the background and keeps it resident.
+
+    start() returns at once; a daemon thread sends an empty-prompt generate
+    (which makes Ollama load the weights and nothing else) with the same
+    options and keep_alive as real requests, so the first real request finds
+    the model loaded. With `heartbeat_s`, the thread repeats that every
+    heartbeat_s seconds, so an idle gap longer than keep_alive does not unload
+    the model; a failed ping marks the backend "failed" until one succeeds.
+
+    State goes cold → warming → ready, or failed (with `error`). Requests
+    are not blocked while warming; Ollama queues them behind the load.
+
+    Args:
+        client (OllamaClient): Pooled client shared with the runtime.
+        model (str): Model name, with or without the `ollama/` prefix.
+        keep_alive (str): Ollama keep_alive, e.g. "30m"; "-1" keeps the model loaded.
+        options (dict, optional): The runtime's Ollama options. A different
+            num_ctx would make the first real request reload the model.
+        heartbeat_s (float): Seconds between keep-resident pings; 0 disables them.
+    """
+
+    def __init__(
+        self,
+        client: OllamaClient,
+        model: str,
+        keep_alive: str = "30m",
+        options: Optional[Dict] = None,
+        heartbeat_s: float = 0.0,
+    ):
+        self.client = client
+        self.model = model
+        self.keep_alive = keep_alive
+        self.options = dict(options or {})
+        self.heartbeat_s = heartbeat_s
+        self.state = "cold"
+        self.error: Optional[str] = None
+        self.warm_s: Optional[float] = None
+        self.load_s: Optional[float] = None
+        self.last_ping: Optional[float] = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> "ModelWarmer":
+        """Starts the background preload (once); returns self."""
+        with self._lock:
+            if self._thread is None:
+                self.state = "warming"
+                self._thread = threading.Thread(target=self._run, name="soothsayer-warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def _ping(self) -> float:
+        """One load-only request; returns the seconds Ollama spent loading weights."""
+        data = self.client.generate(self.model, "", options=self.options or None, keep_alive=self.keep_alive)
+        self.last_ping = time.time()
+        return data.get("load_duration", 0) / 1e9
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            with tracing.span("backend.warmup", model=ollama_model_name(self.model)) as span:
+                self.load_s = self._ping()
+                self.warm_s = time.perf_counter() - started
+                span.set(load_s=round(self.load_s, 3))
+            self.state = "ready"
+            logger.info("%s warm after %.2fs (load %.2fs, keep_alive %s)", self.model, self.warm_s, self.load_s, self.keep_alive)
+        except Exception as e:
+            self.state, self.error = "failed", f"{type(e).__name__}: {e}"
+            logger.warning("warm-up of %s failed: %s", self.model, self.error)
+        finally:
+            self._ready.set()
+        while self.heartbeat_s and not self._stop.wait(self.heartbeat_s):
+            try:
+                reloaded_s = self._ping()
+                if reloaded_s > 0.5:
+                    logger.info("%s had been unloaded; reloaded in %.2fs", self.model, reloaded_s)
+                self.state, self.error = "ready", None
+            except Exception as e:
+                self.state, self.error = "failed", f"{type(e).__name__}: {e}"
+                logger.warning("keep-alive ping for %s failed: %s", self.model, self.error)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the first warm-up attempt ends; True if the model is ready."""
+        self._ready.wait(timeout)
+        return self.state == "ready"
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def resident(self) -> Optional[bool]:
+        """Whether Ollama reports the model loaded (/api/ps); None when the server cannot say."""
+        name = ollama_model_name(self.model)
+        try:
+            loaded = self.client.loaded_models()
+        except Exception:
+            return None
+        return any(m.get("name") in (name, f"{name}:latest") or m.get("model") == name for m in loaded)
+
+    def status(self) -> Dict:
+        """State, error, warm-up and load seconds, and the last successful ping, for health endpoints."""
+        return {
+            "state": self.state,
+            "model": ollama_model_name(self.model),
+            "keep_alive": self.keep_alive,
+            "warm_s": round(self.warm_s, 3) if self.warm_s is not None else None,
+            "load_s": round(self.load_s, 3) if self.load_s is not None else None,
+            "last_ping": self.last_ping,
+            "error": self.error,
+        }
+
+    def stop(self) -> None:
+        """Ends the heartbeat; the model stays loaded until its keep_alive runs out."""
+        self._stop.set()
@@ -0,0 +1,313 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from configs.tools.core import tracing
+from configs.tools.core.agent_config import AGENT_CONFIG_PATH, load_agent_config
+from configs.tools.parse_md_function import (
+    BODY_RE,
+    LAZY_THRESHOLD_BYTES,
+    META_KEYS,
+    SECTION_TITLES,
+    heading_pattern,
+    parse_frontmatter,
+    parse_sections,
+)
+from configs.tools.template_renderer import atomic_write_text, compile_template
+from configs.tools.write_md_function import REPO_ROOT, dev_doc_template_path, dev_doc_values, write_dev_doc_markdown
+
+DEFAULT_MODE = "dev_doc"
+
+# Frontmatter is read from at most this much of a large file to pick its parser.
+PEEK_BYTES = 64 * 1024
+
+logger = logging.getLogger("soothsayer.schemas")
+
+
+class DocSchema:
+    """
+    One document kind: its frontmatter keys, `###` sections and Markdown template.
+
+    The heading pattern is compiled on first use and kept for the life of the
+    process; the template is compiled (and re-read only when it changes) by
+    template_renderer.compile_template.
+
+    Args:
+        mode (str): The frontmatter `mode` value that selects this schema.
+        meta_keys (tuple): Frontmatter keys copied into the parsed dict, in order.
+        sections (dict): Key -> section title (`### <title>:`), in document order.
+        name_key (str): Key that names a document (output file names, index hits).
+        timestamp_key (str): Frontmatter key the template's `timestamp` fills.
+        template_file (str): Template used when the agent config names none.
+        defaults (dict, optional): Values for missing frontmatter keys.
+        labels (dict, optional): Prompt labels for frontmatter keys; unlabeled keys are left out of outline().
+        index_fields (tuple): Fields the retrieval index stores.
+        values (callable, optional): Replaces the generic placeholder mapping.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        meta_keys: Tuple[str, ...],
+        sections: Mapping[str, str],
+        name_key: str,
+        timestamp_key: str,
+        template_file: str,
+        defaults: Optional[Mapping[str, str]] = None,
+        labels: Optional[Mapping[str, str]] = None,
+        index_fields: Tuple[str, ...] = (),
+        values: Optional[Callable[[Mapping, Optional[str]], Dict[str, str]]] = None,
+    ):
+        self.mode = mode
+        self.meta_keys = tuple(meta_keys)
+        self.sections = dict(sections)
+        self.name_key = name_key
+        self.timestamp_key = timestamp_key
+        self.template_file = template_file
+        self.defaults = dict(defaults or {})
+        self.labels = dict(labels or {})
+        self.index_fields = tuple(index_fields)
+        self._values = values
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        """Every key a parse of this schema returns, in order."""
+        return self.meta_keys + tuple(self.sections)
+
+    @cached_property
+    def heading_re(self):
+        return heading_pattern(self.sections.values())
+
+    @cached_property
+    def key_by_title(self) -> Dict[str, str]:
+        return {title: key for key, title in self.sections.items()}
+
+    def parse(self, content: str, meta: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+        """
+        Parses Markdown text of this kind in a single scan over its `###` headings.
+
+        Args:
+            content (str): Full Markdown document text.
+            meta (dict, optional): Its frontmatter, when the caller already parsed it.
+        """
+        meta = parse_frontmatter(content) if meta is None else meta
+        return parse_sections(content, meta, self.meta_keys, self.heading_re, self.key_by_title)
+
+    def name_of(self, doc: Mapping[str, str]) -> str:
+        return doc.get(self.name_key) or self.defaults.get(self.name_key, "")
+
+    def outline(self, doc: Mapping[str, str]) -> str:
+        """`label: value` lines for the labeled frontmatter keys and every section, for prompts."""
+        lines = [f"{label}: {doc.get(key) or self.defaults.get(key, '')}" for key, label in self.labels.items()]
+        lines += [f"{title}: {doc.get(key, '')}" for key, title in self.sections.items()]
+        return "\n".join(lines)
+
+    def headings(self) -> str:
+        """The section headings in order, e.g. for a writer's instructions."""
+        return ", ".join(f"### {title}:" for title in self.sections.values())
+
+    def values(self, data: Mapping, now: Optional[str] = None) -> Dict[str, str]:
+        """
+        Maps a parsed/generated doc onto this schema's template placeholders.
+
+        Returns:
+            dict: Stripped section values, frontmatter values (defaults filled in) and `timestamp`.
+        """
+        if self._values is not None:
+            return self._values(data, now)
+        values = {key: (data.get(key) or "").strip() for key in self.sections}
+        for key in self.meta_keys:
+            if key not in ("mode", self.timestamp_key):
+                values[key] = data.get(key) or self.defaults.get(key, "")
+        values["timestamp"] = data.get(self.timestamp_key) or now or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return values
+
+    def template_path(self) -> str:
+        return _template_path(self.mode)
+
+    def write(self, data: Mapping, output_path: str, verbose: bool = True) -> None:
+        """Renders `data` with this schema's template and writes it atomically."""
+        if self.mode == DEFAULT_MODE:
+            write_dev_doc_markdown(data, output_path, verbose=verbose)
+            return
+        with tracing.span("md.render", mode=self.mode) as span:
+            template = compile_template(self.template_path())
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            span.set(bytes=atomic_write_text(output_path, template.render(self.values(data))))
+        if verbose:
+            print(f"[✅] Markdown written to: {output_path}")
+
+
+# === The registry: one schema per frontmatter `mode` ===
+SCHEMAS: Dict[str, DocSchema] = {
+    schema.mode: schema
+    for schema in (
+        DocSchema(
+            "dev_doc",
+            META_KEYS,
+            SECTION_TITLES,
+            name_key="function_name",
+            timestamp_key="created_at",
+            template_file="templates/markdown_format.md",
+            defaults={"function_name": "unknown_function", "language": "python"},
+            labels={"function_name": "Function Name", "language": "Language"},
+            index_fields=("function_name", "tags", "explanation", "code"),
+            values=dev_doc_values,
+        ),
+        DocSchema(
+            "user_doc",
+            ("title", "mode", "audience", "last_updated"),
+            {
+                "overview": "📎 Overview",
+                "why_it_matters": "📌 Why It Matters",
+                "prerequisites": "🧠 Prerequisites",
+                "instructions": "🔧 Tasks/Instructions",
+                "tips": "💡 Tips",
+                "troubleshooting": "🧯 Troubleshooting",
+                "resources": "📚 Resources",
+            },
+            name_key="title",
+            timestamp_key="last_updated",
+            template_file="templates/user_doc_format.md",
+            defaults={"title": "Untitled", "audience": "everyone"},
+            labels={"title": "📘 Title", "audience": "👥 Audience", "last_updated": "📅 Last Updated"},
+            index_fields=("title", "overview", "instructions", "troubleshooting"),
+        ),
+        DocSchema(
+            "comms",
+            ("title", "mode", "audience", "created_at"),
+            {
+                "summary": "📣 Summary",
+                "changes": "🔄 What's Changing",
+                "why_it_matters": "📌 Why It Matters",
+                "impact": "👥 Who's Affected",
+                "actions": "✅ What To Do",
+                "timeline": "📅 Timeline",
+                "contacts": "📬 Questions",
+            },
+            name_key="title",
+            timestamp_key="created_at",
+            template_file="templates/comms_format.md",
+            defaults={"title": "Untitled", "audience": "everyone"},
+            labels={"title": "📘 Title", "audience": "👥 Audience", "created_at": "📅 Date"},
+            index_fields=("title", "summary", "changes", "actions"),
+        ),
+    )
+}
+
+# Every key any schema returns, for field projection (see parse_cache.parse_many).
+ALL_KEYS = tuple(dict.fromkeys(key for schema in SCHEMAS.values() for key in schema.keys))
+
+# Changes whenever a schema or the shared section patterns do, so cached parses are never stale.
+SCHEMA_VERSION = hashlib.sha256(
+    json.dumps(
+        [[s.mode, s.meta_keys, s.sections] for s in SCHEMAS.values()] + [heading_pattern(["T"]).pattern, BODY_RE.pattern],
+        ensure_ascii=False,
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+_warned = set()
+
+
+def schema_for(mode: Optional[str]) -> DocSchema:
+    """
+    The schema for a frontmatter `mode`; dev_doc when there is none.
+
+    An unknown mode falls back to dev_doc, with one warning per mode.
+    """
+    if not mode:
+        return SCHEMAS[DEFAULT_MODE]
+    schema = SCHEMAS.get(mode.strip())
+    if schema is None:
+        if mode not in _warned:
+            _warned.add(mode)
+            logger.warning("unknown doc mode %r; parsing as %s (known: %s)", mode, DEFAULT_MODE, ", ".join(SCHEMAS))
+        return SCHEMAS[DEFAULT_MODE]
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _template_path(mode: str, config_path: Path = AGENT_CONFIG_PATH) -> str:
+    """
+    Resolves a mode's template from the agent config's `output_format.templates.<mode>`.
+
+    dev_doc keeps using `output_format.template_file`. Falls back to the
+    schema's own template when the config, the key or the file is missing.
+    """
+    if mode == DEFAULT_MODE:
+        return dev_doc_template_path(config_path)
+    output_format = load_agent_config(config_path).get("output_format")
+    templates = output_format.get("templates") if isinstance(output_format, dict) else None
+    template_file = templates.get(mode) if isinstance(templates, dict) else None
+    if template_file:
+        candidate = Path(template_file)
+        candidate = candidate if candidate.is_absolute() else REPO_ROOT / candidate
+        if candidate.is_file():
+            return str(candidate)
+    return str(REPO_ROOT / SCHEMAS[mode].template_file)
+
+
+# === Entry points: the document's own `mode` picks the parser and the writer ===
+def parse_doc_text(content: str) -> Dict[str, str]:
+    """
+    Parses Markdown text with the schema its frontmatter `mode` names.
+
+    Returns:
+        dict: That schema's keys; see SCHEMAS.
+    """
+    meta = parse_frontmatter(content)
+    return schema_for(meta.get("mode")).parse(content, meta)
+
+
+def _peek_mode(file_path: str) -> Optional[str]:
+    with open(file_path, "rb") as f:
+        head = f.read(PEEK_BYTES).decode("utf-8", errors="ignore")
+    return parse_frontmatter(head).get("mode")
+
+
+def parse_doc_markdown(file_path: str, lazy: Optional[bool] = None) -> Optional[Mapping[str, str]]:
+    """
+    Parses a Markdown doc of any registered mode.
+
+    Args:
+        file_path (str): Path to the Markdown file.
+        lazy (bool, optional): Memory-map and parse lazily; defaults to True for
+            files of LAZY_THRESHOLD_BYTES or more. Only dev_docs have a lazy
+            parser; other modes are parsed eagerly.
+
+    Returns:
+        dict: The parsed doc (a LazyDevDoc for lazy dev_docs), or None when the file does not exist.
+    """
+    if not os.path.exists(file_path):
+        print(f"[ERROR] File not found: {file_path}")
+        return None
+    size = os.path.getsize(file_path)
+    if (size >= LAZY_THRESHOLD_BYTES if lazy is None else lazy) and schema_for(_peek_mode(file_path)).mode == DEFAULT_MODE:
+        with tracing.span("md.parse", bytes=size, lazy=True):
+            from configs.tools.lazy_md import open_dev_doc
+
+            return open_dev_doc(file_path)
+    with tracing.span("md.parse", bytes=size, lazy=False):
+        with open(file_path, "r", encoding="utf-8") as f:
+            return parse_doc_text(f.read())
+
+
+def write_doc_markdown(data: Mapping, output_path: str, verbose: bool = True) -> None:
+    """Writes a parsed/generated doc with the template of its `mode` (dev_doc when unset)."""
+    schema_for(data.get("mode")).write(data, output_path, verbose=verbose)
+
+
+# 🔧 CLI/Test usage
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python -m configs.tools.doc_schemas <path_to_markdown_file>")
+    else:
+        result = parse_doc_markdown(sys.argv[1])
+        print(json.dumps(dict(result) if result is not None else None, indent=2, ensure_ascii=False))
@@ -0,0 +1,291 @@
+import codecs
+import mmap
+import os
+import re
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from configs.tools.parse_md_function import META_KEYS, SECTION_TITLES
+
+# Byte-level twins of the parse_md_function patterns, so a scan runs directly
+# over an mmap without decoding the file. Anchoring comes from match(pos).
+# A str pattern's \s also matches Unicode whitespace; WS is its UTF-8 spelling.
+WS = (
+    rb"(?:[\t\n\x0b\x0c\r\x1c-\x1f ]|\xc2[\x85\xa0]|\xe1\x9a\x80"
+    rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)"
+)
+FRONTMATTER_RE = re.compile(WS + rb"*---[ \t]*\n(.*?)\n---", re.DOTALL)
+META_LINE_RE = re.compile(rb"^([A-Za-z_][\w-]*)[ \t]*:[ \t]*(.*?)" + WS + rb"*$", re.MULTILINE)
+HEADING_RE = re.compile(
+    rb"###" + WS + rb"*(" + b"|".join(re.escape(t.encode("utf-8")) for t in SECTION_TITLES.values()) + rb"):[^\n]*"
+)
+BODY_RE = re.compile(WS + rb"*\n(?:```[^\n]*\n)?(.*?)(?:```)?\n(?:\n|###|\Z)", re.DOTALL)
+BODY_PREFIX_RE = re.compile(WS + rb"*\n(?:```[^\n]*\n)?")
+
+# A bundle member starts with a `---` line directly followed by a `key: value` line.
+# Horizontal rules inside a dev_doc are followed by a blank line, so they never match.
+DOC_START_RE = re.compile(rb"^---[ \t]*\n(?=[A-Za-z_][\w-]*[ \t]*:)", re.MULTILINE)
+
+_KEY_BY_TITLE = {title.encode("utf-8"): key for key, title in SECTION_TITLES.items()}
+
+# Scanned pages are handed back to the kernel every RELEASE_BYTES, keeping RSS flat.
+RELEASE_BYTES = 16 * 1024 * 1024
+# Text chunk size for iter_section.
+SECTION_CHUNK_BYTES = 1024 * 1024
+
+
+class _PageReleaser:
+    """
+    Drops already-scanned pages of a read-only mapping from this process's RSS.
+
+    `mark` is the lowest offset touched since the last release. Moving back
+    (a heading search re-reading a body) lowers it, so those pages go again too.
+    """
+
+    def __init__(self, buf, start: int = 0):
+        self.buf = buf
+        self.mark = start
+        self.enabled = isinstance(buf, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED")
+
+    def advance(self, pos: int) -> None:
+        if not self.enabled:
+            return
+        if pos < self.mark:
+            self.mark = pos
+        elif pos - self.mark >= RELEASE_BYTES:
+            start = self.mark - self.mark % mmap.PAGESIZE
+            end = pos - pos % mmap.PAGESIZE
+            self.buf.madvise(mmap.MADV_DONTNEED, start, end - start)
+            self.mark = end
+
+
+def _find(buf, needle: bytes, start: int, end: int, releaser: Optional[_PageReleaser]) -> int:
+    """buf.find over RELEASE_BYTES windows, so pages are released while a long span is searched."""
+    overlap = len(needle) - 1
+    while start < end:
+        stop = min(start + RELEASE_BYTES, end)
+        found = buf.find(needle, start, min(stop + overlap, end))
+        if found >= 0:
+            return found
+        start = stop
+        if releaser:
+            releaser.advance(start)
+    return -1
+
+
+def _next_heading(buf, pos: int, end: int, releaser: Optional[_PageReleaser]):
+    """Next HEADING_RE match at or after pos, as HEADING_RE.search would find it."""
+    while True:
+        found = _find(buf, b"###", pos, end, releaser)
+        if found < 0:
+            return None
+        heading = HEADING_RE.match(buf, found, end)
+        if heading:
+            return heading
+        pos = found + 1
+
+
+def _next_doc_start(buf, pos: int, end: int, releaser: Optional[_PageReleaser]):
+    """Next DOC_START_RE match at or after pos."""
+    while True:
+        found = _find(buf, b"---", pos, end, releaser)
+        if found < 0:
+            return None
+        start = DOC_START_RE.match(buf, found, end)
+        if start:
+            return start
+        pos = found + 1
+
+
+def _body_span(buf, pos: int, end: int, releaser: Optional[_PageReleaser]) -> Optional[Tuple[int, int]]:
+    """Byte twin of parse_md_function._body_span, limited to buf[:end]."""
+    prefix = BODY_PREFIX_RE.match(buf, pos, end)
+    if prefix:
+        start = prefix.end()
+        blank = _find(buf, b"\n\n", start, end, releaser)
+        heading = _find(buf, b"\n###", start, min(blank + 3, end) if blank >= 0 else end, releaser)
+        ends = [q for q in (blank, heading) if q >= 0]
+        if not ends and end - 1 >= start and buf[end - 1] == 0x0A:
+            ends.append(end - 1)
+        if ends:
+            stop = min(ends)
+            return (start, stop - 3) if stop - 3 >= start and buf[stop - 3:stop] == b"```" else (start, stop)
+    body = BODY_RE.match(buf, pos, end)
+    return body.span(1) if body else None
+
+
+def _utf8_length(lead: int) -> int:
+    if lead < 0xC0:
+        return 1
+    return 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+
+
+def _stripped_span(buf, start: int, end: int) -> Tuple[int, int]:
+    """Narrows a byte span the way str.strip() narrows its decoded text, without decoding the middle."""
+    while start < end:
+        size = _utf8_length(buf[start])
+        if not buf[start:start + size].decode("utf-8", "replace").isspace():
+            break
+        start += size
+    while end > start:
+        lead = end - 1
+        while lead > start and 0x80 <= buf[lead] < 0xC0:
+            lead -= 1
+        if not buf[lead:end].decode("utf-8", "replace").isspace():
+            break
+        end = lead
+    return start, end
+
+
+class LazyDevDoc(Mapping):
+    """
+    A dev_doc scanned once for section offsets, whose text is decoded on access.
+
+    Behaves like the dict parse_dev_doc_text returns (same keys, same values),
+    but only holds byte offsets into the underlying buffer. Each lookup slices,
+    decodes and strips one section, so memory use follows what callers read,
+    not the file size.
+
+    Args:
+        buf: The mmap (or bytes) the offsets point into.
+        meta (dict): Frontmatter values, already decoded.
+        spans (dict): Section key -> (start, end) byte offsets.
+        start (int): Offset of the document within `buf`.
+        end (int): End offset of the document within `buf`.
+    """
+
+    def __init__(self, buf, meta: Dict[str, str], spans: Dict[str, Tuple[int, int]], start: int = 0, end: int = 0):
+        self._buf = buf
+        self._meta = meta
+        self._spans = spans
+        self.start = start
+        self.end = end
+        self._keys = [key for key in META_KEYS if key in meta] + list(SECTION_TITLES)
+
+    def __getitem__(self, key: str) -> str:
+        if key in self._meta:
+            return self._meta[key]
+        if key not in SECTION_TITLES:
+            raise KeyError(key)
+        span = self._spans.get(key)
+        if span is None:
+            return ""
+        start, end = _stripped_span(self._buf, *span)
+        return self._buf[start:end].decode("utf-8", "replace")
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the document in the underlying buffer."""
+        return self.end - self.start
+
+    def section_size(self, key: str) -> int:
+        """Raw byte length of a section without materializing it."""
+        span = self._spans.get(key)
+        return span[1] - span[0] if span else 0
+
+    def iter_section(self, key: str, chunk_bytes: int = SECTION_CHUNK_BYTES) -> Iterator[str]:
+        """
+        Yields a section's stripped text in pieces, for writing sections too large to hold.
+
+        Joining the pieces gives exactly self[key]. Pages already read are
+        released as the iteration moves on.
+        """
+        span = self._spans.get(key)
+        if span is None:
+            return
+        start, end = _stripped_span(self._buf, *span)
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        releaser = _PageReleaser(self._buf, start)
+        for offset in range(start, end, chunk_bytes):
+            stop = min(offset + chunk_bytes, end)
+            text = decoder.decode(self._buf[offset:stop], final=stop == end)
+            if text:
+                yield text
+            releaser.advance(stop)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Materializes every field, matching parse_dev_doc_text exactly."""
+        return {key: self[key] for key in self._keys}
+
+    def __repr__(self):
+        sizes = ", ".join(f"{key}={self.section_size(key)}B" for key in SECTION_TITLES if key in self._spans)
+        return f"LazyDevDoc({self._meta.get('function_name', '?')!r}, bytes {self.start}-{self.end}, {sizes})"
+
+
+def _scan(buf, start: int, end: int, releaser: Optional[_PageReleaser] = None) -> LazyDevDoc:
+    """Records frontmatter and first-terminating section spans within buf[start:end] in one pass."""
+    meta = {}
+    front = FRONTMATTER_RE.match(buf, start, end)
+    if front:
+        for key, value in META_LINE_RE.findall(buf[front.start(1):front.end(1)]):
+            meta[key.decode("utf-8", "replace")] = value.decode("utf-8", "replace")
+
+    spans = {}
+    pos = start
+    while len(spans) < len(SECTION_TITLES):
+        heading = _next_heading(buf, pos, end, releaser)
+        if not heading:
+            break
+        pos = heading.end()
+        key = _KEY_BY_TITLE[heading.group(1)]
+        if key not in spans:
+            span = _body_span(buf, pos, end, releaser)
+            if span:
+                spans[key] = span
+        if releaser:
+            releaser.advance(pos)
+    return LazyDevDoc(buf, {key: meta[key] for key in META_KEYS if key in meta}, spans, start, end)
+
+
+def _map(file_path: str):
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def open_dev_doc(file_path: str) -> LazyDevDoc:
+    """
+    Memory-maps one dev_doc and scans it for section offsets.
+
+    Args:
+        file_path (str): Path to the Markdown file.
+
+    Returns:
+        LazyDevDoc: Mapping with the same keys and values as parse_dev_doc_markdown.
+    """
+    buf = _map(file_path)
+    return _scan(buf, 0, len(buf), _PageReleaser(buf))
+
+
+def iter_dev_docs(file_path: str) -> Iterator[LazyDevDoc]:
+    """
+    Iterates over the documents in a bundle of concatenated dev_docs.
+
+    Each document starts at a frontmatter block (`---` followed by `key: value`
+    lines) and runs to the next one. Documents are yielded as they are found,
+    so a bundle of any size is processed with flat memory. Text before the
+    first frontmatter block is ignored.
+
+    Args:
+        file_path (str): Path to the bundle file.
+
+    Yields:
+        LazyDevDoc: One per document, in file order.
+    """
+    buf = _map(file_path)
+    releaser = _PageReleaser(buf)
+    size = len(buf)
+    current = _next_doc_start(buf, 0, size, releaser)
+    while current:
+        front = FRONTMATTER_RE.match(buf, current.start(), size)
+        following = _next_doc_start(buf, front.end() if front else current.end(), size, releaser)
+        end = following.start() if following else size
+        yield _scan(buf, current.start(), end, releaser)
+        releaser.advance(end)
+        current = following
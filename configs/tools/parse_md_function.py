@@ -1,54 +1,175 @@
+import os
 import re
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional, Tuple
 
+from configs.tools.core import tracing
 
-def parse_dev_doc_markdown(file_path: str) -> Optional[Dict[str, str]]:
+# Section headings in dev_doc order, mapped to the keys they populate.
+SECTION_TITLES = {
+    "code": "🧠 Function",
+    "explanation": "🔍 Explanation",
+    "example": "🧪 Usage Example",
+    "complexity": "⏱️ Time Complexity",
+    "insight": "💡 Insight",
+    "limitations": "⚠️ Known Limitations",
+    "tags": "🏷️ Tags",
+}
+
+# Frontmatter keys copied into the parsed dict, in output order.
+META_KEYS = ("function_name", "language", "mode", "created_at")
+
+# Files at least this large are memory-mapped and parsed lazily (see lazy_md.py).
+LAZY_THRESHOLD_BYTES = int(os.environ.get("SOOTHSAYER_LAZY_PARSE_BYTES", 32 * 1024 * 1024))
+
+# === Compiled once at import, shared by every parse ===
+FRONTMATTER_RE = re.compile(r"\A\s*---[ \t]*\n(.*?)\n---", re.DOTALL)
+META_LINE_RE = re.compile(r"^([A-Za-z_][\w-]*)[ \t]*:[ \t]*(.*?)\s*$", re.MULTILINE)
+
+
+def heading_pattern(titles) -> re.Pattern:
+    """
+    Compiles the `### <title>:` heading pattern for a set of section titles.
+
+    Text after the colon stays on the heading line (the template writes `### 🧠 Function: name`).
+    """
+    return re.compile(r"###\s*(" + "|".join(re.escape(t) for t in titles) + r"):[^\n]*")
+
+
+HEADING_RE = heading_pattern(SECTION_TITLES.values())
+BODY_RE = re.compile(r"\s*\n(?:```[^\n]*\n)?(.*?)(?:```)?\n(?:\n|###|\Z)", re.DOTALL)
+# BODY_RE's opening; the lazy body is then found with str.find instead of per-character backtracking.
+BODY_PREFIX_RE = re.compile(r"\s*\n(?:```[^\n]*\n)?")
+
+_KEY_BY_TITLE = {title: key for key, title in SECTION_TITLES.items()}
+
+
+def _body_span(content: str, pos: int) -> Optional[Tuple[int, int]]:
+    """
+    Span of BODY_RE's group 1 when matched at `pos`, or None.
+
+    The body ends before the first newline that is followed by a blank line,
+    `###` or the end of the text, minus a closing fence right before it.
+    Finding that newline with str.find gives the same span as the regex far faster.
+    """
+    prefix = BODY_PREFIX_RE.match(content, pos)
+    if prefix:
+        start = prefix.end()
+        blank = content.find("\n\n", start)
+        heading = content.find("\n###", start, blank + 3 if blank >= 0 else len(content))
+        ends = [q for q in (blank, heading) if q >= 0]
+        if not ends and content.endswith("\n") and len(content) - 1 >= start:
+            ends.append(len(content) - 1)
+        if ends:
+            end = min(ends)
+            return (start, end - 3) if end - 3 >= start and content.startswith("```", end - 3) else (start, end)
+    # No terminator after the greedy opening: defer to the regex, which may backtrack into it.
+    body = BODY_RE.match(content, pos)
+    return body.span(1) if body else None
+
+
+def parse_frontmatter(content: str) -> Dict[str, str]:
+    """
+    Reads the leading `---` frontmatter block into a flat dictionary.
+
+    Keys may appear in any order; unknown keys are kept as-is.
+
+    Args:
+        content (str): Full Markdown document text.
+
+    Returns:
+        dict: Frontmatter key/value pairs, empty if there is no frontmatter.
+    """
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return {}
+    return {key: value for key, value in META_LINE_RE.findall(match.group(1))}
+
+
+def parse_sections(
+    content: str,
+    meta: Mapping[str, str],
+    meta_keys: Tuple[str, ...],
+    heading_re: re.Pattern,
+    key_by_title: Mapping[str, str],
+) -> Dict[str, str]:
+    """
+    Single scan over the `###` headings `heading_re` matches; shared by every doc schema.
+
+    Args:
+        content (str): Full Markdown document text.
+        meta (dict): Its parsed frontmatter.
+        meta_keys (tuple): Frontmatter keys to copy, in output order.
+        heading_re (re.Pattern): From heading_pattern() over the schema's titles.
+        key_by_title (dict): Section title -> key, in output order.
+
+    Returns:
+        dict: The meta keys present, then every section key ("" when missing).
+    """
+    parsed_data = {key: meta[key] for key in meta_keys if key in meta}
+
+    # First heading per title whose body terminates wins, as a document search would.
+    sections = {}
+    for heading in heading_re.finditer(content):
+        key = key_by_title[heading.group(1)]
+        if key in sections:
+            continue
+        span = _body_span(content, heading.end())
+        if span:
+            sections[key] = content[span[0]:span[1]].strip()
+        if len(sections) == len(key_by_title):
+            break
+
+    for key in key_by_title.values():
+        parsed_data[key] = sections.get(key, "")
+
+    return parsed_data
+
+
+def parse_dev_doc_text(content: str) -> Dict[str, str]:
+    """
+    Parses dev_doc Markdown text in a single scan over its `###` headings.
+
+    Args:
+        content (str): Full Markdown document text.
+
+    Returns:
+        dict: Parsed data with keys like function_name, language, code, explanation, etc.
+    """
+    return parse_sections(content, parse_frontmatter(content), META_KEYS, HEADING_RE, _KEY_BY_TITLE)
+
+
+def parse_dev_doc_markdown(file_path: str, lazy: Optional[bool] = None) -> Optional[Mapping[str, str]]:
     """
     Parses a structured dev_doc Markdown file and returns a dictionary of its components.
 
     Args:
         file_path (str): Path to the Markdown file.
+        lazy (bool, optional): Memory-map the file and decode sections only when
+            read. Defaults to True for files of LAZY_THRESHOLD_BYTES or more.
 
     Returns:
         dict: Parsed data with keys like function_name, language, code, explanation, etc.
+        Lazy parses return a LazyDevDoc, a read-only mapping with the same keys and values.
     """
-    if not Path(file_path).exists():
+    path = Path(file_path)
+    if not path.exists():
         print(f"[ERROR] File not found: {file_path}")
         return None
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    parsed_data = {}
-
-    # Metadata (YAML frontmatter)
-    meta_match = re.search(
-        r"---\s*\nfunction_name:\s*(.+?)\s*\nlanguage:\s*(.+?)\s*\nmode:\s*(.+?)\s*\ncreated_at:\s*(.+?)\s*\n---",
-        content,
-        re.DOTALL
-    )
-    if meta_match:
-        parsed_data["function_name"] = meta_match.group(1).strip()
-        parsed_data["language"] = meta_match.group(2).strip()
-        parsed_data["mode"] = meta_match.group(3).strip()
-        parsed_data["created_at"] = meta_match.group(4).strip()
-
-    # Sections
-    def extract_section(title: str, code_block: bool = False):
-        pattern = rf"###\s*{re.escape(title)}:\s*\n(?:```[^\n]*\n)?(.*?)(?:```)?\n(?:\n|###|\Z)"
-        match = re.search(pattern, content, re.DOTALL)
-        return match.group(1).strip() if match else ""
-
-    parsed_data["code"] = extract_section("🧠 Function", code_block=True)
-    parsed_data["explanation"] = extract_section("🔍 Explanation")
-    parsed_data["example"] = extract_section("🧪 Usage Example", code_block=True)
-    parsed_data["complexity"] = extract_section("⏱️ Time Complexity")
-    parsed_data["insight"] = extract_section("💡 Insight")
-    parsed_data["limitations"] = extract_section("⚠️ Known Limitations")
-    parsed_data["tags"] = extract_section("🏷️ Tags")
+    size = path.stat().st_size
+    if lazy is None:
+        lazy = size >= LAZY_THRESHOLD_BYTES
+    with tracing.span("md.parse", bytes=size, lazy=lazy):
+        if lazy:
+            from configs.tools.lazy_md import open_dev_doc
 
-    return parsed_data
+            return open_dev_doc(file_path)
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        return parse_dev_doc_text(content)
 
 
 # 🔧 CLI/Test usage
@@ -60,4 +181,4 @@ if __name__ == "__main__":
         print("Usage: python parse_md_function.py <path_to_markdown_file>")
     else:
         result = parse_dev_doc_markdown(sys.argv[1])
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        print(json.dumps(dict(result) if result is not None else None, indent=2, ensure_ascii=False))
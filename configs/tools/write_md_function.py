@@ -1,75 +1,124 @@
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 
-def write_dev_doc_markdown(data: dict, output_path: str) -> None:
-    """
-    Writes a structured Markdown dev_doc file using the provided dictionary.
-
-    Args:
-        data (dict): Keys like function_name, language, code, explanation, etc.
-        output_path (str): Full file path to save the Markdown.
-    """
-    function_name = data.get("function_name", "unknown_function")
-    language = data.get("language", "python")
-    created_at = data.get("created_at", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+from configs.tools.core import tracing
+from configs.tools.core.agent_config import AGENT_CONFIG_PATH, load_agent_config
+from configs.tools.template_renderer import atomic_write_chunks, atomic_write_text, compile_template, render_many
 
-    markdown = f'''---
-function_name: {function_name}
-language: {language}
-mode: dev_doc
-created_at: {created_at}
----
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_TEMPLATE_PATH = REPO_ROOT / "templates" / "markdown_format.md"
 
-### 🧠 Function: {function_name}
+# Body fields are stripped before rendering; header fields are used as given.
+BODY_FIELDS = ("code", "explanation", "example", "complexity", "insight", "limitations", "tags")
 
-```{language}
-{data.get("code", "").strip()}
-```
+# Lazily parsed docs at least this large are streamed to disk section by section.
+STREAM_MIN_BYTES = 1024 * 1024
 
----
 
-### 🔍 Explanation:
-
-{data.get("explanation", "").strip()}
-
----
-
-### 🧪 Usage Example:
-
-```{language}
-{data.get("example", "").strip()}
-```
+@lru_cache(maxsize=None)
+def dev_doc_template_path(config_path: Path = AGENT_CONFIG_PATH) -> str:
+    """
+    Resolves the dev_doc template from the agent config's `output_format.template_file`.
 
----
+    Falls back to templates/markdown_format.md when the config, the key or the
+    file it names is missing. Resolved once per process.
+    """
+    output_format = load_agent_config(config_path).get("output_format")
+    template_file = output_format.get("template_file") if isinstance(output_format, dict) else None
+    if template_file:
+        candidate = Path(template_file)
+        candidate = candidate if candidate.is_absolute() else REPO_ROOT / candidate
+        if candidate.is_file():
+            return str(candidate)
+    return str(DEFAULT_TEMPLATE_PATH)
 
-### ⏱️ Time Complexity:
 
-{data.get("complexity", "").strip()}
+def dev_doc_values(data: dict, now: Optional[str] = None) -> Dict[str, str]:
+    """
+    Maps a parsed/generated dev_doc dict onto the template's placeholders.
 
----
+    Args:
+        data (dict): Keys like function_name, language, code, explanation, etc.
+        now (str, optional): Timestamp used when data has no created_at.
 
-### 💡 Insight:
+    Returns:
+        dict: Placeholder values, including `timestamp` for the frontmatter.
+    """
+    values = {field: (data.get(field) or "").strip() for field in BODY_FIELDS}
+    values["function_name"] = data.get("function_name", "unknown_function")
+    values["language"] = data.get("language", "python")
+    values["timestamp"] = data.get("created_at") or now or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return values
+
+
+def _streamed_values(data) -> Callable[[str], Iterator[str]]:
+    """Field resolver for lazily parsed docs: body sections are copied through in chunks."""
+    header = {
+        "function_name": data.get("function_name", "unknown_function"),
+        "language": data.get("language", "python"),
+        "timestamp": data.get("created_at") or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
 
-{data.get("insight", "").strip()}
+    def resolve(field: str) -> Iterator[str]:
+        if field in header:
+            return iter((header[field],))
+        return data.iter_section(field)
 
----
+    return resolve
 
-### ⚠️ Known Limitations:
 
-{data.get("limitations", "").strip()}
+def write_dev_doc_markdown(data: dict, output_path: str, verbose: bool = True, template_path: Optional[str] = None) -> None:
+    """
+    Writes a structured Markdown dev_doc file using the provided dictionary.
 
----
+    Args:
+        data (dict): Keys like function_name, language, code, explanation, etc.
+            A LazyDevDoc of STREAM_MIN_BYTES or more is streamed section by
+            section instead of rendered whole.
+        output_path (str): Full file path to save the Markdown.
+        verbose (bool): Print a confirmation line once the file is written.
+        template_path (str, optional): `{{ placeholder }}` template; defaults to
+            the agent config's output_format.template_file.
+    """
+    with tracing.span("md.render") as span:
+        template = compile_template(template_path or dev_doc_template_path())
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if hasattr(data, "iter_section") and data.nbytes >= STREAM_MIN_BYTES:
+            span.set(bytes=atomic_write_chunks(str(output), template.render_iter(_streamed_values(data))), streamed=True)
+        else:
+            span.set(bytes=atomic_write_text(str(output), template.render(dev_doc_values(data))))
+    if verbose:
+        print(f"[✅] Markdown written to: {output_path}")
+
+
+def write_dev_docs(jobs: Iterable[Tuple[dict, str]], template_path: Optional[str] = None) -> Dict:
+    """
+    Renders many dev_docs against one compiled template and prints a single summary.
 
-### 🏷️ Tags:
+    Args:
+        jobs (iterable): (data, output path) pairs.
+        template_path (str, optional): Overrides the configured template.
 
-{data.get("tags", "").strip()}
-'''
+    Returns:
+        dict: written, failed, bytes, seconds and the first few errors.
+    """
+    template = compile_template(template_path or dev_doc_template_path())
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with tracing.span("md.render_many") as span:
+        summary = render_many(template, ((dev_doc_values(data, now), path) for data, path in jobs))
+        span.set(docs=summary["written"], failed=summary["failed"], bytes=summary["bytes"])
+    rate = summary["written"] / summary["seconds"] if summary["seconds"] else 0.0
+    print(
+        f"[📊] {summary['written']} docs written ({summary['bytes'] / 1e6:.1f} MB) in {summary['seconds']:.2f}s "
+        f"({rate:.0f} docs/s), {summary['failed']} failed"
+    )
+    for path, error in summary["errors"]:
+        print(f"[❌] {path}: {error}")
+    return summary
 
-    output = Path(output_path)
-    output.parent.mkdir(parents=True, exist_ok=True)
-    with open(output, "w", encoding="utf-8") as f:
-        f.write(markdown)
-    print(f"[✅] Markdown written to: {output_path}")
 
 if __name__ == "__main__":
     sample_data = {
@@ -1,12 +1,38 @@
-import gradio as gr
-from crewai import Agent, Task, Crew
-from langchain_ollama import OllamaLLM
-from configs.tools.parse_md_function import parse_dev_doc_markdown
+import asyncio
+import logging
+import os
+import threading
+from collections import OrderedDict
+from configs.tools.doc_schemas import schema_for
+from configs.tools.core import tracing
+from configs.tools.core.memory import memory_settings
+from configs.tools.core.ollama_client import DEFAULT_BASE_URL, OllamaError
+from configs.tools.core.parse_cache import parse_cache
+from configs.tools.core.resilience import CircuitOpenError, breaker_for
+from configs.tools.core.routing import default_router
+from configs.tools.core.runtime import SoothsayerRuntime
+from configs.tools.core.serving import AdmissionController, OverloadedError
+from configs.tools.core.singleflight import flights
+from configs.tools.core.startup import exit_at_prompt, profile_startup
+from configs.tools.core.warmup import warmup_settings
 
-# === 1. Load your parsed markdown doc ===
-parsed_data = parse_dev_doc_markdown("input_docs/add_numbers.md")
+# gradio and crewai are imported where they are first needed, so importing this
+# module (e.g. from benchmarks) is cheap and does no parsing or model setup.
+
+# Time to first token per request is logged here.
+logging.basicConfig(
+    filename="soothsayer.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+INPUT_PATH = "input_docs/add_numbers.md"
+# Set (or pass --retrieve) to add the top matching input_docs/output_docs sections to each request.
+RETRIEVE = bool(os.environ.get("SOOTHSAYER_RETRIEVE"))
 
 # === 2. Define Soothsayer's system prompt using markdown fields ===
+# The doc's `mode` picks its schema, whose labeled fields and sections make up the lens below.
+@tracing.traced("prompt.build")
 def get_system_prompt(data):
     return f"""
 You are Soothsayer, an AI strategist built to translate complexity into clarity — not just in code or content, but in communication itself.
@@ -19,22 +45,16 @@ Your job is to:
 Use this structure as a lens — not a cage:
 
 ---
-📘 Title: {data.get('Title', 'Untitled')}
-📎 Overview: {data.get('Overview', '')}
-📌 Why It Matters: {data.get('Why It Matters', '')}
-🧠 Prerequisites: {data.get('Prerequisites', '')}
-🔧 Tasks/Instructions: {data.get('Tasks/Instructions', '')}
-📎 Tips: {data.get('Tips', '')}
-🧯 Troubleshooting: {data.get('Troubleshooting', '')}
-📚 Resources: {data.get('Resources', '')}
-📅 Last Updated: {data.get('Last Updated', '')}
+{schema_for(data.get('mode')).outline(data)}
 ---
 
 Wait for the user's intent. Don’t respond quickly — respond wisely.
 """
 
 # === 3. Define the Soothsayer Agent ===
-def get_agent():
+def get_agent(llm, system_prompt):
+    from crewai import Agent
+
     return Agent(
         name="Soothsayer",
         role="AI Strategist for Communication, Product Clarity, and Change Enablement",
@@ -47,26 +67,144 @@ def get_agent():
         ),
         allow_delegation=False,
         verbose=False,
-        llm=OllamaLLM(model="mistral"),
-        system_prompt=get_system_prompt(parsed_data)
+        llm=llm,
+        system_prompt=system_prompt
     )
 
-soothsayer_agent = get_agent()
+# === 1. Load your parsed markdown doc, once, on the first request ===
+# One runtime per process: the agent, LLM client and pooled Ollama connection are reused by every request.
+_runtime = None
+_runtime_lock = threading.Lock()
+
+def get_runtime():
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            data = parse_cache().get(INPUT_PATH)
+            system_prompt = get_system_prompt(data)
+            retriever = None
+            if RETRIEVE:
+                from configs.tools.core.doc_index import DocIndex
+
+                retriever = DocIndex().context_for
+            _runtime = SoothsayerRuntime(
+                system_prompt=system_prompt,
+                agent_factory=lambda llm: get_agent(llm, system_prompt),
+                # The config's routing block picks the model for this doc's mode.
+                model=default_router().route("soothsayer", data.get("mode")).model,
+                expected_output="Reflective, structured, and cognitively resonant output",
+                retriever=retriever
+            )
+        return _runtime
 
 # === 4. Core Interaction Function ===
 def interact_with_soothsayer(user_input):
-    task = Task(
-        description=user_input,
-        expected_output="Reflective, structured, and cognitively resonant output",
-        agent=soothsayer_agent
-    )
-    crew = Crew(
-        agents=[soothsayer_agent],
-        tasks=[task],
-        verbose=False
-    )
-    result = crew.kickoff()
-    return str(result)
+    return get_runtime().run(user_input)
+
+# === 4b. Session Mode: one Ollama context per browser tab, so later turns only evaluate the new text ===
+# Without it, the agent config's memory_strategy decides how much history each tab's turns carry.
+SESSION_MODE = bool(os.environ.get("SOOTHSAYER_SESSIONS"))
+# None until first needed: then the agent config's memory_strategy (--memory overrides it).
+MEMORY_STRATEGY = None
+MAX_SESSIONS = 256
+_sessions = OrderedDict()
+_sessions_lock = threading.Lock()
+
+def memory_strategy():
+    global MEMORY_STRATEGY
+    if MEMORY_STRATEGY is None:
+        MEMORY_STRATEGY = memory_settings()["strategy"]
+    return MEMORY_STRATEGY
+
+def new_session(session_id):
+    runtime = get_runtime()
+    if SESSION_MODE:
+        return runtime.session()
+    return runtime.memory_session(memory_strategy(), conversation_id=f"ui-{session_id}")
+
+def get_session(session_id):
+    with _sessions_lock:
+        session = _sessions.pop(session_id, None) or new_session(session_id)
+        _sessions[session_id] = session
+        while len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+        return session
+
+# === 4c. Streaming Interaction (tokens appear as Ollama emits them) ===
+class SoothsayerReply:
+    """
+    The growing reply text, one value per token.
+
+    close() may be called from another thread (the server's event loop on a
+    timeout or a closed tab) while a read is blocked: it closes the token
+    stream, which frees the connection and settles the call at once.
+    """
+
+    def __init__(self, user_input, session_id=None):
+        self._user_input = user_input
+        self._session_id = session_id
+        self._stream = None
+        self._closed = False
+        self._steps = self._run()
+
+    def _run(self):
+        source = get_session(self._session_id) if self._session_id else get_runtime()
+        warmer = get_runtime().warmer
+        if warmer is not None and warmer.state == "warming":
+            # Ollama queues the request behind the model load; say so instead of showing nothing.
+            yield "⏳ Warming up the model — the answer starts as soon as it is loaded…"
+        stream = self._stream = source.stream(self._user_input)
+        try:
+            if self._closed:
+                return
+            for _ in stream:
+                yield stream.text
+        finally:
+            stream.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._steps)
+
+    def close(self):
+        self._closed = True
+        if self._stream is not None:
+            self._stream.close()
+        try:
+            self._steps.close()
+        except ValueError:
+            pass  # running on another thread; closing the stream above ends it
+
+def stream_with_soothsayer(user_input, session_id=None):
+    return SoothsayerReply(user_input, session_id)
+
+# === 4d. Concurrent Serving (bounded queue, in-flight limit, per-request timeout) ===
+serving = AdmissionController(
+    max_inflight=int(os.environ.get("SOOTHSAYER_MAX_INFLIGHT", 2)),
+    max_queue=int(os.environ.get("SOOTHSAYER_MAX_QUEUE", 16)),
+    timeout_s=float(os.environ.get("SOOTHSAYER_TIMEOUT_S", 120))
+)
+
+async def serve_soothsayer(user_input, session_id=None):
+    import gradio as gr
+
+    try:
+        with tracing.span("ui.request", session=session_id is not None) as span:
+            chars = 0
+            async for text in serving.stream(lambda: stream_with_soothsayer(user_input, session_id)):
+                chars = len(text)
+                yield text
+            span.set(chars=chars)
+    except OverloadedError:
+        raise gr.Error("Soothsayer is at capacity right now — please try again in a moment.")
+    except asyncio.TimeoutError:
+        raise gr.Error(f"No answer within {serving.timeout_s:.0f}s — please try again.")
+    except CircuitOpenError as e:
+        raise gr.Error(f"The model server is down — retrying it in {e.retry_in_s:.0f}s.")
+    except (OllamaError, OSError) as e:
+        raise gr.Error(f"The model server failed: {e}")
 
 # === 5. Custom CSS Inspired by PruningMyPothos ===
 custom_css = """
@@ -128,22 +266,105 @@ button:hover {
 """
 
 # === 6. Gradio Interface ===
-iface = gr.Interface(
-    fn=interact_with_soothsayer,
-    inputs=gr.Textbox(
-        lines=4,
-        placeholder="What should Soothsayer reframe, translate, or clarify today?",
-        label="🎯 Ask Soothsayer"
-    ),
-    outputs=gr.Textbox(label="🗣️ Soothsayer Responds", elem_classes="output-textbox"),
-    title="🧠 Soothsayer — Strategist for Change, Clarity & Communication",
-    description=(
-        "Not just a rewriter — a re-thinker.\n"
-        "Soothsayer transforms raw updates, friction-filled memos, and product ambiguity into crisp, cognitively aligned clarity."
-    ),
-    css=custom_css,
-    theme="default"
-)
+def build_interface():
+    import gradio as gr
+
+    async def respond(user_input, request: gr.Request):
+        session_id = request.session_hash if SESSION_MODE or memory_strategy() != "none" else None
+        async for text in serve_soothsayer(user_input, session_id):
+            yield text
+
+    iface = gr.Interface(
+        fn=respond,
+        inputs=gr.Textbox(
+            lines=4,
+            placeholder="What should Soothsayer reframe, translate, or clarify today?",
+            label="🎯 Ask Soothsayer"
+        ),
+        outputs=gr.Textbox(label="🗣️ Soothsayer Responds", elem_classes="output-textbox"),
+        title="🧠 Soothsayer — Strategist for Change, Clarity & Communication",
+        description=(
+            "Not just a rewriter — a re-thinker.\n"
+            "Soothsayer transforms raw updates, friction-filled memos, and product ambiguity into crisp, cognitively aligned clarity."
+        ),
+        css=custom_css,
+        theme="default"
+    )
+
+    # Admission control lives in `serving`, so Gradio's own queue must not serialize requests.
+    iface.queue(default_concurrency_limit=None)
+    return iface
+
+_iface = None
+_iface_lock = threading.Lock()
+
+def __getattr__(name):
+    # `gradio_ui.app.iface` (imports, `gradio --demo-name iface` reload) is built on first access, not at import.
+    global _iface
+    if name == "iface":
+        with _iface_lock:
+            if _iface is None:
+                _iface = build_interface()
+            return _iface
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def build_server(iface):
+    """Mounts the interface on FastAPI next to a /status endpoint for queue depth and latency."""
+    import gradio as gr
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/status")
+    def status():
+        return {
+            **serving.status(),
+            "sessions": len(_sessions),
+            "backend": breaker_for(DEFAULT_BASE_URL).status(),
+            "coalescing": flights().stats(),
+            "model": get_runtime().warmer.status() if get_runtime().warmer else {"state": "cold"},
+        }
+
+    return gr.mount_gradio_app(app, iface, path="/")
 
 if __name__ == "__main__":
-    iface.launch(share=True)
+    import argparse
+    import sys
+
+    if "--profile-startup" in sys.argv:
+        profile_startup(["-m", "gradio_ui.app"] + [arg for arg in sys.argv[1:] if arg != "--profile-startup"])
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Soothsayer Gradio app")
+    parser.add_argument("--serve", action="store_true", help="Serve locally with a /status endpoint instead of a share link")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7860)
+    parser.add_argument("--max-inflight", type=int, default=serving.max_inflight, help="Concurrent Ollama calls")
+    parser.add_argument("--max-queue", type=int, default=serving.max_queue, help="Requests allowed to wait")
+    parser.add_argument("--timeout", type=float, default=serving.timeout_s, help="Per-request timeout in seconds")
+    parser.add_argument("--session", action="store_true", help="Keep each browser tab's conversation in Ollama's context")
+    parser.add_argument("--memory", choices=("none", "short_term", "long_term"), default=None,
+                        help="History each tab's turns carry (default: the agent config's memory_strategy)")
+    parser.add_argument("--retrieve", action="store_true", help="Add the top matching local doc sections to each request")
+    parser.add_argument("--trace", action="store_true", help="Append per-stage spans to .cache/traces.jsonl")
+    parser.add_argument("--profile-startup", action="store_true", help="Print an import-time breakdown up to launch")
+    args = parser.parse_args()
+
+    if args.trace:
+        tracing.configure(enabled=True)
+    serving = AdmissionController(args.max_inflight, args.max_queue, args.timeout)
+    SESSION_MODE = SESSION_MODE or args.session
+    MEMORY_STRATEGY = args.memory or MEMORY_STRATEGY
+    RETRIEVE = RETRIEVE or args.retrieve
+    iface = build_interface()
+    if exit_at_prompt():
+        sys.exit(0)
+    # Load the model while the UI starts; requests before it is ready show "warming".
+    if warmup_settings()["enabled"]:
+        get_runtime().warm_up()
+    if args.serve:
+        import uvicorn
+
+        uvicorn.run(build_server(iface), host=args.host, port=args.port)
+    else:
+        iface.launch(share=True)
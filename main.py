@@ -1,9 +1,26 @@
-from crewai import Agent, Task, Crew
-from langchain_ollama import OllamaLLM
+# Heavy frameworks (crewai, langchain_ollama, rich.markdown) are imported on first use,
+# so the prompt appears without paying for them. Try: python main.py --profile-startup
 from rich.console import Console
-from rich.markdown import Markdown
+from configs.tools.core import memory, tracing
+from configs.tools.core.llm_cache import LLMCache
+from configs.tools.core.memory import MemoryChat
+from configs.tools.core.ollama_client import DEFAULT_BASE_URL, OllamaError
+from configs.tools.core.resilience import CircuitOpenError
+from configs.tools.core.runtime import SoothsayerRuntime
+from configs.tools.core.startup import exit_at_prompt, profile_startup
+from configs.tools.core.warmup import warmup_settings
 import readline  # for CLI input history
+import logging
 import os
+import sys
+import time
+
+# === Per-request timing (time to first token) goes to a local log ===
+logging.basicConfig(
+    filename="soothsayer.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
 
 # === Terminal Markdown Renderer ===
 console = Console()
@@ -34,29 +51,101 @@ Keep all output actionable and markdown-friendly.
 """
 
 # === LLM Setup ===
-llm = OllamaLLM(
-    base_url="http://localhost:11434",
-    model="ollama/mistral",
-    temperature=0.3
-)
+OLLAMA_URL = DEFAULT_BASE_URL  # override with SOOTHSAYER_OLLAMA_URL
+MODEL = "ollama/mistral"
+TEMPERATURE = 0.3
 
 # === Soothsayer Agent ===
-soothsayer = Agent(
-    name="Soothsayer",
-    role="Cognitive AI Strategist for Content, Change, and Code",
-    goal="To bridge the thinking–doing gap through structured reflection and clarity",
-    backstory="Soothsayer decodes ideas and executes clarity in systems, code, and comms.",
-    verbose=True,
-    allow_delegation=False,
-    tools=[],
-    llm=llm,
-    system_prompt=soothsayer_prompt
+def build_soothsayer(llm):
+    from crewai import Agent
+
+    return Agent(
+        name="Soothsayer",
+        role="Cognitive AI Strategist for Content, Change, and Code",
+        goal="To bridge the thinking–doing gap through structured reflection and clarity",
+        backstory="Soothsayer decodes ideas and executes clarity in systems, code, and comms.",
+        verbose=True,
+        allow_delegation=False,
+        tools=[],
+        llm=llm,
+        system_prompt=soothsayer_prompt
+    )
+
+# === Local doc retrieval (--retrieve): each request carries the top matching dev_doc sections ===
+def build_retriever():
+    from configs.tools.core.doc_index import DocIndex
+
+    return DocIndex().context_for
+
+# === Runtime: one agent, one LLM, one pooled Ollama connection for the whole session ===
+# Byte-identical prompts are served from the response cache; --no-cache bypasses it.
+runtime = SoothsayerRuntime(
+    system_prompt=soothsayer_prompt,
+    agent_factory=build_soothsayer,
+    model=MODEL,
+    base_url=OLLAMA_URL,
+    temperature=TEMPERATURE,
+    expected_output="A markdown-friendly, structured, and helpful answer",
+    cache=LLMCache(enabled=False if "--no-cache" in sys.argv else None),
+    retriever=build_retriever() if "--retrieve" in sys.argv else None
 )
 
+# === Streaming Reply ===
+def stream_reply(user_input, session=None):
+    """Streams one answer from Ollama, re-rendering the Markdown as tokens arrive.
+
+    With a session, earlier turns stay in Ollama's context and only the new text is evaluated.
+    """
+    from rich.live import Live
+    from rich.markdown import Markdown
+
+    stream = (session or runtime).stream(user_input)
+    console.print("\n[🗣️ Soothsayer Says]:\n", style="bold green")
+    render_s = 0.0
+    with Live(Markdown(""), console=console, refresh_per_second=12, vertical_overflow="visible") as live:
+        for _ in stream:
+            started = time.perf_counter()
+            live.update(Markdown(stream.text))
+            render_s += time.perf_counter() - started
+    tracing.record("cli.render", render_s, chars=len(stream.text))
+    if stream.ttft is not None:
+        console.print(f"[dim]first token in {stream.ttft:.2f}s[/dim]")
+    if session is not None and session.turns:
+        turn = session.turns[-1]
+        if "memory_tokens" in turn:
+            detail = f"memory {turn['memory_tokens']} tokens, {turn['window_turns']} recent turns"
+        else:
+            detail = "context reused" if turn["reused_context"] else "full prompt"
+        console.print(
+            f"[dim]turn {turn['turn']}: prompt eval {turn['prompt_eval_count']} tokens in {turn['prompt_eval_ms']:.0f} ms"
+            f" ({detail})[/dim]"
+        )
+    return stream.text
+
+# === Blocking Reply (full CrewAI task) ===
+def crew_reply(user_input, session=None):
+    from rich.markdown import Markdown
+
+    if isinstance(session, MemoryChat):
+        result = runtime.run(session.prompt_for(user_input))
+        session.remember(user_input, result)
+    else:
+        result = runtime.run(user_input)
+    console.print("\n[🗣️ Soothsayer Says]:\n", style="bold green")
+    with tracing.span("cli.render", chars=len(result)):
+        console.print(Markdown(result))
+    return result
+
 # === Interactive Loop Starts Here ===
-def interactive_cli():
+def interactive_cli(stream=True, session=None):
     console.print("\n🧠 [bold cyan]Soothsayer CLI[/bold cyan] — Think. Clarify. Create.\n")
     console.print("Type your question or task. Type [bold]exit[/bold] to quit.\n")
+    if exit_at_prompt():
+        return
+    # Load the model while the user types the first question.
+    if warmup_settings()["enabled"]:
+        runtime.warm_up()
+        console.print(f"[dim]loading {runtime.model} in the background (keep_alive {runtime.keep_alive})[/dim]\n")
 
     while True:
         try:
@@ -69,23 +158,61 @@ def interactive_cli():
             console.print("\n👋 [bold red]Session Ended.[/bold red]")
             break
 
-        task = Task(
-            description=user_input,
-            expected_output="A markdown-friendly, structured, and helpful answer",
-            agent=soothsayer
-        )
-
-        crew = Crew(
-            agents=[soothsayer],
-            tasks=[task],
-            verbose=False
-        )
-
-        result = crew.kickoff()
-
-        console.print("\n[🗣️ Soothsayer Says]:\n", style="bold green")
-        console.print(Markdown(result.output if hasattr(result, "output") else str(result)))
+        try:
+            with tracing.span("cli.turn", stream=stream, session=session is not None):
+                if stream:
+                    stream_reply(user_input, session)
+                else:
+                    crew_reply(user_input, session)
+        except (OllamaError, CircuitOpenError, OSError) as e:
+            # Retries are already spent by now; keep the prompt alive for the next question.
+            console.print(f"\n[❌] [bold red]Model unavailable:[/bold red] {e}")
         console.print("\n" + "-"*60)
 
 if __name__ == "__main__":
-    interactive_cli()
+    if "--profile-startup" in sys.argv:
+        profile_startup([__file__] + [arg for arg in sys.argv[1:] if arg != "--profile-startup"])
+        sys.exit(0)
+
+    # --trace (or SOOTHSAYER_TRACE=1) appends per-stage spans to .cache/traces.jsonl;
+    # summarize them with: python -m configs.tools.core.tracing
+    if "--trace" in sys.argv:
+        tracing.configure(enabled=True)
+
+    # --session keeps the conversation in Ollama's context, so each turn only evaluates the new text.
+    # Otherwise the agent config's memory_strategy (or --memory none|short_term|long_term) decides
+    # how much history each turn carries; long_term resumes SOOTHSAYER_CONVERSATION (default "cli").
+    if "--session" in sys.argv:
+        session = runtime.session()
+    else:
+        strategy = sys.argv[sys.argv.index("--memory") + 1] if "--memory" in sys.argv[:-1] else None
+        session = runtime.memory_session(strategy, conversation_id=os.environ.get("SOOTHSAYER_CONVERSATION", "cli"))
+    interactive_cli(stream="--no-stream" not in sys.argv or "--session" in sys.argv, session=session)
+    memory.flush()
+    cache_stats = runtime.cache.stats()
+    runtime_stats = runtime.stats()
+    console.print(
+        f"[dim]cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses · "
+        f"{runtime_stats['requests']} requests, {runtime_stats['mean_overhead_ms']:.2f} ms mean framework overhead[/dim]"
+    )
+    if "first_request_ms" in runtime_stats:
+        warm_s = runtime.warmer.warm_s if runtime.warmer else None
+        console.print(
+            f"[dim]first request: {runtime_stats['first_request_ms']:.0f} ms "
+            f"({'model already warm' if runtime_stats['first_request_warm'] else 'cold start'})"
+            f"{f' · background warm-up took {warm_s:.1f}s' if warm_s is not None else ''}[/dim]"
+        )
+    if isinstance(session, MemoryChat) and session.turns:
+        memory_stats = session.stats()
+        console.print(
+            f"[dim]memory ({memory_stats['strategy']}): {memory_stats['turns']} turns · largest memory block "
+            f"{memory_stats['max_memory_tokens']} of {memory_stats['budget_tokens']} tokens · "
+            f"{memory_stats['summarized_turns']} turns summarized[/dim]"
+        )
+    elif session is not None and session.turns:
+        session_stats = session.stats()
+        console.print(
+            f"[dim]session: {session_stats['turns']} turns · first turn {session_stats['first_turn_prompt_eval_count']} prompt tokens, "
+            f"later turns {session_stats['mean_reused_prompt_eval_count']:.0f} on average "
+            f"({session_stats['mean_reused_prompt_eval_ms']:.0f} ms)[/dim]"
+        )